@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""Indicators.
+
+This module introduces a set of quality indicators for comparing
+approximations of the Pareto front. Fronts are numpy arrays of shape
+(n, d) with one point per row. As in the upper closure of a ResultSet,
+lower values are better (i.e., a point x dominates a point y if x <= y).
+
+The module provides functions for:
+- Filtering the non-dominated points of a front (skyline).
+- Computing the hypervolume of a front (WFG algorithm).
+- Comparing a front with a reference front: IGD, IGD+ and the additive
+epsilon indicator.
+- Computing the Hausdorff distance between two sets of points.
+"""
+
+import cython
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Maximum number of pairs of points compared at once by the indicators that are not based on distances
+PAIRS_CHUNK = 1 << 20
+
+
+@cython.locals(points=object, d=object)
+@cython.returns(object)
+def as_front(points, d=None):
+    # type: (iter, int) -> np.ndarray
+    """
+    Converts a collection of points to an array of shape (n, d).
+
+    Args:
+        points (iter): Points, e.g., a list of tuples or an array.
+        d (int): Dimension of the points. Required if points is empty.
+
+    Returns:
+        np.ndarray: Array of floats with one point per row.
+    """
+    if not isinstance(points, np.ndarray):
+        points = list(points)
+    points = np.asarray(points, dtype=float)
+    if points.size == 0:
+        return np.empty((0, 0 if d is None else d))
+    return points.reshape((len(points), -1))
+
+
+@cython.locals(front=object, keep=object, skyline=object, start=cython.ulong, size=cython.ulong, block=object,
+               dominated=object)
+@cython.returns(object)
+def nondominated(front):
+    # type: (np.ndarray) -> np.ndarray
+    """
+    Non-dominated points of a front (i.e., its skyline), without
+    repetitions.
+
+    Points are sorted lexicographically, so a point can only be dominated
+    by a previous one. In 2D, a point is non-dominated iff its second
+    coordinate is lower than the ones of all the previous points, which
+    is computed with a cumulative minimum. In higher dimensions, points
+    are compared with the skyline found so far in blocks
+    (block-nested-loop).
+
+    Args:
+        front (np.ndarray): Points with shape (n, d).
+
+    Returns:
+        np.ndarray: Non-dominated points with shape (m, d), m <= n,
+                    sorted lexicographically.
+
+    Example:
+    >>> nondominated(np.array([[0.0, 1.0], [1.0, 1.0], [1.0, 0.0]]))
+    >>> array([[0., 1.], [1., 0.]])
+    """
+    if len(front) <= 1:
+        return front
+    front = front[np.lexsort(front.T[::-1])]
+    keep = np.ones(len(front), dtype=bool)
+    keep[1:] = np.any(front[1:] != front[:-1], axis=1)
+    front = front[keep]
+    if front.shape[1] <= 2:
+        keep = np.ones(len(front), dtype=bool)
+        keep[1:] = front[1:, -1] < np.minimum.accumulate(front[:-1, -1])
+        return front[keep]
+    skyline = front[:0]
+    start = 0
+    while start < len(front):
+        # Blocks are small enough for comparing them with the skyline and with themselves in PAIRS_CHUNK pairs
+        size = max(1, min(int(np.sqrt(PAIRS_CHUNK)), PAIRS_CHUNK // max(1, len(skyline))))
+        block = front[start:start + size]
+        start = start + size
+        block = block[~np.any(np.all(skyline[None, :, :] <= block[:, None, :], axis=2), axis=1)]
+        # dominated[i, j] is True if the j-th point of the block weakly dominates the i-th one, for j < i
+        dominated = np.tril(np.all(block[None, :, :] <= block[:, None, :], axis=2), -1)
+        skyline = np.concatenate((skyline, block[~np.any(dominated, axis=1)]))
+    return skyline
+
+
+@cython.locals(front=object, ref=object)
+@cython.returns(cython.double)
+def _hypervolume_2D(front, ref):
+    # type: (np.ndarray, np.ndarray) -> float
+    # Sweep over a non-dominated front sorted by the first coordinate (thus, by decreasing second coordinate)
+    front = front[np.argsort(front[:, 0])]
+    widths = np.diff(np.append(front[:, 0], ref[0]))
+    return float(np.sum(widths * (ref[1] - front[:, 1])))
+
+
+@cython.locals(front=object, ref=object, vol=cython.double, k=cython.ulong, p=object, limited=object)
+@cython.returns(cython.double)
+def _wfg(front, ref):
+    # type: (np.ndarray, np.ndarray) -> float
+    # WFG: the hypervolume is the sum of the exclusive hypervolumes of the points. The exclusive hypervolume of the
+    # k-th point is the volume of its box minus the hypervolume of the following points limited by it.
+    if len(front) == 0:
+        return 0.0
+    if len(front) == 1:
+        return float(np.prod(ref - front[0]))
+    if front.shape[1] == 1:
+        return float(ref[0] - np.min(front[:, 0]))
+    if front.shape[1] == 2:
+        return _hypervolume_2D(front, ref)
+    # Processing the points in decreasing order of the last coordinate keeps the limited fronts small
+    front = front[np.argsort(-front[:, -1])]
+    vol = 0.0
+    for k, p in enumerate(front):
+        limited = nondominated(np.maximum(front[k + 1:], p))
+        vol = vol + float(np.prod(ref - p)) - _wfg(limited, ref)
+    return vol
+
+
+@cython.locals(front=object, ref=object)
+@cython.returns(cython.double)
+def hypervolume(front, ref):
+    # type: (np.ndarray, tuple) -> float
+    """
+    Hypervolume of a front, i.e., the volume of the union of the boxes
+    [p, ref] for every point p of the front that dominates ref.
+
+    The hypervolume is computed with the WFG algorithm [1], which is
+    exact and efficient up to 6 or 7 dimensions.
+
+    [1] A Fast Way of Calculating Exact Hypervolumes, L. While,
+    L. Bradstreet, L. Barone, IEEE Transactions on Evolutionary
+    Computation, 16(1), 2012.
+
+    Args:
+        front (np.ndarray): Points with shape (n, d).
+        ref (tuple): Reference point with d coordinates.
+
+    Returns:
+        float: Hypervolume.
+
+    Example:
+    >>> hypervolume(np.array([[0.0, 0.5], [0.5, 0.0]]), (1.0, 1.0))
+    >>> 0.75
+    """
+    ref = np.asarray(ref, dtype=float)
+    front = as_front(front, len(ref))
+    # Points that do not dominate the reference point do not contribute
+    front = front[np.all(front < ref, axis=1)]
+    return _wfg(nondominated(front), ref)
+
+
+@cython.locals(front=object, reference=object)
+@cython.returns(cython.double)
+def igd(front, reference):
+    # type: (np.ndarray, np.ndarray) -> float
+    """
+    Inverted generational distance, i.e., the mean Euclidean distance
+    from every point of the reference front to its closest point in
+    front. Lower is better.
+
+    Args:
+        front (np.ndarray): Approximation of the front with shape (n, d).
+        reference (np.ndarray): Reference front with shape (m, d).
+
+    Returns:
+        float: IGD of front.
+    """
+    front, reference = as_front(front), as_front(reference)
+    assert len(front) > 0 and len(reference) > 0, 'Fronts must not be empty'
+    return float(np.mean(cKDTree(front).query(reference)[0]))
+
+
+@cython.locals(front=object, reference=object, chunk=cython.ulong, start=cython.ulong, dists=list, diff=object)
+@cython.returns(cython.double)
+def igd_plus(front, reference):
+    # type: (np.ndarray, np.ndarray) -> float
+    """
+    IGD+ [1], i.e., IGD where the distance from a reference point z to a
+    point a only counts the coordinates where a is worse than z:
+    sqrt(sum(max(a_i - z_i, 0)^2)). Unlike IGD, it is weakly Pareto
+    compliant. Lower is better.
+
+    [1] Modified Distance Calculation in Generational Distance and
+    Inverted Generational Distance, H. Ishibuchi, H. Masuda, Y. Tanigaki,
+    Y. Nojima, EMO 2015.
+
+    Args:
+        front (np.ndarray): Approximation of the front with shape (n, d).
+        reference (np.ndarray): Reference front with shape (m, d).
+
+    Returns:
+        float: IGD+ of front.
+    """
+    front, reference = as_front(front), as_front(reference)
+    assert len(front) > 0 and len(reference) > 0, 'Fronts must not be empty'
+    chunk = max(1, PAIRS_CHUNK // len(front))
+    dists = list()
+    for start in range(0, len(reference), chunk):
+        diff = np.maximum(front[None, :, :] - reference[start:start + chunk, None, :], 0.0)
+        dists.append(np.min(np.sqrt(np.sum(diff * diff, axis=2)), axis=1))
+    return float(np.mean(np.concatenate(dists)))
+
+
+@cython.locals(front=object, reference=object, chunk=cython.ulong, start=cython.ulong, eps=cython.double)
+@cython.returns(cython.double)
+def epsilon_indicator(front, reference):
+    # type: (np.ndarray, np.ndarray) -> float
+    """
+    Additive epsilon indicator, i.e., the minimum value eps such that
+    every point of the reference front is weakly dominated by some point
+    of front translated by -eps. Lower is better, and a value <= 0 means
+    that front weakly dominates the reference front.
+
+    Args:
+        front (np.ndarray): Approximation of the front with shape (n, d).
+        reference (np.ndarray): Reference front with shape (m, d).
+
+    Returns:
+        float: max_{z in reference} min_{a in front} max_i (a_i - z_i).
+    """
+    front, reference = as_front(front), as_front(reference)
+    assert len(front) > 0 and len(reference) > 0, 'Fronts must not be empty'
+    chunk = max(1, PAIRS_CHUNK // len(front))
+    eps = -np.inf
+    for start in range(0, len(reference), chunk):
+        eps = max(eps, float(np.max(np.min(np.max(front[None, :, :] - reference[start:start + chunk, None, :],
+                                                  axis=2), axis=1))))
+    return eps
+
+
+@cython.locals(a=object, b=object)
+@cython.returns(cython.double)
+def directed_hausdorff(a, b):
+    # type: (np.ndarray, np.ndarray) -> float
+    """
+    Directed Hausdorff distance from a to b, i.e., the maximum Euclidean
+    distance from a point of a to its closest point in b.
+    """
+    a, b = as_front(a), as_front(b)
+    assert len(a) > 0 and len(b) > 0, 'Sets of points must not be empty'
+    return float(np.max(cKDTree(b).query(a)[0]))
+
+
+@cython.locals(a=object, b=object)
+@cython.returns(cython.double)
+def hausdorff(a, b):
+    # type: (np.ndarray, np.ndarray) -> float
+    """
+    Hausdorff distance between two sets of points, i.e., the maximum of
+    the directed Hausdorff distances from a to b and from b to a.
+
+    Example:
+    >>> hausdorff(np.array([[0.0, 0.0]]), np.array([[0.0, 0.0], [3.0, 4.0]]))
+    >>> 5.0
+    """
+    return max(directed_hausdorff(a, b), directed_hausdorff(b, a))
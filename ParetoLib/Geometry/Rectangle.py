@@ -1583,9 +1583,11 @@ class Rectangle(object):
     @cython.ccall
     @cython.locals(num_samples=cython.integral)
     @cython.returns(iter)
-    def uniform_sampling(self, num_samples):
-        # type: (Rectangle, int) -> list
-        samples = np.random.uniform(self.min_corner, self.max_corner, size=(num_samples, self.dim()))
+    def uniform_sampling(self, num_samples, rng=None):
+        # type: (Rectangle, int, np.random.Generator) -> list
+        # rng is a numpy.random.Generator; the global numpy RNG is used by default
+        rng = np.random if rng is None else rng
+        samples = rng.uniform(self.min_corner, self.max_corner, size=(num_samples, self.dim()))
         return samples
 
 
@@ -12,6 +12,7 @@ evaluating properties written in Signal Temporal Logic (STL) over them.
 """
 
 import os
+import sys
 import stat
 from pkg_resources import resource_listdir, resource_filename
 import cython
@@ -90,6 +91,16 @@ def get_jamt_bin():
     return path
 
 
+@cython.ccall
+@cython.locals(jamt_path=str)
+@cython.returns(list)
+def get_jamt_worker_stub():
+    # Command line of the pure Python stand-in for a persistent JAMT worker (see JAMTWorker.py).
+    # It is only meant for testing: it does not read the signal and it does not understand STL.
+    jamt_path = get_jamt_path()
+    return [sys.executable, os.path.join(jamt_path, 'JAMTWorker.py')]
+
+
 # -------------------------------------------------------------------------------
 
 # JAMT OPTIONS
@@ -102,3 +113,10 @@ JAMT_OPT_STL = '-x'
 JAMT_OPT_SIGNAL = '-s'
 JAMT_OPT_ALIAS = '-a'
 JAMT_OPT_RES = '-v'
+
+# JAMT WORKER PROTOCOL
+JAMT_WORKER_OK = 'ok'
+JAMT_WORKER_BATCH = 'batch'
+JAMT_WORKER_QUIT = 'quit'
+JAMT_WORKER_TIMEOUT = 60.0
+JAMT_WORKER_STUB = get_jamt_worker_stub()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""JAMTWorker.
+
+This module is a pure Python stand-in for a persistent JAMT worker.
+It speaks the same line protocol that OracleSTL uses in (experimental)
+worker mode, so that the persistent evaluation path can be tested
+without Java or the AMT 2.0 jar. It is not a replacement for JAMT:
+AMT 2.0 has no persistent mode, so no real worker is shipped yet.
+
+Usage:
+python JAMTWorker.py -s signal.vcd -a variables.alias
+
+Protocol (one message per line, stdin/stdout):
+- On start-up, the worker loads the signal once and answers 'ok'.
+- 'batch n' is followed by n JSON-encoded STL formula instances.
+  The worker answers n verdicts in {'satisfied', 'violated', 'unknown'}.
+- 'quit' terminates the worker.
+
+The stub does not understand STL. It evaluates every formula instance
+as a Python boolean expression (e.g., '0.3 + 0.8 >= 1') and answers
+'unknown' when the expression cannot be evaluated.
+"""
+
+import sys
+import json
+
+# Keep in sync with ParetoLib.JAMT.JAMT
+JAMT_OPT_SIGNAL = '-s'
+JAMT_OPT_ALIAS = '-a'
+JAMT_WORKER_OK = 'ok'
+JAMT_WORKER_BATCH = 'batch'
+JAMT_WORKER_QUIT = 'quit'
+
+
+def _parse_args(argv):
+    # type: (list) -> dict
+    args = {}
+    for opt, val in zip(argv[::2], argv[1::2]):
+        args[opt] = val
+    return args
+
+
+def _load_file(fname):
+    # type: (str) -> str
+    with open(fname, 'r') as f:
+        return f.read()
+
+
+def _eval_formula(formula):
+    # type: (str) -> str
+    try:
+        res = eval(formula, {'__builtins__': {}}, {})
+    except Exception:
+        return 'unknown'
+    return 'satisfied' if res else 'violated'
+
+
+def main(argv, fin=sys.stdin, fout=sys.stdout):
+    # type: (list, io.TextIO, io.TextIO) -> int
+    args = _parse_args(argv)
+
+    # The signal and the aliases are read only once, at start-up
+    try:
+        _load_file(args[JAMT_OPT_SIGNAL])
+        _load_file(args[JAMT_OPT_ALIAS])
+    except (KeyError, IOError) as e:
+        fout.write('error {0}\n'.format(e))
+        fout.flush()
+        return 1
+
+    fout.write(JAMT_WORKER_OK + '\n')
+    fout.flush()
+
+    for line in fin:
+        cmd = line.split()
+        if len(cmd) == 0:
+            continue
+        elif cmd[0] == JAMT_WORKER_QUIT:
+            break
+        elif cmd[0] == JAMT_WORKER_BATCH:
+            formulas = [json.loads(fin.readline()) for _ in range(int(cmd[1]))]
+            fout.write(''.join(_eval_formula(formula) + '\n' for formula in formulas))
+            fout.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -12,4 +12,4 @@ Temporal Logic (STL) over them.
 """
 
 __name__ = 'JAMT'
-__all__ = ['JAMT']
+__all__ = ['JAMT', 'JAMTWorker']
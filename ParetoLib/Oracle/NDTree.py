@@ -11,52 +11,109 @@ for storing a Pareto front by removing redundant non-dominating points
 from the surface. The data structure definition, notation and algorithms
 are directly extracted from [1].
 
+The nodes of the tree are stored in flat numpy arrays indexed by the
+node number: the ideal and nadir points that bound the subtree of every
+node, its parent, its children and, for the leaves, the points of the
+Pareto front. The tree is traversed iteratively, so its depth is not
+limited by the recursion limit of Python.
+
 [1] Andrzej Jaszkiewicz and Thibaut Lust.
 ND-Tree-based update: a fast algorithm for the dynamic non-dominance problem.
 IEEE Transactions on Evolutionary Computation, 2018.
 https://ieeexplore.ieee.org/document/8274915/
 """
 
-import sys
 import os
 import io
 import pickle
-from ParetoLib._py3k import set_limit
+import numpy as np
 import cython
 
 from ParetoLib.Geometry.Rectangle import Rectangle
-from ParetoLib.Geometry.Point import less, less_equal, distance, dim
+from ParetoLib.Geometry.Indicators import PAIRS_CHUNK, as_front, nondominated
 # import ParetoLib.Oracle as RootOracle
 import ParetoLib.Oracle
 
 RootOracle = ParetoLib.Oracle
 
+# Initial number of nodes of the arrays of a NDTree. The arrays double their size when they are full
+NODES_CAPACITY = 16
+
+
+@cython.locals(finput=object, text=str, line=str, first=list)
+@cython.returns(object)
+def read_points(finput):
+    # type: (io.BinaryIO) -> np.ndarray
+    """
+    Parsing of a text file with a point (x1, x2, ..., xn) per line, as
+    written by NDTree.to_file_text. The values are converted by numpy
+    in a single call.
+
+    Args:
+        finput (io.BinaryIO): The file.
+
+    Returns:
+        np.ndarray: Points with shape (m, n).
+    """
+    text = finput.read()
+    text = text.replace('(', ' ').replace(')', ' ').replace(',', ' ')
+    first = next((line.split() for line in text.splitlines() if line.strip() != ''), [])
+    if len(first) == 0:
+        return np.empty((0, 0))
+    return np.array(text.split(), dtype=float).reshape((-1, len(first)))
+
 
 @cython.cclass
 class NDTree(object):
     # cython.declare(root=object, max_points=cython.ulong, min_children=cython.ushort)
-    root = cython.declare(object, visibility='public')
     max_points = cython.declare(cython.ulong, visibility='public')
     min_children = cython.declare(cython.ushort, visibility='public')
+    _root = cython.declare(cython.long)
+    _free_nodes = cython.declare(list)
+    _bounds = cython.declare(object)
+    _ideal = cython.declare(object)
+    _nadir = cython.declare(object)
+    _parent = cython.declare(object)
+    _children = cython.declare(object)
+    _num_children = cython.declare(object)
+    _points = cython.declare(object)
+    _num_points = cython.declare(object)
+    _in_use = cython.declare(object)
 
     @cython.locals(max_points=cython.ulong, min_children=cython.ushort)
     @cython.returns(cython.void)
     def __init__(self, max_points=2, min_children=2):
         # type: (NDTree, int, int) -> None
         """
-        A NDTree is a tree with a Node in the root.
-        The root has max_children descendants of type Node.
-        Each Node (including the root) stores up to max_points.
+        A NDTree is a tree of nodes. Internal nodes have up to
+        max(2, min_children) descendants, and leaves store up to
+        max_points.
+
+        Node i is described by:
+            - _ideal[i], _nadir[i]: the minimal and maximal corners of
+            the Rectangle that encloses all the points of the subtree.
+            Both are views of _bounds[i] = [_ideal[i], _nadir[i]].
+            - _parent[i]: the precedent node (-1 for the root).
+            - _children[i, :_num_children[i]]: the descendant nodes
+            (the rest of the row is -1).
+            - _points[i, :_num_points[i]]: the points of a leaf.
+            - _in_use[i]: False if the node is free.
+        The arrays are allocated when the first point is inserted,
+        because the dimension of the points is unknown before.
         """
-        self.root = None
         self.max_points = max_points
         self.min_children = min_children
-
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        set_limit(max_rec)
-        sys.setrecursionlimit(max_rec)
+        self._root = -1
+        self._free_nodes = list()
+        self._bounds = None
+        self._ideal = None
+        self._nadir = None
+        self._parent = None
+        self._children = None
+        self._num_children = None
+        self._points = None
+        self._num_points = None
+        self._in_use = None
 
     @cython.locals(p=tuple)
     @cython.returns(cython.bint)
@@ -80,8 +137,8 @@ class NDTree(object):
         >>> x in nd
         >>> True
         """
-        return self.root.has_point_rec(p) if not self.is_empty() else False
-        # return item in self.root
+        return bool(np.any(np.all(self.point_array() == np.asarray(p, dtype=float), axis=1))) \
+            if not self.is_empty() else False
 
     @cython.returns(str)
     def __repr__(self):
@@ -89,7 +146,7 @@ class NDTree(object):
         """
         Printer.
         """
-        return self.root.to_str_rec(0) if not self.is_empty() else ''
+        return self._to_str()
 
     @cython.returns(str)
     def __str__(self):
@@ -97,7 +154,7 @@ class NDTree(object):
         """
         Printer.
         """
-        return self.root.to_str_rec(0) if not self.is_empty() else ''
+        return self._to_str()
 
     @cython.locals(sameContent=cython.bint, other=object)
     @cython.returns(cython.bint)
@@ -108,7 +165,7 @@ class NDTree(object):
         """
         sameContent = (other.max_points == self.max_points) and \
                       (other.min_children == self.min_children)
-        return (hash(self.root) == hash(other.root)) and sameContent
+        return sameContent and (self.get_points() == other.get_points())
 
     @cython.locals(other=object)
     @cython.returns(cython.bint)
@@ -125,17 +182,75 @@ class NDTree(object):
         """
         Identity function (via hashing)
         """
-        return hash((self.root, self.max_points, self.min_children))
+        return hash((frozenset(self.get_points()), self.max_points, self.min_children))
+
+    @cython.returns(dict)
+    def __getstate__(self):
+        # type: (NDTree) -> dict
+        """
+        State of the NDTree for pickling (i.e., the node arrays).
+        """
+        return {'max_points': self.max_points, 'min_children': self.min_children, 'root': self._root,
+                'free_nodes': self._free_nodes, 'bounds': self._bounds, 'parent': self._parent,
+                'children': self._children, 'num_children': self._num_children, 'points': self._points,
+                'num_points': self._num_points, 'in_use': self._in_use}
 
+    @cython.locals(state=dict)
+    @cython.returns(cython.void)
+    def __setstate__(self, state):
+        # type: (NDTree, dict) -> None
+        """
+        Restoring the NDTree from the state returned by __getstate__.
+        """
+        self.max_points = state['max_points']
+        self.min_children = state['min_children']
+        self._root = state['root']
+        self._free_nodes = list(state['free_nodes'])
+        self._set_bounds(state['bounds'])
+        self._parent = state['parent']
+        self._children = state['children']
+        self._num_children = state['num_children']
+        self._points = state['points']
+        self._num_points = state['num_points']
+        self._in_use = state['in_use']
+
+    @cython.locals(nesting_level=cython.ulong, lines=list, stack=list, n=cython.long, k=cython.ulong)
     @cython.returns(str)
+    def _to_str(self):
+        # type: (NDTree) -> str
+        """
+        Printer. Every leaf is printed in a line, indented by its depth.
+        """
+        lines = list()
+        stack = [(self._root, 0)] if not self.is_empty() else list()
+        while len(stack) > 0:
+            n, nesting_level = stack.pop()
+            k = self._num_children[n]
+            if k == 0:
+                lines.append('\t' * nesting_level + str(self._leaf_points(n)))
+            else:
+                stack.extend((c, nesting_level + 1) for c in reversed(self._children[n, :k].tolist()))
+        return '\n'.join(lines)
+
+    @cython.locals(n=cython.long)
+    @cython.returns(cython.void)
     def _report(self):
         """
         Report function
         """
-        self.root.report_rec() if not self.is_empty() else ''
+        if self.is_empty():
+            return
+        for n in np.flatnonzero(self._in_use).tolist():
+            RootOracle.logger.info('\tCurrent {0}'.format(n))
+            RootOracle.logger.info('\tParent {0}'.format(self._parent[n]))
+            RootOracle.logger.info('\tNum Successors {0}'.format(self._num_children[n]))
+            RootOracle.logger.info('\tSuccessors {0}'.format(self._children[n, :self._num_children[n]].tolist()))
+            RootOracle.logger.info('\tNum Points {0}'.format(self._num_points[n]))
+            RootOracle.logger.info('\tPoints {0}'.format(self._leaf_points(n)))
+            RootOracle.logger.info('\tRect {0}'.format(Rectangle(tuple(self._ideal[n].tolist()),
+                                                                 tuple(self._nadir[n].tolist()))))
 
     @cython.ccall
-    @cython.locals(rect=object)
     @cython.returns(cython.ushort)
     def dim(self):
         # type: (NDTree) -> int
@@ -155,13 +270,7 @@ class NDTree(object):
         >>> nd.dim()
         >>> 3
         """
-        rect = self.get_rectangle()
-        # if rect is not None:
-        #    return Rectangle.dim(rect)
-        if isinstance(rect, Rectangle):
-            return rect.dim()
-        else:
-            return 0
+        return self._points.shape[2] if not self.is_empty() else 0
 
     @cython.ccall
     @cython.returns(cython.bint)
@@ -181,7 +290,7 @@ class NDTree(object):
         >>> nd.is_empty()
         >>> True
         """
-        return self.root is None
+        return self._root < 0
 
     @cython.ccall
     @cython.returns(object)
@@ -206,11 +315,37 @@ class NDTree(object):
         >>> nd.get_rectangle()
         >>> [(0,0,0), (0,0,0)]
         """
-        # return self.root.getRectangleSn() if not self.isEmpty() else None
-        return self.root.get_rectangle_sn() if not self.is_empty() else Rectangle()
+        if self.is_empty():
+            return Rectangle()
+        return Rectangle(tuple(self._ideal[self._root].tolist()), tuple(self._nadir[self._root].tolist()))
+
+    @cython.ccall
+    @cython.locals(leaves=object)
+    @cython.returns(object)
+    def point_array(self):
+        # type: (NDTree) -> np.ndarray
+        """
+        Points stored in the NDTree.
+
+        Args:
+            self (NDTree): The NDTree.
+
+        Returns:
+            np.ndarray: Array of shape (n, d) with the points in the NDTree.
+
+        Example:
+        >>> x = (0,0,0)
+        >>> nd = NDTree()
+        >>> nd.update_point(x)
+        >>> nd.point_array()
+        >>> array([[0., 0., 0.]])
+        """
+        if self.is_empty():
+            return np.empty((0, 0))
+        leaves = np.flatnonzero(self._in_use & (self._num_children == 0))
+        return self._points[leaves][self._leaf_mask(leaves)]
 
     @cython.ccall
-    @cython.locals(points=set)
     @cython.returns(set)
     def get_points(self):
         # type: (NDTree) -> set
@@ -232,11 +367,10 @@ class NDTree(object):
         >>> nd.get_points()
         >>> {(0,0,0), (1,1,1)}
         """
-        points = self.root.s() if self.root is not None else set()
-        return points
+        return set(map(tuple, self.point_array().tolist()))
 
     @cython.ccall
-    @cython.locals(p=tuple, n=object, update=cython.bint)
+    @cython.locals(p=tuple, x=object)
     @cython.returns(cython.void)
     def update_point(self, p):
         # type: (NDTree, tuple) -> None
@@ -258,18 +392,16 @@ class NDTree(object):
         >>> nd = NDTree()
         >>> nd.update_point(x)
         """
-        n = self.root
-        if n is None:
-            n = Node(max_points=self.max_points, min_children=self.min_children)
-            n.insert(p)
-        else:
-            n, update = n.update_node(p)
-            if update:
-                n.insert(p)
-        self.root = n
+        x = np.asarray(p, dtype=float)
+        if self._points is None:
+            self._allocate(len(x))
+        if self.is_empty() or self._update(x):
+            if self.is_empty():
+                self._root = self._new_node(-1)
+            self._insert(x)
 
     @cython.ccall
-    @cython.locals(p=tuple)
+    @cython.locals(p=tuple, x=object, nodes=object, is_leaf=object, leaves=object)
     @cython.returns(cython.bint)
     def dominates(self, p):
         # type: (NDTree, tuple) -> bool
@@ -290,7 +422,431 @@ class NDTree(object):
         >>> nd.dominates(y)
         >>> True
         """
-        return self.root.dominates(p)
+        x = np.asarray(p, dtype=float)
+        nodes = np.array([self._root]) if not self.is_empty() else np.empty(0, dtype=np.int64)
+        while len(nodes) > 0:
+            if (self._nadir[nodes] <= x).all(axis=1).any():
+                # x is dominated by every point of a subtree
+                return True
+            # Nodes whose subtree may contain a point that dominates x
+            nodes = nodes[(self._ideal[nodes] <= x).all(axis=1)]
+            is_leaf = self._num_children[nodes] == 0
+            if is_leaf.any():
+                leaves = nodes[is_leaf]
+                if ((self._points[leaves] <= x).all(axis=2) & self._leaf_mask(leaves)).any():
+                    return True
+                nodes = nodes[~is_leaf]
+            nodes = self._subnodes(nodes)
+        return False
+
+    @cython.ccall
+    @cython.locals(points=object)
+    @cython.returns(object)
+    def dominates_batch(self, points):
+        # type: (NDTree, iter) -> np.ndarray
+        """
+        Testing the dominance of the NDTree over a collection of points.
+        The NDTree is traversed once for the whole collection: every
+        node is compared against all the pending points at the same
+        time, and a point leaves the traversal as soon as it is answered.
+
+        Args:
+            self (NDTree): The NDTree.
+            points (iter): The points, e.g., a list of tuples or an
+                           array of shape (n, d).
+
+        Returns:
+            np.ndarray: Array of booleans, True for the points that are
+            dominated by any point stored in the Pareto archive.
+
+        Example:
+        >>> nd = NDTree()
+        >>> nd.update_point((0,0,0))
+        >>> nd.dominates_batch([(1,1,1), (-1,1,1)])
+        >>> array([ True, False])
+        """
+        return self._query_batch(points, dominated=False)
+
+    @cython.ccall
+    @cython.locals(points=object)
+    @cython.returns(object)
+    def dominated_batch(self, points):
+        # type: (NDTree, iter) -> np.ndarray
+        """
+        Testing the dominance of a collection of points over the NDTree.
+        It is the dual of dominates_batch: the NDTree is traversed once
+        for the whole collection.
+
+        Args:
+            self (NDTree): The NDTree.
+            points (iter): The points, e.g., a list of tuples or an
+                           array of shape (n, d).
+
+        Returns:
+            np.ndarray: Array of booleans, True for the points that
+            dominate any point stored in the Pareto archive.
+
+        Example:
+        >>> nd = NDTree()
+        >>> nd.update_point((0,0,0))
+        >>> nd.dominated_batch([(1,1,1), (-1,0,0)])
+        >>> array([False,  True])
+        """
+        return self._query_batch(points, dominated=True)
+
+    @cython.locals(points=object, dominated=cython.bint, res=object, size=cython.ulong, start=cython.ulong,
+                   queries=object, nodes=object, x=object, full=object, maybe=object, is_leaf=object,
+                   leaves=object, found=object)
+    @cython.returns(object)
+    def _query_batch(self, points, dominated):
+        # type: (NDTree, iter, bool) -> np.ndarray
+        # Level-synchronous traversal over the pairs (node, query) that are pending.
+        # If dominated is False, res[i] is True if some stored point y satisfies y <= points[i];
+        # otherwise, res[i] is True if some stored point y satisfies points[i] <= y.
+        points = as_front(points, self.dim() if not self.is_empty() else None)
+        res = np.zeros(len(points), dtype=bool)
+        if self.is_empty() or len(points) == 0:
+            return res
+        # Blocks of queries keep the number of pairs of a level below PAIRS_CHUNK
+        size = max(1, PAIRS_CHUNK // len(self._in_use))
+        for start in range(0, len(points), size):
+            queries = np.arange(start, min(start + size, len(points)))
+            nodes = np.full(len(queries), self._root, dtype=np.int64)
+            while len(nodes) > 0:
+                x = points[queries]
+                if dominated:
+                    full = (x <= self._ideal[nodes]).all(axis=1)
+                    maybe = (x <= self._nadir[nodes]).all(axis=1)
+                else:
+                    full = (self._nadir[nodes] <= x).all(axis=1)
+                    maybe = (self._ideal[nodes] <= x).all(axis=1)
+                # The query is answered by every point of the subtree
+                res[queries[full]] = True
+                # Pairs whose subtree may contain an answer for a pending query
+                maybe = maybe & ~res[queries]
+                nodes, queries = nodes[maybe], queries[maybe]
+                is_leaf = self._num_children[nodes] == 0
+                if is_leaf.any():
+                    leaves, x = nodes[is_leaf], points[queries[is_leaf]][:, None, :]
+                    if dominated:
+                        found = (x <= self._points[leaves]).all(axis=2)
+                    else:
+                        found = (self._points[leaves] <= x).all(axis=2)
+                    res[queries[is_leaf][(found & self._leaf_mask(leaves)).any(axis=1)]] = True
+                    nodes, queries = nodes[~is_leaf], queries[~is_leaf]
+                # Every pending query is paired with the children of its node
+                queries = np.repeat(queries, self._children.shape[1])
+                nodes = self._children[nodes].ravel()
+                found = (nodes >= 0) & ~res[queries]
+                nodes, queries = nodes[found], queries[found]
+        return res
+
+    @cython.ccall
+    @cython.locals(points=object)
+    @cython.returns(cython.void)
+    def update_points(self, points):
+        # type: (NDTree, iter) -> None
+        """
+        Addition of a collection of points to the NDTree (bulk load).
+        The non-dominated subset of the points in the NDTree and the new
+        ones is computed at once with a vectorized skyline (see
+        Indicators.nondominated), and then the NDTree is built top-down.
+        The result is the same Pareto front as calling update_point for
+        every point.
+
+        Args:
+            self (NDTree): The NDTree.
+            points (iter): The points, e.g., a list of tuples or an
+                           array of shape (n, d).
+
+        Returns:
+            None: The NDTree stores the Pareto front of its old points
+            and the new ones.
+
+        Example:
+        >>> nd = NDTree()
+        >>> nd.update_points([(0,1), (1,0), (1,1)])
+        >>> nd.get_points()
+        >>> {(0.0,1.0), (1.0,0.0)}
+        """
+        points = as_front(points)
+        if len(points) == 0:
+            return
+        if not self.is_empty():
+            points = np.concatenate((self.point_array(), points))
+        self._build(nondominated(points))
+
+    @cython.locals(front=object, stack=list, n=cython.long, index=object, points=object, axis=cython.ushort,
+                   group=object)
+    @cython.returns(cython.void)
+    def _build(self, front):
+        # type: (NDTree, np.ndarray) -> None
+        """
+        Top-down construction of the NDTree from a set of non-dominated
+        points. The points of a node are sorted along the coordinate
+        with the largest spread and split into consecutive groups of
+        the same size, one per descendant, until they fit in a leaf.
+        """
+        # Leaves store about max_points / 2 points at least, and every internal node has two descendants at least.
+        # The arrays grow anyway if the estimation is exceeded
+        self._allocate(front.shape[1], max(NODES_CAPACITY, 4 * len(front) // max(1, self.max_points)))
+        self._root = self._new_node(-1)
+        stack = [(self._root, np.arange(len(front)))]
+        while len(stack) > 0:
+            n, index = stack.pop()
+            points = front[index]
+            self._ideal[n] = points.min(axis=0)
+            self._nadir[n] = points.max(axis=0)
+            if len(index) <= self.max_points:
+                self._points[n, :len(index)] = points
+                self._num_points[n] = len(index)
+            else:
+                axis = int(np.argmax(self._nadir[n] - self._ideal[n]))
+                index = index[np.argsort(points[:, axis], kind='stable')]
+                for group in np.array_split(index, min(self._children.shape[1], len(index))):
+                    stack.append((self._new_node(n), group))
+
+    # Node arrays
+    @cython.locals(d=cython.ushort, capacity=cython.ulong, width=cython.ushort)
+    @cython.returns(cython.void)
+    def _allocate(self, d, capacity=NODES_CAPACITY):
+        # type: (NDTree, int, int) -> None
+        # A leaf is split in at least two descendants, so that none of them exceeds max_points
+        width = max(2, self.min_children)
+        self._set_bounds(np.stack((np.full((capacity, d), np.inf), np.full((capacity, d), -np.inf)), axis=1))
+        self._parent = np.full(capacity, -1, dtype=np.int64)
+        self._children = np.full((capacity, width), -1, dtype=np.int64)
+        self._num_children = np.zeros(capacity, dtype=np.int64)
+        # A leaf temporally stores max_points + 1 points before being split
+        self._points = np.zeros((capacity, self.max_points + 1, d))
+        self._num_points = np.zeros(capacity, dtype=np.int64)
+        self._in_use = np.zeros(capacity, dtype=bool)
+        self._free_nodes = list(range(capacity - 1, -1, -1))
+
+    @cython.locals(size=cython.ulong)
+    @cython.returns(cython.void)
+    def _grow(self):
+        # type: (NDTree) -> None
+        size = len(self._in_use)
+        self._set_bounds(np.concatenate((self._bounds, self._bounds)))
+        self._parent = np.concatenate((self._parent, np.full_like(self._parent, -1)))
+        self._children = np.concatenate((self._children, np.full_like(self._children, -1)))
+        self._num_children = np.concatenate((self._num_children, np.zeros_like(self._num_children)))
+        self._points = np.concatenate((self._points, np.zeros_like(self._points)))
+        self._num_points = np.concatenate((self._num_points, np.zeros_like(self._num_points)))
+        self._in_use = np.concatenate((self._in_use, np.zeros_like(self._in_use)))
+        self._free_nodes = list(range(2 * size - 1, size - 1, -1)) + self._free_nodes
+
+    @cython.locals(bounds=object)
+    @cython.returns(cython.void)
+    def _set_bounds(self, bounds):
+        # type: (NDTree, np.ndarray) -> None
+        self._bounds = bounds
+        self._ideal = bounds[:, 0, :] if bounds is not None else None
+        self._nadir = bounds[:, 1, :] if bounds is not None else None
+
+    @cython.locals(parent=cython.long, n=cython.long)
+    @cython.returns(cython.long)
+    def _new_node(self, parent):
+        # type: (NDTree, int) -> int
+        if len(self._free_nodes) == 0:
+            self._grow()
+        n = self._free_nodes.pop()
+        self._ideal[n] = np.inf
+        self._nadir[n] = -np.inf
+        self._parent[n] = parent
+        self._children[n] = -1
+        self._num_children[n] = 0
+        self._num_points[n] = 0
+        self._in_use[n] = True
+        if parent >= 0:
+            self._children[parent, self._num_children[parent]] = n
+            self._num_children[parent] += 1
+        return n
+
+    @cython.locals(n=cython.long, stack=list, k=cython.ulong)
+    @cython.returns(cython.void)
+    def _free_subtree(self, n):
+        # type: (NDTree, int) -> None
+        stack = [n]
+        while len(stack) > 0:
+            n = stack.pop()
+            k = self._num_children[n]
+            stack.extend(self._children[n, :k].tolist())
+            self._in_use[n] = False
+            self._free_nodes.append(n)
+
+    @cython.locals(nodes=object)
+    @cython.returns(object)
+    def _subnodes(self, nodes):
+        # type: (NDTree, np.ndarray) -> np.ndarray
+        # Direct descendants of an array of nodes. Unused positions of self._children are -1
+        nodes = self._children[nodes].ravel()
+        return nodes[nodes >= 0]
+
+    @cython.locals(nodes=object)
+    @cython.returns(object)
+    def _leaf_mask(self, nodes):
+        # type: (NDTree, np.ndarray) -> np.ndarray
+        # mask[i, j] is True if the j-th point of nodes[i] is stored
+        return np.arange(self._points.shape[1])[None, :] < self._num_points[nodes][:, None]
+
+    @cython.locals(n=cython.long)
+    @cython.returns(list)
+    def _leaf_points(self, n):
+        # type: (NDTree, int) -> list
+        return list(map(tuple, self._points[n, :self._num_points[n]].tolist()))
+
+    @cython.locals(n=cython.long, x=object)
+    @cython.returns(cython.void)
+    def _add_point(self, n, x):
+        # type: (NDTree, int, np.ndarray) -> None
+        self._points[n, self._num_points[n]] = x
+        self._num_points[n] += 1
+        np.minimum(self._ideal[n], x, out=self._ideal[n])
+        np.maximum(self._nadir[n], x, out=self._nadir[n])
+
+    # NDTree operations
+    @cython.locals(x=object, path=list, n=cython.long, x2=object, children=object, centers=object)
+    @cython.returns(cython.void)
+    def _insert(self, x):
+        # type: (NDTree, np.ndarray) -> None
+        """
+        Insertion of a point into the leaf whose enclosing Rectangle has
+        the closest center to x. The Rectangles along the path are
+        extended with x.
+        """
+        path = list()
+        n = self._root
+        x2 = 2.0 * x
+        while self._num_children[n] > 0:
+            path.append(n)
+            children = self._children[n, :self._num_children[n]]
+            # Twice the distance from x to the centers of the children
+            centers = self._ideal[children] + self._nadir[children] - x2
+            n = children[(centers * centers).sum(axis=1).argmin()]
+        self._ideal[path] = np.minimum(self._ideal[path], x)
+        self._nadir[path] = np.maximum(self._nadir[path], x)
+        self._add_point(n, x)
+        if self._num_points[n] > self.max_points:
+            self._split(n)
+
+    @cython.locals(n=cython.long, points=object, dist=object, remaining=list, i=cython.ulong, npr=cython.long,
+                   children=object, centers=object)
+    @cython.returns(cython.void)
+    def _split(self, n):
+        # type: (NDTree, int) -> None
+        """
+        Creation of new descendant nodes of leaf n.
+        This function is called when the number of points hosted in
+        the leaf exceeds max_points. Each new descendant receives the
+        remaining point with the highest average Euclidean distance to
+        the other remaining points, and the rest of points are moved to
+        the descendant whose center is the closest.
+        """
+        points = self._points[n, :self._num_points[n]].copy()
+        self._num_points[n] = 0
+        dist = np.sqrt(np.sum((points[:, None, :] - points[None, :, :]) ** 2, axis=2))
+        remaining = list(range(len(points)))
+        while len(remaining) > 0 and (self._num_children[n] < self._children.shape[1]):
+            i = remaining.pop(int(np.argmax(np.sum(dist[np.ix_(remaining, remaining)], axis=1))))
+            npr = self._new_node(n)
+            self._add_point(npr, points[i])
+        children = self._children[n, :self._num_children[n]]
+        for i in remaining:
+            centers = (self._ideal[children] + self._nadir[children]) / 2.0
+            npr = children[np.argmin(np.sum((centers - points[i]) ** 2, axis=1))]
+            self._add_point(npr, points[i])
+
+    @cython.locals(x=object, nodes=object, removed=list, bounds=object, below=object, above=object, dominated=object,
+                   is_leaf=object, leaves=object, points=object, mask=object, i=cython.ulong, keep=object, n=cython.long)
+    @cython.returns(cython.bint)
+    def _update(self, x):
+        # type: (NDTree, np.ndarray) -> bool
+        """
+        Removal of the points that are dominated by x.
+
+        Returns:
+            bool: False if x is dominated by any point of the NDTree
+            (i.e., x is rejected), True otherwise.
+        """
+        # The tree is traversed level by level, comparing x with all the nodes of the level at once
+        nodes = np.array([self._root])
+        removed = list()
+        while len(nodes) > 0:
+            bounds = self._bounds[nodes]
+            # below[:, 0] is ideal <= x, and below[:, 1] is nadir <= x
+            below = (bounds <= x).all(axis=2)
+            if below[:, 1].any():
+                # x is rejected
+                return False
+            # above[:, 0] is x <= ideal, and above[:, 1] is x <= nadir
+            above = (x <= bounds).all(axis=2)
+            dominated = above[:, 0]
+            if dominated.any():
+                # remove the nodes dominated by x and their whole sub-trees
+                removed.extend(nodes[dominated].tolist())
+            # Skip the nodes that are incomparable to x
+            nodes = nodes[~dominated & (below[:, 0] | above[:, 1])]
+            is_leaf = self._num_children[nodes] == 0
+            if is_leaf.any():
+                leaves = nodes[is_leaf]
+                points = self._points[leaves]
+                mask = self._leaf_mask(leaves)
+                if ((points <= x).all(axis=2) & mask).any():
+                    # x is rejected
+                    return False
+                dominated = (x <= points).all(axis=2) & mask
+                for i in np.flatnonzero(dominated.any(axis=1)).tolist():
+                    # Dominated points are removed
+                    keep = mask[i] & ~dominated[i]
+                    n = leaves[i]
+                    self._num_points[n] = np.count_nonzero(keep)
+                    self._points[n, :self._num_points[n]] = points[i][keep]
+                    removed.append(n) if self._num_points[n] == 0 else None
+                nodes = nodes[~is_leaf]
+            nodes = self._subnodes(nodes)
+        # x cannot be dominated by a point of the NDTree if x dominates another one, so the removals are safe
+        for n in removed:
+            self._remove_node(n)
+        return True
+
+    @cython.locals(n=cython.long, parent=cython.long, k=cython.ulong, children=object, npr=cython.long,
+                   grandparent=cython.long)
+    @cython.returns(cython.void)
+    def _remove_node(self, n):
+        # type: (NDTree, int) -> None
+        """
+        Removal of node n and its sub-tree. Ancestors without
+        descendants are removed too, and an ancestor with a single
+        descendant is replaced by it.
+        """
+        while True:
+            parent = self._parent[n]
+            self._free_subtree(n)
+            if parent < 0:
+                self._root = -1
+                return
+            children = self._children[parent, :self._num_children[parent]]
+            children = children[children != n]
+            k = len(children)
+            self._children[parent, :k] = children
+            self._children[parent, k:] = -1
+            self._num_children[parent] = k
+            if k > 0:
+                break
+            n = parent
+        if k == 1:
+            npr = children[0]
+            grandparent = self._parent[parent]
+            self._parent[npr] = grandparent
+            if grandparent < 0:
+                self._root = npr
+            else:
+                children = self._children[grandparent, :self._num_children[grandparent]]
+                children[children == parent] = npr
+            self._in_use[parent] = False
+            self._free_nodes.append(parent)
 
     # Read/Write file functions
     @cython.ccall
@@ -350,13 +906,7 @@ class NDTree(object):
         """
         assert (finput is not None), 'File object should not be null'
 
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        set_limit(max_rec)
-        sys.setrecursionlimit(max_rec)
-
-        self.root = pickle.load(finput)
+        self.__setstate__(pickle.load(finput))
         self.max_points = pickle.load(finput)
         self.min_children = pickle.load(finput)
 
@@ -382,21 +932,8 @@ class NDTree(object):
         """
         assert (finput is not None), 'File object should not be null'
 
-        @cython.locals(inline=str, pi=str)
-        def _line2tuple(inline):
-            """
-            line = (x1,x2,...,xn)
-            """
-            line = inline
-            line = line.replace('(', '')
-            line = line.replace(')', '')
-            line = line.split(',')
-            return tuple(float(pi) for pi in line)
-
         self.__init__()
-        point_list = (_line2tuple(line) for line in finput)
-        for point in point_list:
-            self.update_point(point)
+        self.update_points(read_points(finput))
 
     @cython.ccall
     @cython.locals(mode=str, fname=str, append=cython.bint, human_readable=cython.bint)
@@ -462,13 +999,7 @@ class NDTree(object):
         """
         assert (foutput is not None), 'File object should not be null'
 
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        set_limit(max_rec)
-        sys.setrecursionlimit(max_rec)
-
-        pickle.dump(self.root, foutput, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(self.__getstate__(), foutput, pickle.HIGHEST_PROTOCOL)
         pickle.dump(self.max_points, foutput, pickle.HIGHEST_PROTOCOL)
         pickle.dump(self.min_children, foutput, pickle.HIGHEST_PROTOCOL)
 
@@ -501,608 +1032,3 @@ class NDTree(object):
             # line = (x1, x2, ..., xn)
             foutput.write(str(point))
             foutput.write('\n')
-
-
-@cython.cclass
-class Node(object):
-    rect = cython.declare(object, visibility='public')
-    parent = cython.declare(object, visibility='public')
-    nodes = cython.declare(list, visibility='public')
-    L = cython.declare(list, visibility='public')
-    max_points = cython.declare(cython.ulong, visibility='public')
-    min_children = cython.declare(cython.ushort, visibility='public')
-
-    @cython.locals(parent=object, max_points=cython.ulong, min_children=cython.ushort)
-    @cython.returns(cython.void)
-    def __init__(self, parent=None, max_points=2, min_children=2):
-        # type: (Node, Node, int, int) -> None
-        """
-        A Node is composed of:
-            - nodes: a list [n_1,..,n_n] of Nodes (i.e., descendants).
-            - L: a list [p_1,..,p_n] of points stored in the current Node.
-            - rect: a Rectangle that encloses all the points contained in L and the descendants.
-            (Rectangle rect is used for optimising some operations by comparing a point with the
-            corners of the rectangle)-
-
-        Extra parameteres are:
-            - parent: a pointer to the precedent Node.
-            - max_children: an integer that specifies the maximum length of self.nodes.
-            - max_points: an integer that specifies the maximum length of self.L.
-        """
-        self.rect = None
-        self.parent = parent
-        self.nodes = []
-        self.L = []
-        self.max_points = max_points
-        self.min_children = min_children
-        parent.add_node(self) if parent is not None else None
-        # self.setParent(parent)
-
-    # Membership function
-    @cython.ccall
-    @cython.locals(x=tuple)
-    @cython.returns(cython.bint)
-    def has_point(self, x):
-        # type: (Node, tuple) -> bool
-        """
-        Checking if point x is contained in self.L.
-        """
-        return x in self.L
-
-    @cython.returns(cython.bint)
-    def has_point_rec(self, x):
-        # type: (Node, tuple) -> bool
-        """
-        Checking if point x is contained in self.L or in
-        any descendant Node.
-        """
-        if self.is_leaf():
-            return self.has_point(x)
-        else:
-            _hasPoint = (n.has_point_rec(x) for n in self.nodes)
-            return any(_hasPoint)
-
-    @cython.locals(x=tuple)
-    @cython.returns(cython.bint)
-    def __contains__(self, x):
-        # type: (Node, tuple) -> bool
-        """
-        Synonym for self.has_point_rec(x)
-        """
-        return self.has_point_rec(x)
-
-    @cython.ccall
-    @cython.locals(nesting_level=int, _string=str, i=int, x=tuple)
-    @cython.returns(str)
-    def _to_str(self, nesting_level=0):
-        # type: (Node, int) -> str
-        """
-        Printer.
-        """
-        _string = '\t' * nesting_level
-        _string += '['
-        for i, x in enumerate(self.L):
-            _string += str(x)
-            _string += ', ' if i < (len(self.L) - 1) else ']'
-            # _string += ', ' if i < (len(self.L)-1) else ''
-        # _string += ']\n'
-        return _string
-
-    @cython.locals(nesting_level=int)
-    @cython.returns(str)
-    def to_str_rec(self, nesting_level=0):
-        # type: (Node, int) -> str
-        """
-        Printer.
-        """
-        if self.is_leaf():
-            return self._to_str(nesting_level)
-        else:
-            _strings = (x.to_str_rec(nesting_level + 1) for x in self.nodes)
-            return '\n'.join(_strings)
-
-    @cython.returns(str)
-    def __repr__(self):
-        # type: (Node) -> str
-        """
-        Printer.
-        """
-        return self.to_str_rec(0)
-
-    @cython.returns(str)
-    def __str__(self):
-        # type: (Node) -> str
-        """
-        Printer.
-        """
-        return self.to_str_rec(0)
-
-    @cython.locals(other=object, eqRect=cython.bint, eqParent=cython.bint, sameContent=cython.bint)
-    @cython.returns(cython.bint)
-    def __eq__(self, other):
-        # type: (Node, Node) -> bool
-        """
-        self == other
-        """
-        eqRect = (hash(other.rect) == hash(self.rect))
-        eqParent = (hash(other.parent) == hash(self.parent))
-        sameContent = (other.nodes == self.nodes) and \
-                      (other.L == self.L) and \
-                      (other.max_points == self.max_points) and \
-                      (other.min_children == self.min_children)
-
-        return eqRect and eqParent and sameContent
-
-    @cython.locals(other=object)
-    @cython.returns(cython.bint)
-    def __ne__(self, other):
-        # type: (Node, Node) -> bool
-        """
-        self != other
-        """
-        return not self.__eq__(other)
-
-    @cython.returns(int)
-    def __hash__(self):
-        # type: (Node) -> int
-        """
-        Identity function (via hashing)
-        """
-        # hash cannot be computed over 'list'; use 'tuple' instead
-        # return hash((self.rect, self.parent, tuple(self.nodes), tuple(self.L), self.MAX_POINTS, self.MIN_CHILDREN))
-        return hash((self.rect, self.parent, tuple(self.L), self.max_points, self.min_children))
-
-    # Report functions
-    @cython.ccall
-    @cython.returns(cython.void)
-    def _report(self):
-        """
-        Report function.
-        """
-        RootOracle.logger.info('\tCurrent {0}'.format(id(self)))  # self type(self).__name__
-        RootOracle.logger.info('\tParent {0}'.format(id(self.parent)))  # self.parent type(self.parent).__name__
-        RootOracle.logger.info('\tNum Successors {0}'.format(len(self.nodes)))
-        RootOracle.logger.info('\tSuccessors {0}'.format([id(n) for n in self.nodes]))
-        RootOracle.logger.info('\tNum Points {0}'.format(len(self.L)))
-        RootOracle.logger.info('\tPoints {0}'.format(self.L))
-        RootOracle.logger.info('\tRect {0}'.format(str(self.rect)))
-
-    @cython.ccall
-    @cython.returns(cython.void)
-    def report_rec(self):
-        """
-        Report function.
-        """
-        self._report()
-        [n.report_rec() for n in self.nodes]
-
-    # Functions for checking the type of node
-    @cython.ccall
-    @cython.returns(cython.bint)
-    def is_root(self):
-        # type: (Node) -> bool
-        """
-        Checking if self has a parent.
-        """
-        return self.parent is None
-
-    @cython.ccall
-    @cython.returns(cython.bint)
-    def is_leaf(self):
-        # type: (Node) -> bool
-        """
-        Checking if self has any descendant Node.
-        """
-        return self.num_subnodes() == 0
-
-    # Node operations
-    @cython.ccall
-    @cython.locals(n=object, pos=int)
-    @cython.returns(cython.void)
-    def add_node(self, n, pos=-1):
-        # type: (Node, Node, int) -> None
-        """
-        Addition or update of Node n as descendant of self.
-        """
-        if n not in self.nodes:
-            n.set_parent(self)
-            if (pos >= 0) and (pos < len(self.nodes)):
-                self.nodes.insert(pos, n)
-            else:
-                self.nodes.append(n)
-
-    @cython.ccall
-    @cython.locals(n=object)
-    @cython.returns(cython.void)
-    def remove_node(self, n):
-        # type: (Node, Node) -> None
-        """
-        Removal of a direct descendant Node n.
-        """
-        if n in self.nodes:
-            self.nodes.remove(n)
-            del n
-
-    @cython.ccall
-    @cython.locals(n=object, npr=object, index=int)
-    @cython.returns(cython.void)
-    def replace_node(self, n, npr):
-        # type: (Node, Node, Node) -> None
-        """
-        Replacement of a direct descendant Node n by Node npr.
-        """
-        if n in self.nodes:
-            index = self.nodes.index(n)
-            self.add_node(npr, index)
-            self.remove_node(n)
-
-    @cython.ccall
-    @cython.locals(pos=int)
-    @cython.returns(object)
-    def get_subnode(self, pos=0):
-        # type: (Node, int) -> Node
-        """
-        Getting direct descendant at position pos.
-        """
-        return self.nodes[pos]
-
-    @cython.ccall
-    @cython.returns(set)
-    def get_subnodes(self):
-        # type: (Node) -> set
-        """
-        Set of direct descendant.
-        """
-        return set(self.nodes)
-
-    @cython.ccall
-    @cython.returns(int)
-    def num_subnodes(self):
-        # type: (Node) -> int
-        """
-        Number of direct descendants.
-        """
-        return len(self.nodes)
-
-    @cython.ccall
-    @cython.returns(cython.bint)
-    def is_empty_solution(self):
-        # type: (Node) -> bool
-        """
-        Testing the emptiness of current Node
-        (i.e., no points and no descendants).
-        """
-        return (self is None) or \
-               ((self.num_points() == 0) and (self.num_subnodes() == 0))
-
-    # Point operations
-    @cython.ccall
-    @cython.locals(x=tuple, pos=int)
-    @cython.returns(cython.void)
-    def add_point(self, x, pos=-1):
-        # type: (Node, tuple, int) -> None
-        """
-        Addition of a new point to the current Node.
-        """
-        if (pos >= 0) and (pos < len(self.L)):
-            self.L.insert(pos, x)
-        else:
-            self.L.append(x)
-
-    @cython.ccall
-    @cython.locals(x=tuple)
-    @cython.returns(cython.void)
-    def remove_point(self, x):
-        # type: (Node, tuple) -> None
-        """
-        Removal of point x from current Node (if it is in).
-        """
-        if x in self.L:
-            self.L.remove(x)
-            del x
-
-    @cython.ccall
-    @cython.locals(x=tuple, xp=tuple, index=int)
-    @cython.returns(cython.void)
-    def replace_point(self, x, xp):
-        # type: (Node, tuple, tuple) -> None
-        """
-        Replacement of point x by point xp if x is in the current Node.
-        """
-        if x in self.L:
-            index = self.L.index(x)
-            self.add_point(xp, index)
-            self.remove_point(x)
-
-    @cython.ccall
-    @cython.locals(pos=int)
-    @cython.returns(tuple)
-    def get_point(self, pos=0):
-        # type: (Node, int) -> tuple
-        """
-        Getting point from the current Node.
-        """
-        return self.L[pos]
-
-    @cython.ccall
-    @cython.returns(set)
-    def get_points(self):
-        # type: (Node) -> set
-        """
-        Getting set of points from the current Node.
-        """
-        return set(self.L)
-
-    # Set of points
-    @cython.locals(temp=set, i=object)
-    @cython.returns(set)
-    def s(self):
-        # type: (Node) -> set
-        """
-        Getting set of points from the current Node and from
-        its descendants.
-        """
-        # if n == leaf, S(n) == L(n)
-        if self.is_leaf():
-            return set(self.L)
-        # if n == internal, S(n) == U S(m) for all m in descendent(n)
-        else:
-            temp_list = (i.s() for i in self.nodes)
-            temp = set.union(*temp_list)
-            return temp
-
-    @cython.ccall
-    @cython.returns(int)
-    def num_points(self):
-        # type: (Node) -> int
-        """
-        Number of points in the current Node.
-        """
-        return len(self.L)
-
-    @cython.ccall
-    @cython.returns(cython.bint)
-    def has_points(self):
-        # type: (Node) -> bool
-        """
-        self.num_points() > 0.
-        """
-        return (self is not None) and (len(self.L) > 0)
-
-    # Relationship functions
-    @cython.ccall
-    @cython.returns(object)
-    def get_parent(self):
-        # type: (Node) -> Node
-        """
-        Getting parent Node.
-        """
-        return self.parent
-
-    @cython.ccall
-    @cython.locals(parent=object)
-    @cython.returns(object)
-    def set_parent(self, parent):
-        # type: (Node, Node) -> None
-        """
-        Setting parent Node.
-        """
-        self.parent = parent
-
-    # Rectangle Operations
-    @cython.ccall
-    @cython.returns(object)
-    def get_rectangle_sn(self):
-        # type: (Node) -> Rectangle
-        """
-        Getting rectangle self.rect.
-        """
-        return self.rect
-
-    @cython.ccall
-    @cython.locals(rect=object)
-    @cython.returns(cython.void)
-    def set_rectangle_sn(self, rect):
-        # type: (Node, Rectangle) -> None
-        """
-        Setting rectangle self.rect.
-        """
-        self.rect = rect
-
-    # NDTree operations
-    @cython.locals(lsorted=list)
-    @cython.returns(object)
-    def find_closest_node(self, x):
-        # type: (Node, tuple) -> Node
-        """
-        Searching for the Node containing the closest point to x.
-        """
-        lsorted = sorted(self.nodes, key=lambda node: node.rect.distance_to_center(x))
-        return lsorted[0]
-
-    @cython.ccall
-    @cython.locals(x=tuple, npr=object)
-    @cython.returns(cython.void)
-    def insert(self, x):
-        # type: (Node, tuple) -> None
-        """
-        Insertion of a point into the Node.
-        """
-        if self.is_leaf():
-            self.add_point(x)
-            self.update_ideal_nadir(x)
-            if self.num_points() > self.max_points:
-                self.split()
-        else:
-            # Internal point
-            npr = self.find_closest_node(x)
-            npr.insert(x)
-
-    @cython.locals(d=int, y=tuple,
-                   max_distance=cython.double, mean_max_distance=cython.double, temp_mean_max_distance=cython.double)
-    @cython.returns((tuple, cython.double))
-    def find_point_highest_average_euclidean_distance(self):
-        # type: (Node) -> (tuple, float)
-        """
-        Computation of the 'center of mass' of the current Node,
-        and the mean distance between this center and each point
-        contained in the Node.
-        """
-        d = dim(self.L[0]) if self.num_points() > 0 else 1
-        y = (0,) * d
-        mean_max_distance = 0
-        for yp in self.L:
-            dist_list = (distance(yp, xp) for xp in self.L)
-            max_distance = sum(dist_list)
-            temp_mean_max_distance = max_distance / (self.num_points() - 1)
-            if temp_mean_max_distance > mean_max_distance:
-                mean_max_distance = temp_mean_max_distance
-                y = yp
-        return y, mean_max_distance
-
-    @cython.ccall
-    @cython.locals(y=tuple, npr=object)
-    @cython.returns(cython.void)
-    def split(self):
-        # type: (Node) -> None
-        """
-        Creation of new descendant Nodes of current Node.
-        This function is called when the number of points hosted in
-        the current node increases until reaching a threshold.
-        """
-        y, _ = self.find_point_highest_average_euclidean_distance()
-        npr = Node(parent=self, max_points=self.max_points, min_children=self.min_children)
-        npr.add_point(y)
-        npr.update_ideal_nadir(y)
-        self.remove_point(y)
-        while self.num_subnodes() < self.min_children:
-            y, _ = self.find_point_highest_average_euclidean_distance()
-            npr = Node(parent=self, max_points=self.max_points, min_children=self.min_children)
-            npr.add_point(y)
-            npr.update_ideal_nadir(y)
-            self.remove_point(y)
-        while self.has_points():
-            # y = self.L.pop()
-            y = self.L[0]
-            npr = self.find_closest_node(y)
-            npr.add_point(y)
-            npr.update_ideal_nadir(y)
-            self.remove_point(y)
-
-    @cython.locals(x=tuple,
-                   nout=object, rect=object, nparent=object, y=tuple, update=cython.bint)
-    @cython.returns((object, cython.bint))
-    def update_node(self, x):
-        # type: (Node, tuple) -> (Node, bool)
-        """
-        Insertion of a new point in the Node; either in self.L
-        or in any descendant Node.
-        Side effect: removal of points that are dominated by x.
-        """
-        nout = self
-        rect = self.get_rectangle_sn()
-        if less_equal(rect.max_corner, x):
-            # x is rejected
-            return nout, False
-        elif less_equal(x, rect.min_corner):
-            # remove n and its whole sub-tree
-            nparent = self.get_parent()
-            nparent.remove_node(self) if nparent is not None else None
-            # create empty node
-            nout = Node(max_points=self.max_points, min_children=self.min_children)
-        elif less_equal(rect.min_corner, x) or less_equal(x, rect.max_corner):
-            if self.is_leaf():
-                for y in self.L:
-                    if less_equal(y, x):
-                        # x is rejected
-                        return nout, False
-                    elif less_equal(x, y):
-                        # y is removed
-                        self.remove_point(y)
-            else:
-                for npr in self.nodes:
-                    npr, update = npr.update_node(x)
-                    if not update:
-                        return nout, False
-                    elif npr.is_empty_solution():
-                        self.remove_node(npr)
-                if self.num_subnodes() == 1:
-                    # Remove node n and use npr in place of n
-                    npr = self.get_subnode()
-                    nparent = self.get_parent()
-                    nparent.replace_node(self, npr) if nparent is not None else None
-                    # nparent.replaceNode(self, npr) if nparent is not None else self = npr
-        # else:
-        # Skip this node
-        return nout, True
-
-    @cython.locals(rect=object, n=cython.ushort, updateIdeal=cython.bint, updateNadir=cython.bint, npr=object)
-    @cython.returns(cython.void)
-    def update_ideal_nadir(self, x):
-        # type: (Node, tuple) -> None
-        """
-        Updating self.rect according to the value of point x.
-        """
-        self.rect = self.get_rectangle_sn()
-        if self.rect is None:
-            # New Ideal and Nadir points
-            # dim(ideal) == dim(nadir) == dim(x)
-            # n = Point.dim(x)
-            n = dim(x)
-            ideal = (float('inf'),) * n
-            nadir = (float('-inf'),) * n
-            # Delayed creation of Rectangle.
-            # Before this point, we do not the dim(x)
-            self.rect = Rectangle(ideal, nadir)
-        else:
-            ideal = self.rect.min_corner
-            nadir = self.rect.max_corner
-
-        # Test if the current rectangle already includes the components from x
-        # (i.e., condition '<='/'>=' in the comparisons).
-        # This comparison allows triggering the rectangle update recursively in parent nodes.
-        updateIdeal = any(xi < ideali for xi, ideali in zip(x, ideal))
-        updateNadir = any(xi > nadiri for xi, nadiri in zip(x, nadir))
-
-        if updateIdeal or updateNadir:
-            # We only effectively update ideal and nadir points if the components from x are strictly lesser or greater
-            # than current components of the rectangle.
-            # ideal = tuple(xi if xi < ideali else ideali for xi, ideali in zip(x, ideal))
-            # nadir = tuple(xi if xi > nadiri else nadiri for xi, nadiri in zip(x, nadir))
-
-            ideal = tuple(min(xi, ideali) for xi, ideali in zip(x, ideal))
-            nadir = tuple(max(xi, nadiri) for xi, nadiri in zip(x, nadir))
-
-            self.rect.min_corner = ideal
-            self.rect.max_corner = nadir
-
-            if not self.is_root():
-                npr = self.get_parent()
-                npr.update_ideal_nadir(x)
-
-    @cython.locals(rect=object, test1=cython.bint, test2=cython.bint)
-    @cython.returns(cython.bint)
-    def dominates(self, x):
-        # type: (Node, tuple) -> bool
-        """
-        Checking if a point x is dominated by any point stored in the
-        current Node or in the descendants.
-        """
-        # Use the rectangle associated to the Node for speeding up the evaluation.
-        rect = self.get_rectangle_sn()
-        if less(rect.max_corner, x):
-            # x is dominated by the Pareto front
-            return True
-        elif less(x, rect.min_corner):
-            # x dominates the Pareto front
-            return False
-        elif (rect.min_corner == x) or (rect.max_corner == x):
-            return True
-        else:
-            # x is inside the rectangle enclosing the Pareto front, or
-            # x is incomparable to the min and max corners.
-            # Therefore, we must explicitly check if x is dominated by
-            # any point of the current subtree.
-            test1 = any(less_equal(p, x) for p in self.L)
-            test2 = any(n.dominates(x) for n in self.nodes)
-            return test1 or test2
@@ -142,6 +142,29 @@ class Oracle(object):
         """
         return False
 
+    @cython.ccall
+    @cython.returns(cython.bint)
+    def is_vectorized(self):
+        # type: (Oracle) -> bool
+        """
+        Whether the Oracle answers a list of points (see member_batch) faster
+        than the same points one by one. Search algorithms only send batches
+        of points to vectorized Oracles, since otherwise they would lose the
+        chance of stopping at the first conclusive answer.
+
+        Args:
+            self (Oracle): The Oracle.
+
+        Returns:
+            bool: True if member_batch is vectorized.
+
+        Example:
+        >>> ora = Oracle()
+        >>> ora.is_vectorized()
+        >>> False
+        """
+        return False
+
     @cython.returns(object)
     def membership(self):
         # type: (Oracle) -> callable
@@ -0,0 +1,471 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""OracleMemo.
+
+This module instantiate the abstract interface Oracle.
+The OracleMemo wraps another Oracle and stores the answers of its
+membership queries in a persistent SQLite database. Successive runs
+of the search algorithms over the same oracle (e.g., the same STL
+formula and signal) reuse the answers that were computed before
+instead of querying the oracle again.
+
+Answers are indexed by:
+- a fingerprint of the wrapped oracle and of the resolution, i.e., a
+  hash of its text representation (see Oracle.to_file_text()) where
+  the paths to files (e.g., formula, signal and parameter files of
+  OracleSTL) are replaced by their content, and
+- the point, quantized to a grid of step 'resolution'. Two points
+  closer than 'resolution' in every coordinate may share the answer.
+
+The database can be shared by several processes (e.g., the workers
+of ParSearch). SQLite serializes the concurrent writes and every
+process opens its own connection.
+"""
+
+import os
+import io
+import copy
+import hashlib
+import sqlite3
+import cython
+
+# import ParetoLib.Oracle as RootOracle
+import ParetoLib.Oracle
+from ParetoLib.Oracle.Oracle import Oracle
+
+RootOracle = ParetoLib.Oracle
+
+# Default quantization step of the points
+MEMO_RESOLUTION = 1e-9
+# Seconds that a process waits for the lock of the database
+MEMO_TIMEOUT = 60.0
+# Number of hits that are counted in memory before updating the statistics of the database
+MEMO_FLUSH = 100
+# Size in bytes of the blocks used for hashing the files of the oracle
+MEMO_BLOCK_SIZE = 1 << 20
+
+
+# @cython.cclass
+class OracleMemo(Oracle):
+    cython.declare(oracle=object, memo_file=str, resolution=cython.double, num_calls=cython.ulong,
+                   num_hits=cython.ulong, _fingerprint=str, _conn=object, _pid=cython.int,
+                   _pending_calls=cython.ulong, _pending_hits=cython.ulong)
+
+    @cython.locals(oracle=object, memo_file=str, resolution=cython.double)
+    @cython.returns(cython.void)
+    def __init__(self, oracle=None, memo_file='', resolution=MEMO_RESOLUTION):
+        # type: (OracleMemo, Oracle, str, float) -> None
+        """
+        Initialization of OracleMemo.
+
+        Args:
+            oracle (Oracle): The Oracle whose answers are memoized.
+            memo_file (str): SQLite database where the answers are stored.
+                             It is created if it does not exist.
+            resolution (float): Quantization step of the coordinates of the points.
+        """
+        assert resolution > 0.0, 'Resolution should be positive'
+        Oracle.__init__(self)
+        self.oracle = oracle
+        self.memo_file = memo_file
+        self.resolution = resolution
+
+        # Statistics of this instance
+        self.num_calls = 0
+        self.num_hits = 0
+
+        self._fingerprint = None
+        self._conn = None
+        self._pid = None
+        self._pending_calls = 0
+        self._pending_hits = 0
+
+    def __del__(self):
+        # type: (OracleMemo) -> None
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @cython.returns(str)
+    def __repr__(self):
+        # type: (OracleMemo) -> str
+        """
+        Printer.
+        """
+        return self._to_str()
+
+    @cython.returns(str)
+    def __str__(self):
+        # type: (OracleMemo) -> str
+        """
+        Printer.
+        """
+        return self._to_str()
+
+    @cython.returns(str)
+    def _to_str(self):
+        # type: (OracleMemo) -> str
+        """
+        Printer.
+        """
+        return 'OracleMemo({0}, {1}, {2})'.format(self.memo_file, self.resolution, self.oracle)
+
+    @cython.returns(cython.bint)
+    def __eq__(self, other):
+        # type: (OracleMemo, OracleMemo) -> bool
+        """
+        self == other
+        """
+        return isinstance(other, OracleMemo) and (self.memo_file == other.memo_file) \
+               and (self.resolution == other.resolution) and (self.oracle == other.oracle)
+
+    @cython.returns(int)
+    def __hash__(self):
+        # type: (OracleMemo) -> int
+        """
+        Identity function (via hashing).
+        """
+        return hash((self.memo_file, self.resolution, hash(self.oracle)))
+
+    @cython.returns(object)
+    def __copy__(self):
+        # type: (OracleMemo) -> OracleMemo
+        """
+        other = copy.copy(self)
+        """
+        return OracleMemo(oracle=self.oracle, memo_file=self.memo_file, resolution=self.resolution)
+
+    @cython.returns(object)
+    def __deepcopy__(self, memo):
+        # type: (OracleMemo, dict) -> OracleMemo
+        """
+        other = copy.deepcopy(self)
+        """
+        # deepcopy function is required for creating multiple instances of the Oracle in ParSearch.
+        # SQLite connections cannot be shared between processes, so every copy opens its own one.
+        return OracleMemo(oracle=copy.deepcopy(self.oracle, memo), memo_file=self.memo_file,
+                          resolution=self.resolution)
+
+    @cython.returns(dict)
+    def __getstate__(self):
+        # type: (OracleMemo) -> dict
+        """
+        Pickling of OracleMemo (e.g., when it is sent to a worker of ParSearch).
+        The connection to the database and the statistics are not pickled.
+        """
+        return {'oracle': self.oracle, 'memo_file': self.memo_file, 'resolution': self.resolution}
+
+    @cython.returns(cython.void)
+    def __setstate__(self, state):
+        # type: (OracleMemo, dict) -> None
+        """
+        Unpickling of OracleMemo.
+        """
+        self.__init__(**state)
+
+    @cython.ccall
+    @cython.returns(cython.ushort)
+    def dim(self):
+        # type: (OracleMemo) -> int
+        """
+        See Oracle.dim().
+        """
+        return self.oracle.dim()
+
+    @cython.ccall
+    @cython.returns(list)
+    def get_var_names(self):
+        # type: (OracleMemo) -> list
+        """
+        See Oracle.get_var_names().
+        """
+        return self.oracle.get_var_names()
+
+    # Database
+    @cython.returns(str)
+    @cython.locals(text=object, sha=object, line=str, finput=object, block=bytes)
+    def fingerprint(self):
+        # type: (OracleMemo) -> str
+        """
+        Hash that identifies the wrapped oracle and the quantization of the points.
+
+        The fingerprint combines the type of the oracle, the resolution,
+        and the text representation of the oracle (see Oracle.to_file_text()).
+        Lines of that text that name an existing file (e.g., the STL formula,
+        signal and parameter files of OracleSTL) contribute with the content
+        of the file instead of its path. Thus, moving the files keeps the
+        answers, while editing the formula or the signal invalidates them.
+
+        Args:
+            self (OracleMemo): The OracleMemo.
+
+        Returns:
+            str: Hexadecimal SHA-256 digest.
+
+        Example:
+        >>> ora = OracleMemo(OracleFunction(), 'memo.db')
+        >>> ora.fingerprint()
+        >>> '6d4a...'
+        """
+        if self._fingerprint is None:
+            text = io.StringIO()
+            self.oracle.to_file_text(text)
+
+            sha = hashlib.sha256()
+            sha.update(type(self.oracle).__name__.encode('utf-8'))
+            sha.update(repr(self.resolution).encode('utf-8'))
+            for line in text.getvalue().splitlines():
+                if line.strip() != '' and os.path.isfile(line.strip()):
+                    # Signals may take several GB, so files are hashed by blocks
+                    sha.update(b'\0file\0')
+                    with open(line.strip(), 'rb') as finput:
+                        for block in iter(lambda: finput.read(MEMO_BLOCK_SIZE), b''):
+                            sha.update(block)
+                else:
+                    sha.update(b'\0line\0' + line.encode('utf-8'))
+            self._fingerprint = sha.hexdigest()
+        return self._fingerprint
+
+    @cython.returns(object)
+    def _connection(self):
+        # type: (OracleMemo) -> sqlite3.Connection
+        # Connections are opened lazily by every process that uses the oracle
+        if (self._conn is None) or (self._pid != os.getpid()):
+            assert (self.memo_file != ''), 'Filename should not be null'
+            self._conn = sqlite3.connect(self.memo_file, timeout=MEMO_TIMEOUT)
+            self._pid = os.getpid()
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            with self._conn:
+                self._conn.execute('CREATE TABLE IF NOT EXISTS memo ('
+                                   'fingerprint TEXT NOT NULL, point TEXT NOT NULL, member INTEGER NOT NULL, '
+                                   'PRIMARY KEY (fingerprint, point))')
+                self._conn.execute('CREATE TABLE IF NOT EXISTS stats ('
+                                   'fingerprint TEXT PRIMARY KEY, calls INTEGER NOT NULL, hits INTEGER NOT NULL)')
+        return self._conn
+
+    @cython.returns(str)
+    @cython.locals(point=tuple, xi=cython.double)
+    def _key(self, point):
+        # type: (OracleMemo, tuple) -> str
+        return ','.join(str(int(round(xi / self.resolution))) for xi in point)
+
+    @cython.returns(cython.void)
+    @cython.locals(conn=object)
+    def _update_stats(self, conn):
+        # type: (OracleMemo, sqlite3.Connection) -> None
+        # Must be called inside a transaction
+        conn.execute('INSERT OR IGNORE INTO stats (fingerprint, calls, hits) VALUES (?, 0, 0)',
+                     (self.fingerprint(),))
+        conn.execute('UPDATE stats SET calls = calls + ?, hits = hits + ? WHERE fingerprint = ?',
+                     (self._pending_calls, self._pending_hits, self.fingerprint()))
+        self._pending_calls = 0
+        self._pending_hits = 0
+
+    @cython.returns(cython.void)
+    @cython.locals(conn=object)
+    def flush(self):
+        # type: (OracleMemo) -> None
+        """
+        Saves the statistics that are pending in memory into the database.
+
+        Args:
+            self (OracleMemo): The OracleMemo.
+
+        Returns:
+            None: The statistics of the database are updated.
+        """
+        if self._pending_calls > 0:
+            conn = self._connection()
+            with conn:
+                self._update_stats(conn)
+
+    @cython.returns(cython.void)
+    def close(self):
+        # type: (OracleMemo) -> None
+        """
+        Saves the pending statistics and closes the connection to the database.
+
+        Args:
+            self (OracleMemo): The OracleMemo.
+
+        Returns:
+            None: The connection is closed.
+        """
+        if (self._conn is not None) and (self._pid == os.getpid()):
+            self.flush()
+            self._conn.close()
+        self._conn = None
+        self._pid = None
+
+    # Membership functions
+    @cython.locals(point=tuple, key=str, conn=object, row=object, res=cython.bint)
+    @cython.returns(cython.bint)
+    def member(self, point):
+        # type: (OracleMemo, tuple) -> bool
+        """
+        See Oracle.member().
+        The wrapped oracle is only queried when the answer for the point
+        is not stored in the database.
+        """
+        key = self._key(point)
+        conn = self._connection()
+        row = conn.execute('SELECT member FROM memo WHERE fingerprint = ? AND point = ?',
+                           (self.fingerprint(), key)).fetchone()
+
+        self.num_calls = self.num_calls + 1
+        self._pending_calls = self._pending_calls + 1
+        if row is not None:
+            self.num_hits = self.num_hits + 1
+            self._pending_hits = self._pending_hits + 1
+            if self._pending_hits >= MEMO_FLUSH:
+                self.flush()
+            return bool(row[0])
+
+        res = self.oracle.member(point)
+        # Statistics are written together with the new answer, in the same transaction
+        with conn:
+            conn.execute('INSERT OR IGNORE INTO memo (fingerprint, point, member) VALUES (?, ?, ?)',
+                         (self.fingerprint(), key, int(res)))
+            self._update_stats(conn)
+        return res
+
+    @cython.returns(cython.bint)
+    def is_vectorized(self):
+        # type: (OracleMemo) -> bool
+        """
+        See Oracle.is_vectorized().
+        """
+        return self.oracle.is_vectorized()
+
+    @cython.locals(xpoints=list, keys=list, conn=object, known=dict, i=cython.ulong, key=str, missing=list,
+                   res=list, answers=list)
+    @cython.returns(list)
+    def member_batch(self, xpoints):
+        # type: (OracleMemo, list) -> list
+        """
+        Membership of a list of points.
+        Points that are not stored in the database are evaluated by the
+        wrapped oracle in a single batch when it provides member_batch().
+
+        Args:
+            self (OracleMemo): The OracleMemo.
+            xpoints (list): List of points.
+
+        Returns:
+            list: List of booleans, one for each point.
+        """
+        keys = [self._key(point) for point in xpoints]
+        conn = self._connection()
+        known = {}
+        for key in set(keys):
+            row = conn.execute('SELECT member FROM memo WHERE fingerprint = ? AND point = ?',
+                               (self.fingerprint(), key)).fetchone()
+            if row is not None:
+                known[key] = bool(row[0])
+
+        missing = [i for i, key in enumerate(keys) if key not in known]
+        self.num_calls = self.num_calls + len(keys)
+        self.num_hits = self.num_hits + len(keys) - len(missing)
+        self._pending_calls = self._pending_calls + len(keys)
+        self._pending_hits = self._pending_hits + len(keys) - len(missing)
+
+        if self.oracle.is_vectorized():
+            answers = self.oracle.member_batch([xpoints[i] for i in missing])
+        else:
+            answers = [self.oracle.member(xpoints[i]) for i in missing]
+
+        with conn:
+            for i, res in zip(missing, answers):
+                known[keys[i]] = res
+                conn.execute('INSERT OR IGNORE INTO memo (fingerprint, point, member) VALUES (?, ?, ?)',
+                             (self.fingerprint(), keys[i], int(res)))
+            self._update_stats(conn)
+        return [known[key] for key in keys]
+
+    @cython.returns(object)
+    def membership(self):
+        # type: (OracleMemo) -> callable
+        """
+        See Oracle.membership().
+        """
+        return lambda point: self.member(point)
+
+    # Statistics
+    @cython.returns(cython.double)
+    def hit_ratio(self):
+        # type: (OracleMemo) -> float
+        """
+        Fraction of the membership queries of this instance that were
+        answered by the database.
+
+        Args:
+            self (OracleMemo): The OracleMemo.
+
+        Returns:
+            float: Number in [0, 1].
+
+        Example:
+        >>> ora = OracleMemo(OracleFunction(), 'memo.db')
+        >>> ora.member((0.0, 0.0))
+        >>> ora.member((0.0, 0.0))
+        >>> ora.hit_ratio()
+        >>> 0.5
+        """
+        return float(self.num_hits) / self.num_calls if self.num_calls > 0 else 0.0
+
+    @cython.returns(tuple)
+    @cython.locals(conn=object, row=object)
+    def stats(self):
+        # type: (OracleMemo) -> tuple
+        """
+        Statistics of all the processes and runs that used the database
+        with the same oracle (e.g., the workers of ParSearch).
+
+        Args:
+            self (OracleMemo): The OracleMemo.
+
+        Returns:
+            tuple: (calls, hits, hit ratio).
+
+        Example:
+        >>> ora = OracleMemo(OracleFunction(), 'memo.db')
+        >>> rs = ParSearch.multidim_search(xspace, ora)
+        >>> ora.stats()
+        >>> (1200, 300, 0.25)
+        """
+        self.flush()
+        conn = self._connection()
+        row = conn.execute('SELECT calls, hits FROM stats WHERE fingerprint = ?', (self.fingerprint(),)).fetchone()
+        if row is None:
+            return 0, 0, 0.0
+        return row[0], row[1], float(row[1]) / row[0] if row[0] > 0 else 0.0
+
+    @cython.returns(cython.ulong)
+    @cython.locals(conn=object)
+    def size(self):
+        # type: (OracleMemo) -> int
+        """
+        Number of answers stored in the database for the wrapped oracle.
+        """
+        conn = self._connection()
+        return conn.execute('SELECT COUNT(*) FROM memo WHERE fingerprint = ?', (self.fingerprint(),)).fetchone()[0]
+
+    @cython.returns(cython.void)
+    @cython.locals(conn=object)
+    def clear(self):
+        # type: (OracleMemo) -> None
+        """
+        Removes the answers and statistics stored for the wrapped oracle.
+        """
+        conn = self._connection()
+        self._pending_calls = 0
+        self._pending_hits = 0
+        with conn:
+            conn.execute('DELETE FROM memo WHERE fingerprint = ?', (self.fingerprint(),))
+            conn.execute('DELETE FROM stats WHERE fingerprint = ?', (self.fingerprint(),))
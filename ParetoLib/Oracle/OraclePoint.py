@@ -11,7 +11,9 @@ The OraclePoint defines the boundary between the upper and lower
 closures based on a discrete cloud of points. The cloud of points is
 saved in a NDTree [1], a data structure that is optimised for storing
 a Pareto front by removing redundant non-dominating points from the
-surface. A point x that dominates every member of the Pareto front
+surface. For 2D and 3D points, the NDTree is replaced by a Pareto
+archive that is specialised for the dimension (see ParetoArchive).
+A point x that dominates every member of the Pareto front
 belongs to the lower part of the monotone partition, while a point x
 that is dominated by any element of the Pareto front will fall in the
 upper part.
@@ -21,13 +23,12 @@ fast algorithm for the dynamic non-dominance problem. IEEE Trans-
 actions on Evolutionary Computation, 2018.
 """
 
-import sys
-import resource
 import io
 import pickle
 import cython
 
-from ParetoLib.Oracle.NDTree import NDTree
+from ParetoLib.Oracle.NDTree import NDTree, read_points
+from ParetoLib.Oracle.ParetoArchive import pareto_archive
 from ParetoLib.Oracle.Oracle import Oracle
 
 
@@ -95,14 +96,16 @@ class OraclePoint(Oracle):
         >>> ora = OraclePoint()
         >>> ora.add_point(x)
         """
+        self._select_archive(len(p))
         self.oracle.update_point(p)
 
-    @cython.locals(setpoints=set, point=tuple)
+    @cython.locals(setpoints=set, points=list)
     @cython.returns(cython.void)
     def add_points(self, setpoints):
         # type: (OraclePoint, set) -> None
         """
         Addition of a set of Point to the OraclePoint.
+        The Pareto archive is bulk loaded (see NDTree.update_points).
 
         Args:
             self (OraclePoint): The OraclePoint.
@@ -116,8 +119,18 @@ class OraclePoint(Oracle):
         >>> ora = OraclePoint()
         >>> ora.add_points(xset)
         """
-        for point in setpoints:
-            self.add_point(point)
+        points = list(setpoints)
+        if len(points) > 0:
+            self._select_archive(len(points[0]))
+        self.oracle.update_points(points)
+
+    @cython.locals(d=cython.ushort)
+    @cython.returns(cython.void)
+    def _select_archive(self, d):
+        # type: (OraclePoint, int) -> None
+        # The Pareto archive is chosen according to the dimension of the first points that are added
+        if self.oracle.is_empty():
+            self.oracle = pareto_archive(d, self.oracle.max_points, self.oracle.min_children)
 
     @cython.returns(set)
     def get_points(self):
@@ -214,8 +227,40 @@ class OraclePoint(Oracle):
         >>> ora.member(x)
         >>> False
         """
-        # Returns 'True' if p belongs to the set of points stored in the Pareto archive
-        return p in self.get_points()
+        # Returns 'True' if p is dominated by any point stored in the Pareto archive
+        return self.oracle.dominates(p)
+
+    @cython.returns(cython.bint)
+    def is_vectorized(self):
+        # type: (OraclePoint) -> bool
+        """
+        See Oracle.is_vectorized().
+        A batch of points is answered at once by the Pareto archive.
+        """
+        return True
+
+    @cython.locals(xpoints=list)
+    @cython.returns(list)
+    def member_batch(self, xpoints):
+        # type: (OraclePoint, list) -> list
+        """
+        Membership of a list of points.
+        The Pareto archive answers the whole list at once (see NDTree.dominates_batch).
+
+        Args:
+            self (OraclePoint): The OraclePoint.
+            xpoints (list): Points of the space that we inspect.
+
+        Returns:
+            list: For each point, True if it belongs to the upward closure.
+
+        Example:
+        >>> ora = OraclePoint()
+        >>> ora.add_point((0.0, 0.0))
+        >>> ora.member_batch([(1.0, 1.0), (-1.0, 1.0)])
+        >>> [True, False]
+        """
+        return self.oracle.dominates_batch(xpoints).tolist()
 
     @cython.returns(object)
     def membership(self):
@@ -241,7 +286,7 @@ class OraclePoint(Oracle):
         >>> False
         """
         # Returns 'True' if p is dominated by any point stored in the Pareto archive
-        return lambda p: self.oracle.dominates(p)
+        return lambda p: self.member(p)
 
     # Read/Write file functions
     @cython.returns(cython.void)
@@ -265,16 +310,10 @@ class OraclePoint(Oracle):
         >>> infile.close()
         """
         assert (finput is not None), 'File object should not be null'
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
-        sys.setrecursionlimit(max_rec)
-
         self.oracle = pickle.load(finput)
 
     @cython.returns(cython.void)
-    @cython.locals(point=tuple)
+    @cython.locals(finput=object, points=object)
     def from_file_text(self, finput=None):
         # type: (OraclePoint, io.BinaryIO) -> None
         """
@@ -295,20 +334,10 @@ class OraclePoint(Oracle):
         """
         assert (finput is not None), 'File object should not be null'
 
-        @cython.locals(inline=str)
-        def _line2tuple(inline):
-            # type: (str) -> tuple
-            line = inline
-            line = line.replace('(', '')
-            line = line.replace(')', '')
-            line = line.split(',')
-            return tuple(float(pi) for pi in line)
-
-        self.oracle = NDTree()
-
-        point_list = (_line2tuple(line) for line in finput)
-        for point in point_list:
-            self.oracle.update_point(point)
+        # The file is parsed with numpy and the Pareto archive is bulk loaded
+        points = read_points(finput)
+        self.oracle = pareto_archive(points.shape[1])
+        self.oracle.update_points(points)
 
     @cython.returns(cython.void)
     @cython.locals(foutput=object)
@@ -333,12 +362,6 @@ class OraclePoint(Oracle):
         """
         assert (foutput is not None), 'File object should not be null'
 
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
-        sys.setrecursionlimit(max_rec)
-
         pickle.dump(self.oracle, foutput, pickle.HIGHEST_PROTOCOL)
 
     @cython.returns(cython.void)
@@ -0,0 +1,750 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""OracleProcess.
+
+This module instantiate the abstract interface Oracle.
+The OracleProcess delegates the membership queries to external
+programs (e.g., simulators) that run as long-lived child processes.
+The children are started once, kept in a pool, and they receive
+batches of points through a small binary protocol over pipes or a
+Unix socket.
+
+Every message is framed as a 4-byte big-endian length followed by
+the payload. The first byte of the payload is the kind of message:
+
+Requests (parent -> child):
+- b'I': information about the oracle (var_names).
+- b'P': ping (health check).
+- b'M' + (n, d) + n*d float64: membership of n points of dimension d.
+- b'R' + (n, d) + n*d float64: robustness of n points of dimension d.
+- b'Q': quit.
+
+Responses (child -> parent):
+- b'I' + JSON: {'var_names': [...]}.
+- b'P': pong.
+- b'M' + n bytes: 1 if the point belongs to the upward closure, else 0.
+- b'R' + n float64: robustness of each point.
+- b'E' + UTF-8 text: error message.
+
+Integers (n, d) are unsigned 32-bit little-endian, and floats are
+64-bit little-endian.
+
+A pure Python reference child is included in this module.
+It serves an OracleFunction loaded from a text file:
+
+python -m ParetoLib.Oracle.OracleProcess [--socket path] [--delay sec] oracle_function.txt
+"""
+
+import os
+import sys
+import json
+import time
+import copy
+import struct
+import select
+import socket
+import shutil
+import tempfile
+import argparse
+import subprocess
+import cython
+import numpy as np
+
+# import ParetoLib.Oracle as RootOracle
+import ParetoLib.Oracle
+from ParetoLib.Oracle.Oracle import Oracle
+
+RootOracle = ParetoLib.Oracle
+
+# Wire protocol
+MSG_INFO = b'I'
+MSG_PING = b'P'
+MSG_MEMBER = b'M'
+MSG_ROBUSTNESS = b'R'
+MSG_QUIT = b'Q'
+MSG_ERROR = b'E'
+
+_HEADER = struct.Struct('>I')
+_SHAPE = struct.Struct('<II')
+
+# Transports
+TRANSPORT_PIPE = 'pipe'
+TRANSPORT_SOCKET = 'socket'
+
+# Command line of the reference child
+REFERENCE_CHILD_CMD = [sys.executable, '-m', 'ParetoLib.Oracle.OracleProcess']
+
+# Maximum time in seconds for a child to connect to the Unix socket when no timeout is set
+CONNECT_TIMEOUT = 30.0
+
+
+#############################
+# Encoding/decoding messages
+#############################
+
+@cython.locals(kind=bytes, points=object)
+@cython.returns(bytes)
+def encode_points(kind, points):
+    # type: (bytes, iter) -> bytes
+    points = np.asarray(points, dtype='<f8')
+    points = points.reshape((len(points), -1))
+    return kind + _SHAPE.pack(*points.shape) + points.tobytes()
+
+
+@cython.locals(payload=bytes, n=cython.uint, d=cython.uint)
+@cython.returns(object)
+def decode_points(payload):
+    # type: (bytes) -> np.ndarray
+    n, d = _SHAPE.unpack_from(payload, 1)
+    return np.frombuffer(payload, dtype='<f8', offset=1 + _SHAPE.size, count=n * d).reshape((n, d))
+
+
+@cython.locals(kind=bytes, results=object)
+@cython.returns(bytes)
+def encode_results(kind, results):
+    # type: (bytes, iter) -> bytes
+    if kind == MSG_MEMBER:
+        return kind + np.asarray(results, dtype=np.uint8).tobytes()
+    return kind + np.asarray(results, dtype='<f8').tobytes()
+
+
+@cython.locals(payload=bytes)
+@cython.returns(list)
+def decode_results(payload):
+    # type: (bytes) -> list
+    if payload[:1] == MSG_MEMBER:
+        return [bool(r) for r in np.frombuffer(payload, dtype=np.uint8, offset=1)]
+    return np.frombuffer(payload, dtype='<f8', offset=1).tolist()
+
+
+#############################
+# Framing over file objects
+#############################
+
+@cython.locals(payload=bytes)
+@cython.returns(cython.void)
+def write_message(foutput, payload):
+    # type: (io.BinaryIO, bytes) -> None
+    foutput.write(_HEADER.pack(len(payload)) + payload)
+    foutput.flush()
+
+
+@cython.locals(n=cython.uint, header=bytes, payload=bytes)
+@cython.returns(bytes)
+def read_message(finput):
+    # type: (io.BinaryIO) -> bytes
+    header = finput.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise EOFError('Connection closed')
+    n = _HEADER.unpack(header)[0]
+    payload = finput.read(n)
+    if len(payload) < n:
+        raise EOFError('Connection closed')
+    return payload
+
+
+class _Channel(object):
+    """
+    Connection with a child process.
+    Reads are done with select() in order to honour per-call timeouts.
+    """
+
+    def __init__(self, proc, sock=None, path=None):
+        # type: (_Channel, subprocess.Popen, socket.socket, str) -> None
+        self.proc = proc
+        self.sock = sock
+        self.path = path
+
+    def fileno(self):
+        # type: (_Channel) -> int
+        return self.sock.fileno() if self.sock is not None else self.proc.stdout.fileno()
+
+    def send(self, payload):
+        # type: (_Channel, bytes) -> None
+        data = _HEADER.pack(len(payload)) + payload
+        if self.sock is not None:
+            self.sock.sendall(data)
+        else:
+            self.proc.stdin.write(data)
+            self.proc.stdin.flush()
+
+    def _read_exact(self, n, deadline):
+        # type: (_Channel, int, float) -> bytes
+        buf = b''
+        while len(buf) < n:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0.0:
+                raise TimeoutError('Timeout when waiting for the answer of the child process')
+            ready, _, _ = select.select([self], [], [], remaining)
+            if not ready:
+                raise TimeoutError('Timeout when waiting for the answer of the child process')
+            if self.sock is not None:
+                chunk = self.sock.recv(n - len(buf))
+            else:
+                chunk = os.read(self.fileno(), n - len(buf))
+            if len(chunk) == 0:
+                raise EOFError('Connection closed')
+            buf += chunk
+        return buf
+
+    def recv(self, timeout=None):
+        # type: (_Channel, float) -> bytes
+        deadline = None if timeout is None else time.time() + timeout
+        n = _HEADER.unpack(self._read_exact(_HEADER.size, deadline))[0]
+        return self._read_exact(n, deadline)
+
+    def close(self):
+        # type: (_Channel) -> None
+        try:
+            self.send(MSG_QUIT)
+        except (OSError, ValueError):
+            pass
+        if self.sock is not None:
+            self.sock.close()
+        try:
+            self.proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            if stream is not None:
+                stream.close()
+        if self.path is not None:
+            # The socket lives in its own temporary directory
+            shutil.rmtree(os.path.dirname(self.path), ignore_errors=True)
+
+
+# @cython.cclass
+class OracleProcess(Oracle):
+    cython.declare(cmd=list, num_workers=cython.ushort, transport=str, timeout=object, max_restarts=cython.ushort,
+                   num_restarts=cython.ulong, num_oracle_calls=cython.ulong, _workers=list, _var_names=list)
+
+    @cython.locals(cmd=list, num_workers=cython.ushort, transport=str, max_restarts=cython.ushort)
+    @cython.returns(cython.void)
+    def __init__(self, cmd=None, num_workers=1, transport=TRANSPORT_PIPE, timeout=None, max_restarts=3):
+        # type: (OracleProcess, list, int, str, float, int) -> None
+        """
+        Initialization of OracleProcess.
+
+        Args:
+            cmd (list): Command line of the child process (e.g., REFERENCE_CHILD_CMD + ['oracle.txt']).
+            num_workers (int): Number of long-lived child processes in the pool.
+            transport (str): TRANSPORT_PIPE (stdin/stdout) or TRANSPORT_SOCKET (Unix socket).
+            timeout (float): Maximum time in seconds for answering a call (None for no limit).
+            max_restarts (int): Maximum number of consecutive restarts of a child before giving up a call.
+        """
+        Oracle.__init__(self)
+        assert transport in (TRANSPORT_PIPE, TRANSPORT_SOCKET)
+        assert num_workers > 0
+
+        self.cmd = cmd if cmd is not None else []
+        self.num_workers = num_workers
+        self.transport = transport
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+
+        # Statistics
+        self.num_restarts = 0
+        self.num_oracle_calls = 0
+
+        # Children are started lazily
+        self._workers = [None] * num_workers
+        self._var_names = None
+
+    @cython.returns(str)
+    def __repr__(self):
+        # type: (OracleProcess) -> str
+        """
+        Printer.
+        """
+        return self._to_str()
+
+    @cython.returns(str)
+    def __str__(self):
+        # type: (OracleProcess) -> str
+        """
+        Printer.
+        """
+        return self._to_str()
+
+    @cython.returns(str)
+    def _to_str(self):
+        # type: (OracleProcess) -> str
+        s = 'Command: {0}\n'.format(' '.join(self.cmd))
+        s += 'Workers: {0}\n'.format(self.num_workers)
+        s += 'Transport: {0}\n'.format(self.transport)
+        return s
+
+    @cython.returns(cython.bint)
+    def __eq__(self, other):
+        # type: (OracleProcess, OracleProcess) -> bool
+        """
+        self == other
+        """
+        return isinstance(other, OracleProcess) and self.cmd == other.cmd
+
+    @cython.returns(int)
+    def __hash__(self):
+        # type: (OracleProcess) -> int
+        """
+        Identity function (via hashing).
+        """
+        return hash(tuple(self.cmd))
+
+    @cython.returns(cython.void)
+    def __del__(self):
+        # type: (OracleProcess) -> None
+        """
+        Stops the child processes when the Oracle is garbage collected.
+        """
+        self.close()
+
+    @cython.returns(object)
+    def __copy__(self):
+        # type: (OracleProcess) -> OracleProcess
+        """
+        other = copy.copy(self)
+        """
+        return OracleProcess(cmd=self.cmd, num_workers=self.num_workers, transport=self.transport,
+                             timeout=self.timeout, max_restarts=self.max_restarts)
+
+    @cython.returns(object)
+    def __deepcopy__(self, memo):
+        # type: (OracleProcess, dict) -> OracleProcess
+        """
+        other = copy.deepcopy(self)
+        """
+        # deepcopy function is required for creating multiple instances of the Oracle in ParSearch.
+        # Child processes are not copied: every copy starts its own pool.
+        return OracleProcess(cmd=copy.deepcopy(self.cmd, memo), num_workers=self.num_workers,
+                             transport=self.transport, timeout=self.timeout, max_restarts=self.max_restarts)
+
+    def __getstate__(self):
+        # type: (OracleProcess) -> dict
+        # Child processes cannot be pickled (e.g., when sending the Oracle to a multiprocessing.Pool)
+        state = self.__dict__.copy()
+        state['_workers'] = [None] * self.num_workers
+        return state
+
+    ######################
+    # Pool of children
+    ######################
+
+    @cython.locals(i=cython.ushort, env=dict, proc=object, path=str, server=object, conn=object,
+                   deadline=cython.double)
+    @cython.returns(object)
+    def _start_worker(self, i):
+        # type: (OracleProcess, int) -> _Channel
+        assert len(self.cmd) > 0, 'Command of the child process is not defined'
+
+        # The reference child is run as 'python -m ParetoLib.Oracle.OracleProcess', so it needs ParetoLib
+        # in the PYTHONPATH. Other commands are run with the environment of the parent untouched.
+        env = None
+        if self.cmd[:len(REFERENCE_CHILD_CMD)] == REFERENCE_CHILD_CMD:
+            env = dict(os.environ)
+            root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            env['PYTHONPATH'] = os.pathsep.join(p for p in (root, env.get('PYTHONPATH', '')) if p)
+
+        RootOracle.logger.debug('Starting child {0}: {1}'.format(i, self.cmd))
+        if self.transport == TRANSPORT_SOCKET:
+            path = os.path.join(tempfile.mkdtemp(), 'oracle.sock')
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            server.listen(1)
+            # Wait for the connection in short slices, so that a child that dies early is detected
+            server.settimeout(0.1)
+            deadline = time.time() + (self.timeout if self.timeout is not None else CONNECT_TIMEOUT)
+            proc = subprocess.Popen(self.cmd + ['--socket', path], env=env)
+            conn = None
+            try:
+                while conn is None:
+                    try:
+                        conn, _ = server.accept()
+                    except socket.timeout:
+                        if proc.poll() is not None:
+                            raise EOFError('Child process exited with code {0} before connecting to {1}'
+                                           .format(proc.returncode, path))
+                        if time.time() > deadline:
+                            raise TimeoutError('Child process did not connect to {0}'.format(path))
+            except (EOFError, TimeoutError):
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+                shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+                raise
+            finally:
+                server.close()
+            conn.settimeout(None)
+            self._workers[i] = _Channel(proc, sock=conn, path=path)
+        else:
+            proc = subprocess.Popen(self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0, env=env)
+            self._workers[i] = _Channel(proc)
+        return self._workers[i]
+
+    @cython.locals(i=cython.ushort)
+    @cython.returns(object)
+    def _worker(self, i):
+        # type: (OracleProcess, int) -> _Channel
+        if self._workers[i] is None:
+            self._start_worker(i)
+        elif self._workers[i].proc.poll() is not None:
+            RootOracle.logger.warning('Child {0} exited with code {1}'.format(i, self._workers[i].proc.poll()))
+            self.restart(i)
+        return self._workers[i]
+
+    @cython.locals(i=cython.ushort)
+    @cython.returns(cython.void)
+    def _stop_worker(self, i):
+        # type: (OracleProcess, int) -> None
+        if self._workers[i] is not None:
+            self._workers[i].close()
+            self._workers[i] = None
+
+    @cython.locals(i=cython.ushort)
+    @cython.returns(cython.void)
+    def restart(self, i):
+        # type: (OracleProcess, int) -> None
+        """
+        Restarts the i-th child process of the pool.
+        """
+        RootOracle.logger.warning('Restarting child {0}'.format(i))
+        self.num_restarts += 1
+        self._stop_worker(i)
+        self._start_worker(i)
+
+    @cython.returns(cython.void)
+    def close(self):
+        # type: (OracleProcess) -> None
+        """
+        Stops all the child processes of the pool.
+        """
+        for i in range(len(getattr(self, '_workers', []))):
+            self._stop_worker(i)
+
+    @cython.locals(i=cython.ushort, request=bytes, worker=object, payload=bytes)
+    @cython.returns(bytes)
+    def _call(self, i, request):
+        # type: (OracleProcess, int, bytes) -> bytes
+        worker = self._worker(i)
+        worker.send(request)
+        payload = worker.recv(self.timeout)
+        if payload[:1] == MSG_ERROR:
+            raise RuntimeError('Child {0}: {1}'.format(i, payload[1:].decode('utf-8')))
+        return payload
+
+    @cython.locals(i=cython.ushort, request=bytes, failures=cython.ushort, error=object)
+    @cython.returns(bytes)
+    def _call_with_restart(self, i, request, failures=0, error=None):
+        # type: (OracleProcess, int, bytes, int, Exception) -> bytes
+        # The child is restarted after each failure, up to max_restarts consecutive times.
+        # 'failures' and 'error' describe the failures that happened before this call.
+        while True:
+            if failures > self.max_restarts:
+                # The child may still answer the last request later on, so it is stopped.
+                # The next call will start a fresh one.
+                self._stop_worker(i)
+                raise RuntimeError('Child {0} failed after {1} restarts: {2}'.format(i, self.max_restarts, error))
+            if failures > 0:
+                self.restart(i)
+            try:
+                return self._call(i, request)
+            except (TimeoutError, EOFError, OSError) as e:
+                RootOracle.logger.warning('Child {0} failed: {1}'.format(i, e))
+                failures += 1
+                error = e
+
+    @cython.locals(i=cython.ushort, res=list, alive=cython.bint)
+    @cython.returns(list)
+    def health_check(self):
+        # type: (OracleProcess) -> list
+        """
+        Pings every child process of the pool, and restarts the ones that are dead or unresponsive.
+
+        Returns:
+            list: For each child, True if it answered the ping without being restarted.
+        """
+        res = []
+        for i in range(self.num_workers):
+            alive = self._workers[i] is None or self._workers[i].proc.poll() is None
+            try:
+                alive = alive and self._call(i, MSG_PING) == MSG_PING
+            except (TimeoutError, EOFError, OSError, RuntimeError) as e:
+                RootOracle.logger.warning('Child {0} failed the health check: {1}'.format(i, e))
+                alive = False
+            if not alive:
+                self.restart(i)
+            res.append(alive)
+        return res
+
+    ######################
+    # Oracle interface
+    ######################
+
+    @cython.returns(list)
+    def get_var_names(self):
+        # type: (OracleProcess) -> list
+        """
+        See Oracle.get_var_names().
+        """
+        if self._var_names is None:
+            payload = self._call_with_restart(0, MSG_INFO)
+            self._var_names = json.loads(payload[1:].decode('utf-8'))['var_names']
+        return self._var_names
+
+    @cython.returns(cython.ushort)
+    def dim(self):
+        # type: (OracleProcess) -> int
+        """
+        See Oracle.dim().
+        """
+        return len(self.get_var_names())
+
+    @cython.locals(i=cython.ushort, payload=bytes, n=cython.ulong, res=list)
+    @cython.returns(list)
+    def _decode_reply(self, i, payload, n):
+        # type: (OracleProcess, int, bytes, int) -> list
+        if payload[:1] == MSG_ERROR:
+            raise RuntimeError('Child {0}: {1}'.format(i, payload[1:].decode('utf-8')))
+        res = decode_results(payload)
+        if len(res) != n:
+            # The child does not follow the protocol, so its following answers cannot be trusted either
+            self._stop_worker(i)
+            raise RuntimeError('Child {0} returned {1} results for {2} points'.format(i, len(res), n))
+        return res
+
+    @cython.locals(kind=bytes, points=list, num_points=cython.ulong, num_chunks=cython.ushort, chunk=cython.ulong,
+                   bounds=list, i=cython.ushort, pending=list, res=list, lo=cython.ulong, hi=cython.ulong,
+                   errors=list)
+    @cython.returns(list)
+    def _eval_batch(self, kind, points):
+        # type: (OracleProcess, bytes, list) -> list
+        num_points = len(points)
+        if num_points == 0:
+            return []
+        self.num_oracle_calls += num_points
+
+        # Split the batch among the children. Requests are sent first, so that children work concurrently.
+        num_chunks = min(self.num_workers, num_points)
+        chunk = -(-num_points // num_chunks)
+        bounds = [(lo, min(lo + chunk, num_points)) for lo in range(0, num_points, chunk)]
+
+        pending = []
+        for i, (lo, hi) in enumerate(bounds):
+            try:
+                self._worker(i).send(encode_points(kind, points[lo:hi]))
+                pending.append(True)
+            except OSError:
+                pending.append(False)
+
+        # Every pending answer is read (or its child restarted) before raising any error.
+        # Otherwise, the unread answers would be taken as the answers of the next call.
+        res = []
+        errors = []
+        for i, (lo, hi) in enumerate(bounds):
+            payload = None
+            error = None
+            if pending[i]:
+                try:
+                    payload = self._workers[i].recv(self.timeout)
+                except (TimeoutError, EOFError, OSError) as e:
+                    RootOracle.logger.warning('Child {0} failed: {1}'.format(i, e))
+                    error = e
+            try:
+                if payload is None:
+                    payload = self._call_with_restart(i, encode_points(kind, points[lo:hi]), failures=1, error=error)
+                res.extend(self._decode_reply(i, payload, hi - lo))
+            except RuntimeError as e:
+                errors.append(e)
+        if len(errors) > 0:
+            raise errors[0]
+        return res
+
+    @cython.returns(cython.bint)
+    def is_vectorized(self):
+        # type: (OracleProcess) -> bool
+        """
+        See Oracle.is_vectorized().
+        """
+        return True
+
+    @cython.locals(xpoints=list)
+    @cython.returns(list)
+    def member_batch(self, xpoints):
+        # type: (OracleProcess, list) -> list
+        """
+        Membership of a list of points, evaluated in batches by the pool of children.
+
+        Args:
+            self (OracleProcess): The Oracle.
+            xpoints (list): Points of the space that we inspect.
+
+        Returns:
+            list: For each point, True if it belongs to the upward closure.
+        """
+        return self._eval_batch(MSG_MEMBER, list(xpoints))
+
+    @cython.locals(xpoints=list)
+    @cython.returns(list)
+    def robustness_batch(self, xpoints):
+        # type: (OracleProcess, list) -> list
+        """
+        Robustness of a list of points, evaluated in batches by the pool of children.
+
+        Args:
+            self (OracleProcess): The Oracle.
+            xpoints (list): Points of the space that we inspect.
+
+        Returns:
+            list: For each point, a float that is positive if it belongs to the upward closure.
+        """
+        return self._eval_batch(MSG_ROBUSTNESS, list(xpoints))
+
+    @cython.locals(xpoint=tuple)
+    @cython.returns(cython.bint)
+    def member(self, xpoint):
+        # type: (OracleProcess, tuple) -> bool
+        """
+        See Oracle.member().
+        """
+        return self.member_batch([xpoint])[0]
+
+    @cython.locals(xpoint=tuple)
+    @cython.returns(cython.double)
+    def robustness(self, xpoint):
+        # type: (OracleProcess, tuple) -> float
+        """
+        Robustness of a point (positive if the point belongs to the upward closure).
+        """
+        return self.robustness_batch([xpoint])[0]
+
+    # Read/Write file functions
+    @cython.locals(finput=object, config=dict)
+    @cython.returns(cython.void)
+    def from_file_text(self, finput=None):
+        # type: (OracleProcess, io.BinaryIO) -> None
+        """
+        See Oracle.from_file_text().
+        The file contains the command line of the child process (one argument per line).
+        """
+        assert (finput is not None), 'File object should not be null'
+
+        self.close()
+        self.__init__(cmd=[line.strip(' \n\t') for line in finput if line.strip(' \n\t') != ''],
+                      num_workers=self.num_workers, transport=self.transport, timeout=self.timeout,
+                      max_restarts=self.max_restarts)
+
+    @cython.locals(foutput=object, arg=str)
+    @cython.returns(cython.void)
+    def to_file_text(self, foutput=None):
+        # type: (OracleProcess, io.BinaryIO) -> None
+        """
+        See Oracle.to_file_text().
+        """
+        assert (foutput is not None), 'File object should not be null'
+
+        for arg in self.cmd:
+            foutput.write(arg + '\n')
+
+
+###########################
+# Reference child process
+###########################
+
+@cython.locals(payload=bytes, points=object)
+@cython.returns(bytes)
+def _answer(oracle, payload, robustness):
+    # type: (Oracle, bytes, callable) -> bytes
+    kind = payload[:1]
+    if kind == MSG_PING:
+        return MSG_PING
+    elif kind == MSG_INFO:
+        return MSG_INFO + json.dumps({'var_names': oracle.get_var_names()[:oracle.dim()]}).encode('utf-8')
+    elif kind == MSG_MEMBER:
+        points = decode_points(payload)
+        return encode_results(MSG_MEMBER, [oracle.member(tuple(p)) for p in points])
+    elif kind == MSG_ROBUSTNESS and robustness is not None:
+        points = decode_points(payload)
+        return encode_results(MSG_ROBUSTNESS, [robustness(tuple(p)) for p in points])
+    return MSG_ERROR + 'Unsupported request {0}'.format(kind).encode('utf-8')
+
+
+@cython.returns(cython.void)
+def serve(oracle, finput, foutput, robustness=None, delay=0.0):
+    # type: (Oracle, io.BinaryIO, io.BinaryIO, callable, float) -> None
+    """
+    Main loop of a Python child process: answers the requests of an OracleProcess
+    by querying a local Oracle.
+
+    Args:
+        oracle (Oracle): The Oracle answering the membership queries.
+        finput (io.BinaryIO): Stream with the requests.
+        foutput (io.BinaryIO): Stream for the responses.
+        robustness (callable): Function returning the robustness of a point (optional).
+        delay (float): Artificial latency in seconds per request (for testing timeouts).
+    """
+    while True:
+        try:
+            payload = read_message(finput)
+        except EOFError:
+            break
+        if payload[:1] == MSG_QUIT:
+            break
+        if delay > 0.0:
+            time.sleep(delay)
+        try:
+            write_message(foutput, _answer(oracle, payload, robustness))
+        except Exception as e:
+            write_message(foutput, MSG_ERROR + str(e).encode('utf-8'))
+
+
+@cython.locals(cond=object, point=tuple, di=dict, val=cython.double, res=cython.double)
+@cython.returns(cython.double)
+def _robustness_function(oracle, point):
+    # type: (OracleFunction, tuple) -> float
+    # Robustness of an OracleFunction: minimum signed distance of the point to every condition
+    di = {key: point[i] for i, key in enumerate(oracle.variables)}
+    res = float('inf')
+    for cond in oracle.oracle:
+        val = float(cond.get_expression().subs(di))
+        if cond.op in ('<', '<='):
+            val = -val
+        elif cond.op in ('==', '<>'):
+            val = -abs(val)
+        res = min(res, val)
+    return res
+
+
+def main(argv):
+    # type: (list) -> int
+    from ParetoLib.Oracle.OracleFunction import OracleFunction
+
+    parser = argparse.ArgumentParser(description='Reference child process for OracleProcess')
+    parser.add_argument('oracle_file', help='OracleFunction in text format')
+    parser.add_argument('--socket', default=None, help='Unix socket where the parent is listening')
+    parser.add_argument('--delay', type=float, default=0.0, help='Artificial latency per request (seconds)')
+    args = parser.parse_args(argv)
+
+    oracle = OracleFunction()
+    oracle.from_file(args.oracle_file, human_readable=True)
+
+    def robustness(point):
+        return _robustness_function(oracle, point)
+
+    if args.socket is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(args.socket)
+        stream = sock.makefile('rwb')
+        serve(oracle, stream, stream, robustness, args.delay)
+        stream.close()
+        sock.close()
+    else:
+        serve(oracle, sys.stdin.buffer, sys.stdout.buffer, robustness, args.delay)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -19,23 +19,43 @@ import io
 import sys
 import os
 import filecmp
+import json
+import time
+import select
 import cython
 
 import ParetoLib.Oracle as RootOracle
 from ParetoLib.Oracle.Oracle import Oracle
 from ParetoLib.JAMT.JAMT import JAVA_BIN, JAVA_OPT_JAR, JAMT_BIN, JAMT_OPT_ALIAS, JAMT_OPT_STL, JAMT_OPT_RES, \
-    JAMT_OPT_SIGNAL
+    JAMT_OPT_SIGNAL, JAMT_WORKER_OK, JAMT_WORKER_BATCH, JAMT_WORKER_QUIT, JAMT_WORKER_TIMEOUT
 
 
 # @cython.cclass
 class OracleSTL(Oracle):
     cython.declare(stl_prop_file=str, vcd_signal_file=str, var_alias_file=str, stl_param_file=str, _stl_formula=str, _stl_parameters=list,
-                   pattern=object, num_oracle_calls=cython.ulong, initialized=cython.bint)
+                   pattern=object, num_oracle_calls=cython.ulong, initialized=cython.bint, worker_cmd=list,
+                   worker_timeout=cython.double, _jamt_worker=object, _jamt_buffer=bytes)
 
-    @cython.locals(stl_prop_file=str, vcd_signal_file=str, var_alias_file=str, stl_param_file=str)
+    @cython.locals(stl_prop_file=str, vcd_signal_file=str, var_alias_file=str, stl_param_file=str, worker_cmd=list,
+                   worker_timeout=cython.double)
     @cython.returns(cython.void)
-    def __init__(self, stl_prop_file='', vcd_signal_file='', var_alias_file='', stl_param_file=''):
-        # type: (OracleSTL, str, str, str, str) -> None
+    def __init__(self, stl_prop_file='', vcd_signal_file='', var_alias_file='', stl_param_file='', worker_cmd=None,
+                 worker_timeout=JAMT_WORKER_TIMEOUT):
+        # type: (OracleSTL, str, str, str, str, list, float) -> None
+        """
+        Initialization of OracleSTL.
+        By default, OracleSTL launches a new JAMT process per membership query.
+
+        Worker mode is experimental. If worker_cmd is provided, OracleSTL starts a persistent
+        process once and sends it batches of formulas via PIPEs (see ParetoLib/JAMT/JAMTWorker.py
+        for the protocol). JAMT has no such mode, so the only worker shipped with ParetoLib is
+        JAMT_WORKER_STUB, a test stand-in that does not read the signal. The worker is killed
+        if it does not answer within worker_timeout seconds.
+        """
+        # Set before anything else can fail, since __del__ relies on it
+        self._jamt_worker = None
+        self._jamt_buffer = b''
+
         Oracle.__init__(self)
 
         # Load STLe formula
@@ -56,6 +76,10 @@ class OracleSTL(Oracle):
         # Flag for indicating that Oracle is not initialized yet
         self.initialized = False
 
+        # Command line of the persistent JAMT worker (None for running one JAMT process per query)
+        self.worker_cmd = worker_cmd
+        self.worker_timeout = worker_timeout
+
     @property
     def stl_formula(self):
         # type: (OracleSTL) -> str
@@ -112,6 +136,91 @@ class OracleSTL(Oracle):
 
     # _stl_parameters = property(getname, setname, delname)
 
+    @property
+    def jamt_worker(self):
+        # type: (OracleSTL) -> subprocess.Popen
+        """
+        Getter of jamt_worker class attribute.
+        """
+        if self._jamt_worker is None and self.worker_cmd is not None:
+            self._load_jamt_worker()
+
+        return self._jamt_worker
+
+    @cython.locals(args=list, ok=str, message=str)
+    @cython.returns(cython.void)
+    def _load_jamt_worker(self):
+        # type: (OracleSTL) -> None
+        assert self.vcd_signal_file != ''
+        assert self.var_alias_file != ''
+
+        # Start the worker once and reuse it in the following queries.
+        args = self.worker_cmd + [JAMT_OPT_SIGNAL, self.vcd_signal_file, JAMT_OPT_ALIAS, self.var_alias_file]
+        RootOracle.logger.debug('Starting: {0}'.format(args))
+        self._jamt_worker = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+        self._jamt_buffer = b''
+
+        ok = self._read_worker_lines(1)[0]
+        RootOracle.logger.debug('ok: {0}'.format(ok))
+        if ok != JAMT_WORKER_OK:
+            message = 'Unexpected error when loading {0}: {1}'.format(self.vcd_signal_file, ok)
+            RootOracle.logger.error(message)
+            self.close()
+            raise RuntimeError(message)
+
+    @cython.locals(n=cython.ulong, deadline=cython.double, remaining=cython.double, lines=list, fd=int,
+                   ready=list, chunk=bytes, message=str)
+    @cython.returns(list)
+    def _read_worker_lines(self, n):
+        # type: (OracleSTL, int) -> list
+        # Reads n lines from the worker, waiting at most worker_timeout seconds.
+        # The worker is stopped if it dies or hangs, so that the next query starts a new one.
+        deadline = time.time() + self.worker_timeout
+        fd = self._jamt_worker.stdout.fileno()
+        while self._jamt_buffer.count(b'\n') < n:
+            remaining = deadline - time.time()
+            ready = select.select([fd], [], [], max(remaining, 0.0))[0] if remaining > 0.0 else []
+            chunk = os.read(fd, 65536) if len(ready) > 0 else b''
+            if len(chunk) == 0:
+                if len(ready) > 0:
+                    message = 'JAMT worker terminated unexpectedly (exit code {0})'.format(self._jamt_worker.poll())
+                else:
+                    message = 'JAMT worker did not answer in {0} seconds'.format(self.worker_timeout)
+                RootOracle.logger.error(message)
+                self.close()
+                raise RuntimeError(message)
+            self._jamt_buffer += chunk
+
+        lines = self._jamt_buffer.split(b'\n')
+        self._jamt_buffer = b'\n'.join(lines[n:])
+        return [line.decode('utf-8').strip(' \r\t') for line in lines[:n]]
+
+    @cython.returns(cython.void)
+    def close(self):
+        # type: (OracleSTL) -> None
+        """
+        Stops the persistent JAMT worker, if any.
+        """
+        if getattr(self, '_jamt_worker', None) is not None:
+            try:
+                self._jamt_worker.stdin.write((JAMT_WORKER_QUIT + '\n').encode('utf-8'))
+                self._jamt_worker.stdin.close()
+                self._jamt_worker.wait(timeout=1.0)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                self._jamt_worker.kill()
+                self._jamt_worker.wait()
+            self._jamt_worker.stdout.close()
+            self._jamt_worker = None
+            self._jamt_buffer = b''
+
+    @cython.returns(cython.void)
+    def __del__(self):
+        # type: (OracleSTL) -> None
+        """
+        Stops the persistent JAMT worker when the Oracle is garbage collected.
+        """
+        self.close()
+
     @cython.returns(cython.void)
     def _lazy_init(self):
         # type: (OracleSTL) -> None
@@ -197,7 +306,9 @@ class OracleSTL(Oracle):
         """
         other = copy.copy(self)
         """
-        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file, var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file)
+        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file,
+                         var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file,
+                         worker_cmd=self.worker_cmd, worker_timeout=self.worker_timeout)
 
     # @cython.locals(memo=dict)
     @cython.returns(object)
@@ -208,7 +319,9 @@ class OracleSTL(Oracle):
         """
         # deepcopy function is required for creating multiple instances of the Oracle in ParSearch.
         # deepcopy cannot handle neither regex nor Popen processes
-        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file, var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file)
+        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file,
+                         var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file,
+                         worker_cmd=self.worker_cmd, worker_timeout=self.worker_timeout)
 
     @cython.returns(cython.ushort)
     def dim(self):
@@ -272,9 +385,9 @@ class OracleSTL(Oracle):
         math_regex = r'(\b{0}\b({1}\b{2}\b)*)'.format(number, op, number)
         return re.compile(math_regex)
 
-    @cython.locals(xpoint=tuple, stl_prop_file_subst_name=str, val_formula=str, i=cython.ushort, par=str)
+    @cython.locals(xpoint=tuple, val_formula=str, i=cython.ushort, par=str)
     @cython.returns(str)
-    def _replace_par_val_stl_formula(self, xpoint):
+    def _replace_val_stl_formula(self, xpoint):
         # type: (OracleSTL, tuple) -> str
 
         # Replaces the parameters of the STL formula by the numerical values in tuple xpoint.
@@ -298,16 +411,28 @@ class OracleSTL(Oracle):
                 return res
 
         RootOracle.logger.debug('Evaluating STL formula')
-        # Create a temporal file with an instance of the STL formula
-        stl_prop_file_subst = tempfile.NamedTemporaryFile(mode='w', delete=False)
-        stl_prop_file_subst_name = stl_prop_file_subst.name
-
         # Substitute the parameters in the parametric STL formula by numbers
         val_formula = self.stl_formula
         for i, par in enumerate(self.stl_parameters):
             val_formula = re.sub(r'\b{0}\b'.format(par), str(xpoint[i]), val_formula)
         val_formula = self.pattern.sub(eval_expr, val_formula)
 
+        return val_formula
+
+    @cython.locals(xpoint=tuple, stl_prop_file_subst_name=str, val_formula=str)
+    @cython.returns(str)
+    def _replace_par_val_stl_formula(self, xpoint):
+        # type: (OracleSTL, tuple) -> str
+
+        # Writes the instance of the STL formula for xpoint in a temporal file.
+        #
+        # Returns the name of the temporal file.
+        val_formula = self._replace_val_stl_formula(xpoint)
+
+        # Create a temporal file with an instance of the STL formula
+        stl_prop_file_subst = tempfile.NamedTemporaryFile(mode='w', delete=False)
+        stl_prop_file_subst_name = stl_prop_file_subst.name
+
         stl_prop_file_subst.write(val_formula)
         stl_prop_file_subst.close()
 
@@ -420,6 +545,91 @@ class OracleSTL(Oracle):
 
         return _eval, delete
 
+    @cython.locals(stl_formulas=list, request=str, verdicts=list, tp_result=dict, verdict=str, res=list)
+    @cython.returns(list)
+    def eval_stl_formula_batch(self, stl_formulas):
+        # type: (OracleSTL, list) -> list
+        """
+        Evaluates a batch of instances of a parametrized STL formula in the persistent worker.
+        Raises RuntimeError if the worker dies or does not answer within worker_timeout seconds.
+
+        Args:
+            self (OracleSTL): The Oracle.
+            stl_formulas (list): Instances of the parametrized STL formula that will be evaluated.
+        Returns:
+            list: For each formula, True if it is satisfied.
+
+        Example:
+        >>> ora = OracleSTL(..., worker_cmd=JAMT_WORKER_STUB)
+        >>> ora.eval_stl_formula_batch([stl_formula_1, stl_formula_2])
+        >>> [False, True]
+        """
+        assert self.jamt_worker is not None
+        assert not self.jamt_worker.stdin.closed
+
+        # Same verdicts than the CSV result file of JAMT (see _parse_amt_result)
+        tp_result = {'violated': False, 'satisfied': True, 'unknown': None}
+
+        # batch n
+        # "formula_1"
+        # ...
+        # "formula_n"
+        request = '{0} {1}\n'.format(JAMT_WORKER_BATCH, len(stl_formulas))
+        request += ''.join(json.dumps(stl_formula) + '\n' for stl_formula in stl_formulas)
+        RootOracle.logger.debug('Running: {0}'.format(request))
+        try:
+            self.jamt_worker.stdin.write(request.encode('utf-8'))
+        except OSError as e:
+            message = 'JAMT worker terminated unexpectedly: {0}'.format(e)
+            RootOracle.logger.error(message)
+            self.close()
+            raise RuntimeError(message)
+
+        verdicts = self._read_worker_lines(len(stl_formulas))
+        RootOracle.logger.debug('result: {0}'.format(verdicts))
+
+        res = []
+        for stl_formula, verdict in zip(stl_formulas, verdicts):
+            if verdict not in tp_result:
+                message = 'Unexpected answer of the JAMT worker: {0}'.format(verdict)
+                RootOracle.logger.error(message)
+                raise RuntimeError(message)
+            elif tp_result[verdict] is None:
+                RootOracle.logger.warning('Evaluation of formula {0} returns "unkown".'.format(stl_formula))
+            res.append(tp_result[verdict] is True)
+        return res
+
+    @cython.returns(cython.bint)
+    def is_vectorized(self):
+        # type: (OracleSTL) -> bool
+        """
+        See Oracle.is_vectorized().
+        Only the worker mode evaluates a batch in a single round trip.
+        """
+        return self.worker_cmd is not None
+
+    @cython.locals(xpoints=list, xpoint=tuple, val_stl_formulas=list)
+    @cython.returns(list)
+    def member_batch(self, xpoints):
+        # type: (OracleSTL, list) -> list
+        """
+        Membership of a list of points.
+        In worker mode, the whole list is evaluated in a single round trip to the JAMT worker.
+
+        Args:
+            self (OracleSTL): The Oracle.
+            xpoints (list): Points of the space that we inspect.
+
+        Returns:
+            list: For each point, True if it belongs to the upward closure.
+        """
+        if self.worker_cmd is None:
+            return [self.member(xpoint) for xpoint in xpoints]
+
+        assert self.stl_parameters != []
+        val_stl_formulas = [self._replace_val_stl_formula(tuple(xpoint)) for xpoint in xpoints]
+        return self.eval_stl_formula_batch(val_stl_formulas)
+
     @cython.locals(xpoint=tuple, val_stl_formula=str, res=cython.bint, delete=cython.bint)
     @cython.returns(cython.bint)
     def member(self, xpoint):
@@ -432,6 +642,9 @@ class OracleSTL(Oracle):
         assert self.var_alias_file != ''
         assert self.stl_parameters != []
 
+        if self.worker_cmd is not None:
+            return self.member_batch([xpoint])[0]
+
         # Invoke example of the monitoring tool (AMT).
         # AMT evaluates a STL formula (.stl) over a signal (.vcd) following a variable aliasing (.alias)
         # and exports the result to an output file (out).
@@ -490,8 +703,10 @@ class OracleSTL(Oracle):
                 if not os.path.isfile(fname):
                     RootOracle.logger.info('File {0} does not exists or it is not a file'.format(fname))
 
+            self.close()
             self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, var_alias_file=var_alias_file,
-                          vcd_signal_file=vcd_signal_file)
+                          vcd_signal_file=vcd_signal_file, worker_cmd=self.worker_cmd,
+                          worker_timeout=self.worker_timeout)
 
         except EOFError:
             RootOracle.logger.error('Unexpected error when loading {0}: {1}'.format(finput, sys.exc_info()[0]))
@@ -536,8 +751,10 @@ class OracleSTL(Oracle):
                 if not os.path.isfile(fname):
                     RootOracle.logger.info('File {0} does not exists or it is not a file'.format(fname))
 
+            self.close()
             self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, var_alias_file=var_alias_file,
-                          vcd_signal_file=vcd_signal_file)
+                          vcd_signal_file=vcd_signal_file, worker_cmd=self.worker_cmd,
+                          worker_timeout=self.worker_timeout)
 
         except EOFError:
             RootOracle.logger.error('Unexpected error when loading {0}: {1}'.format(finput, sys.exc_info()[0]))
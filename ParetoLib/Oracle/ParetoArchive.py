@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""ParetoArchive.
+
+This module implements Pareto archives that are specialised for the
+dimension of the points. They offer the same interface as the NDTree,
+which remains the archive for the general d-dimensional case.
+
+In 2D, the non-dominated points form a staircase: sorted by the first
+coordinate, the second coordinate is strictly decreasing. The staircase
+is kept in a SortedList, so insertions and dominance queries take
+O(log n) time by bisection.
+
+In 3D, the points are kept sorted by the first coordinate. Batches of
+queries and bulk loads are solved by the sweep of Kung, Luccio and
+Preparata [1]: the points are visited in increasing order of the first
+coordinate while a 2D staircase stores the projections of the points
+visited so far onto the other two coordinates.
+
+[1] H. T. Kung, F. Luccio and F. P. Preparata.
+On finding the maxima of a set of vectors.
+Journal of the ACM, 22(4), 1975.
+"""
+
+import numpy as np
+import cython
+from sortedcontainers import SortedList
+
+from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Geometry.Indicators import as_front, nondominated
+from ParetoLib.Oracle.NDTree import NDTree
+# import ParetoLib.Oracle as RootOracle
+import ParetoLib.Oracle
+
+RootOracle = ParetoLib.Oracle
+
+
+@cython.locals(d=cython.ushort, max_points=cython.ulong, min_children=cython.ushort)
+@cython.returns(object)
+def pareto_archive(d, max_points=2, min_children=2):
+    # type: (int, int, int) -> NDTree
+    """
+    Pareto archive for points of dimension d.
+
+    Args:
+        d (int): Dimension of the points.
+        max_points (int): See NDTree.
+        min_children (int): See NDTree.
+
+    Returns:
+        NDTree: An Archive2D if d == 2, an Archive3D if d == 3, and a
+        NDTree otherwise.
+
+    Example:
+    >>> nd = pareto_archive(2)
+    >>> type(nd)
+    >>> <class 'ParetoLib.Oracle.ParetoArchive.Archive2D'>
+    """
+    if d == 2:
+        return Archive2D(max_points=max_points, min_children=min_children)
+    elif d == 3:
+        return Archive3D(max_points=max_points, min_children=min_children)
+    return NDTree(max_points=max_points, min_children=min_children)
+
+
+class Archive2D(NDTree):
+    cython.declare(_front=object, _array=object)
+
+    @cython.locals(max_points=cython.ulong, min_children=cython.ushort)
+    @cython.returns(cython.void)
+    def __init__(self, max_points=2, min_children=2):
+        # type: (Archive2D, int, int) -> None
+        """
+        An Archive2D is a staircase of points sorted by the first
+        coordinate. The parameters max_points and min_children have
+        no effect on the staircase, but they are kept for
+        compatibility with the NDTree (e.g., equality and files).
+        """
+        self.max_points = max_points
+        self.min_children = min_children
+        self._front = SortedList()
+        # Cache of the staircase as an array of shape (n, 2), for vectorized queries
+        self._array = None
+
+    @cython.returns(dict)
+    def __getstate__(self):
+        # type: (Archive2D) -> dict
+        """
+        State of the Archive2D for pickling.
+        """
+        return {'max_points': self.max_points, 'min_children': self.min_children, 'points': list(self._front)}
+
+    @cython.locals(state=dict)
+    @cython.returns(cython.void)
+    def __setstate__(self, state):
+        # type: (Archive2D, dict) -> None
+        """
+        Restoring the Archive2D from the state returned by __getstate__.
+        """
+        self.max_points = state['max_points']
+        self.min_children = state['min_children']
+        self._front = SortedList(state['points'])
+        self._array = None
+
+    @cython.returns(str)
+    def _to_str(self):
+        # type: (Archive2D) -> str
+        """
+        Printer.
+        """
+        return str(list(self._front))
+
+    @cython.returns(cython.void)
+    def _report(self):
+        """
+        Report function
+        """
+        RootOracle.logger.info('\tPoints {0}'.format(list(self._front)))
+
+    @cython.ccall
+    @cython.returns(cython.ushort)
+    def dim(self):
+        # type: (Archive2D) -> int
+        """
+        See NDTree.dim().
+        """
+        return 2 if not self.is_empty() else 0
+
+    @cython.ccall
+    @cython.returns(cython.bint)
+    def is_empty(self):
+        # type: (Archive2D) -> bool
+        """
+        See NDTree.is_empty().
+        """
+        return len(self._front) == 0
+
+    @cython.ccall
+    @cython.returns(object)
+    def get_rectangle(self):
+        # type: (Archive2D) -> Rectangle
+        """
+        See NDTree.get_rectangle().
+        The corners are given by the extremes of the staircase.
+        """
+        if self.is_empty():
+            return Rectangle()
+        return Rectangle((self._front[0][0], self._front[-1][1]), (self._front[-1][0], self._front[0][1]))
+
+    @cython.ccall
+    @cython.returns(object)
+    def point_array(self):
+        # type: (Archive2D) -> np.ndarray
+        """
+        See NDTree.point_array().
+        Points are sorted by the first coordinate.
+        """
+        if self.is_empty():
+            return np.empty((0, 0))
+        if self._array is None:
+            self._array = np.array(list(self._front), dtype=float)
+        return self._array.copy()
+
+    @cython.ccall
+    @cython.locals(p=tuple, x=tuple)
+    @cython.returns(cython.void)
+    def update_point(self, p):
+        # type: (Archive2D, tuple) -> None
+        """
+        See NDTree.update_point().
+        """
+        x = tuple(np.asarray(p, dtype=float).tolist())
+        if not self.dominates(x):
+            self._insert(x)
+
+    @cython.ccall
+    @cython.locals(p=tuple, i=cython.long)
+    @cython.returns(cython.bint)
+    def dominates(self, p):
+        # type: (Archive2D, tuple) -> bool
+        """
+        See NDTree.dominates().
+        Only the last point of the staircase whose first coordinate is
+        not greater than p[0] can dominate p, since it has the lowest
+        second coordinate among them.
+        """
+        i = self._front.bisect_right((p[0], float('inf'))) - 1
+        return i >= 0 and self._front[i][1] <= p[1]
+
+    @cython.ccall
+    @cython.locals(points=object)
+    @cython.returns(cython.void)
+    def update_points(self, points):
+        # type: (Archive2D, iter) -> None
+        """
+        See NDTree.update_points().
+        """
+        points = as_front(points, 2)
+        if len(points) == 0:
+            return
+        if not self.is_empty():
+            points = np.concatenate((self.point_array(), points))
+        self._front = SortedList(map(tuple, nondominated(points).tolist()))
+        self._array = None
+
+    @cython.locals(x=tuple, i=cython.ulong, j=cython.ulong)
+    @cython.returns(cython.void)
+    def _insert(self, x):
+        # type: (Archive2D, tuple) -> None
+        # Adds a point that is not dominated by the staircase. The points dominated by x are
+        # the ones that follow x in the staircase and have a greater or equal second coordinate
+        i = self._front.bisect_left(x)
+        j = i
+        while j < len(self._front) and self._front[j][1] >= x[1]:
+            j = j + 1
+        del self._front[i:j]
+        self._front.add(x)
+        self._array = None
+
+    @cython.locals(points=object, dominated=cython.bint, front=object, i=object)
+    @cython.returns(object)
+    def _query_batch(self, points, dominated):
+        # type: (Archive2D, iter, bool) -> np.ndarray
+        # Bisection of the whole batch in the staircase
+        points = as_front(points, 2)
+        if self.is_empty() or len(points) == 0:
+            return np.zeros(len(points), dtype=bool)
+        front = self.point_array()
+        if dominated:
+            # The first point of the staircase that is not lower than points[k] in the first coordinate
+            # has the greatest second coordinate among them
+            i = np.searchsorted(front[:, 0], points[:, 0], side='left')
+            return (i < len(front)) & (front[np.minimum(i, len(front) - 1), 1] >= points[:, 1])
+        i = np.searchsorted(front[:, 0], points[:, 0], side='right') - 1
+        return (i >= 0) & (front[np.maximum(i, 0), 1] <= points[:, 1])
+
+
+@cython.locals(front=object, queries=object, order=object, limits=object, res=object, staircase=object,
+               projections=list, i=cython.ulong, k=cython.ulong, j=cython.ulong, q=tuple)
+@cython.returns(object)
+def _sweep_dominates(front, queries):
+    # type: (np.ndarray, np.ndarray) -> np.ndarray
+    # res[i] is True if some point of the 3D front, sorted by the first coordinate, dominates queries[i]
+    order = np.argsort(queries[:, 0], kind='stable')
+    # Number of points of the front whose first coordinate is not greater than the one of every query
+    limits = np.searchsorted(front[:, 0], queries[order, 0], side='right')
+    res = np.zeros(len(queries), dtype=bool)
+    staircase = Archive2D()
+    projections = list(map(tuple, front[:, 1:].tolist()))
+    j = 0
+    for i, k, q in zip(order.tolist(), limits.tolist(), map(tuple, queries[order, 1:].tolist())):
+        while j < k:
+            if not staircase.dominates(projections[j]):
+                staircase._insert(projections[j])
+            j = j + 1
+        res[i] = staircase.dominates(q)
+    return res
+
+
+@cython.locals(front=object, keep=object, staircase=object, i=cython.ulong, q=tuple)
+@cython.returns(object)
+def _sweep_skyline(front):
+    # type: (np.ndarray) -> np.ndarray
+    # keep[i] is True if front[i] is non-dominated. The 3D front is sorted lexicographically and has no
+    # repetitions, so a point can only be dominated by a previous one
+    keep = np.zeros(len(front), dtype=bool)
+    staircase = Archive2D()
+    for i, q in enumerate(map(tuple, front[:, 1:].tolist())):
+        if not staircase.dominates(q):
+            keep[i] = True
+            staircase._insert(q)
+    return keep
+
+
+class Archive3D(NDTree):
+    cython.declare(_columns=object)
+
+    @cython.locals(max_points=cython.ulong, min_children=cython.ushort)
+    @cython.returns(cython.void)
+    def __init__(self, max_points=2, min_children=2):
+        # type: (Archive3D, int, int) -> None
+        """
+        An Archive3D stores the points sorted by the first coordinate
+        in an array of shape (3, n), i.e., one row per coordinate, so
+        that every coordinate is compared with contiguous memory.
+        The parameters max_points and min_children have no effect on
+        the array, but they are kept for compatibility with the NDTree
+        (e.g., equality and files).
+        """
+        self.max_points = max_points
+        self.min_children = min_children
+        self._columns = np.empty((3, 0))
+
+    @cython.returns(dict)
+    def __getstate__(self):
+        # type: (Archive3D) -> dict
+        """
+        State of the Archive3D for pickling.
+        """
+        return {'max_points': self.max_points, 'min_children': self.min_children, 'columns': self._columns}
+
+    @cython.locals(state=dict)
+    @cython.returns(cython.void)
+    def __setstate__(self, state):
+        # type: (Archive3D, dict) -> None
+        """
+        Restoring the Archive3D from the state returned by __getstate__.
+        """
+        self.max_points = state['max_points']
+        self.min_children = state['min_children']
+        self._columns = state['columns']
+
+    @cython.returns(str)
+    def _to_str(self):
+        # type: (Archive3D) -> str
+        """
+        Printer.
+        """
+        return str(list(map(tuple, self._columns.T.tolist())))
+
+    @cython.returns(cython.void)
+    def _report(self):
+        """
+        Report function
+        """
+        RootOracle.logger.info('\tPoints {0}'.format(self._to_str()))
+
+    @cython.ccall
+    @cython.returns(cython.ushort)
+    def dim(self):
+        # type: (Archive3D) -> int
+        """
+        See NDTree.dim().
+        """
+        return 3 if not self.is_empty() else 0
+
+    @cython.ccall
+    @cython.returns(cython.bint)
+    def is_empty(self):
+        # type: (Archive3D) -> bool
+        """
+        See NDTree.is_empty().
+        """
+        return self._columns.shape[1] == 0
+
+    @cython.ccall
+    @cython.returns(object)
+    def get_rectangle(self):
+        # type: (Archive3D) -> Rectangle
+        """
+        See NDTree.get_rectangle().
+        """
+        if self.is_empty():
+            return Rectangle()
+        return Rectangle(tuple(self._columns.min(axis=1).tolist()), tuple(self._columns.max(axis=1).tolist()))
+
+    @cython.ccall
+    @cython.returns(object)
+    def point_array(self):
+        # type: (Archive3D) -> np.ndarray
+        """
+        See NDTree.point_array().
+        Points are sorted by the first coordinate.
+        """
+        if self.is_empty():
+            return np.empty((0, 0))
+        return self._columns.T.copy()
+
+    @cython.ccall
+    @cython.locals(p=tuple, x=object, i=cython.ulong, keep=object)
+    @cython.returns(cython.void)
+    def update_point(self, p):
+        # type: (Archive3D, tuple) -> None
+        """
+        See NDTree.update_point().
+        """
+        x = np.asarray(p, dtype=float)
+        if self.dominates(p):
+            return
+        # Only the points that follow x in the first coordinate can be dominated by x
+        i = np.searchsorted(self._columns[0], x[0], side='left')
+        keep = (self._columns[1, i:] < x[1]) | (self._columns[2, i:] < x[2])
+        self._columns = np.concatenate((self._columns[:, :i], x[:, None], self._columns[:, i:][:, keep]), axis=1)
+
+    @cython.ccall
+    @cython.locals(p=tuple, i=cython.ulong)
+    @cython.returns(cython.bint)
+    def dominates(self, p):
+        # type: (Archive3D, tuple) -> bool
+        """
+        See NDTree.dominates().
+        Only the points that precede p in the first coordinate can
+        dominate p, and they are compared at once.
+        """
+        i = np.searchsorted(self._columns[0], p[0], side='right')
+        return bool(((self._columns[1, :i] <= p[1]) & (self._columns[2, :i] <= p[2])).any())
+
+    @cython.ccall
+    @cython.locals(points=object, keep=object)
+    @cython.returns(cython.void)
+    def update_points(self, points):
+        # type: (Archive3D, iter) -> None
+        """
+        See NDTree.update_points().
+        The skyline is computed by a sweep over the first coordinate.
+        """
+        points = as_front(points, 3)
+        if len(points) == 0:
+            return
+        points = np.concatenate((self._columns.T, points))
+        # Sorted lexicographically and without repetitions, a point can only be dominated by a previous one
+        points = points[np.lexsort(points.T[::-1])]
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+        points = points[keep]
+        self._columns = np.ascontiguousarray(points[_sweep_skyline(points)].T)
+
+    @cython.locals(points=object, dominated=cython.bint)
+    @cython.returns(object)
+    def _query_batch(self, points, dominated):
+        # type: (Archive3D, iter, bool) -> np.ndarray
+        points = as_front(points, 3)
+        if self.is_empty() or len(points) == 0:
+            return np.zeros(len(points), dtype=bool)
+        if dominated:
+            # points[i] dominates some point p of the archive iff -p dominates -points[i]
+            return _sweep_dominates(-self._columns.T[::-1], -points)
+        return _sweep_dominates(self._columns.T, points)
@@ -20,12 +20,20 @@ upper part.
 fast algorithm for the dynamic non-dominance problem. IEEE Trans-
 actions on Evolutionary Computation, 2018.
 """
+import time
+import math
 import cython
+import numpy as np
+from scipy.stats import qmc
 
 from ParetoLib.Geometry.Point import add, subtract, less_equal, div
 from ParetoLib.Geometry.Segment import Segment
+from ParetoLib.Geometry.Rectangle import Rectangle
 import copy
 from ParetoLib._py3k import max_integer_value
+import ParetoLib.Search
+
+RootSearch = ParetoLib.Search
 
 # EPS = sys.float_info.epsilon
 # DELTA = sys.float_info.epsilon
@@ -39,16 +47,527 @@ P0 = 0.01
 ALPHA = 0.05
 NUMCELLS = 100
 
-@cython.locals(x=object, error=tuple, i=cython.ushort, y=object, yval=tuple, dist=cython.double)
+# Number of chunks of cells in BMNN22. Every chunk draws its samples from an independent random stream, so the
+# results for a given seed do not depend on the number of processes
+CELL_CHUNKS = 64
+# Minimum number of samples per task when ParSearch evaluates a whole level of cells of BMNN22 opt_1 in batches
+BATCH_SAMPLES = 64
+
+
+@cython.locals(cells=list, num_chunks=cython.ulong, size=cython.ulong, i=cython.ulong)
+@cython.returns(list)
+def cell_chunks(cells, num_chunks=CELL_CHUNKS):
+    # type: (list, int) -> list
+    # Splits a list of cells in at most num_chunks lists of consecutive cells
+    size = max(1, -(-len(cells) // num_chunks))
+    return [cells[i:i + size] for i in range(0, len(cells), size)]
+
+
+@cython.locals(seed=object, seed_seq=object)
+@cython.returns(object)
+def seed_sequence(seed=None):
+    # type: (int) -> np.random.SeedSequence
+    # Root of the random streams of a BMNN22 search. Its entropy is logged so that a run without seed can be repeated
+    seed_seq = np.random.SeedSequence(seed)
+    RootSearch.logger.info('Seed: {0}'.format(seed_seq.entropy))
+    return seed_seq
+
+
+@cython.locals(cells=list, num_samples=cython.uint, rng=object, low=object, high=object)
+@cython.returns(object)
+def uniform_sampling(cells, num_samples, rng):
+    # type: (list, int, np.random.Generator) -> np.ndarray
+    # Draws num_samples uniform samples in every cell with a single call to the generator.
+    # The result has shape (len(cells), num_samples, d)
+    low = np.array([cell.min_corner for cell in cells], dtype=float)
+    high = np.array([cell.max_corner for cell in cells], dtype=float)
+    return rng.uniform(low[:, np.newaxis, :], high[:, np.newaxis, :], size=(len(cells), num_samples, low.shape[1]))
+
+
+# Samplers of BMNN22:
+# - uniform: independent uniform samples.
+# - lhs: Latin hypercube; every one of the num_samples slices of the cell along each axis contains one sample.
+# - sobol: scrambled Sobol sequence; num_samples is rounded up to a power of 2 (see num_samples_bound).
+# - halton: scrambled Halton sequence.
+# Every sample of the randomized samplers is uniformly distributed in the cell, but the samples cover the cell more
+# evenly than independent ones.
+(SAMPLER_UNIFORM, SAMPLER_LHS, SAMPLER_SOBOL, SAMPLER_HALTON) = ('uniform', 'lhs', 'sobol', 'halton')
+SAMPLERS = (SAMPLER_UNIFORM, SAMPLER_LHS, SAMPLER_SOBOL, SAMPLER_HALTON)
+
+
+@cython.locals(p0=cython.double, alpha=cython.double, sampler=str, n=cython.ulong)
+@cython.returns(cython.ulong)
+def num_samples_bound(p0=P0, alpha=ALPHA, sampler=SAMPLER_UNIFORM):
+    # type: (float, float, str) -> int
+    """
+    Number of samples per cell such that a region covering a fraction p0
+    of the cell is missed with probability at most alpha.
+
+    For independent samples, P(miss) = (1 - p0)^n. Latin hypercube samples
+    and scrambled (0, m, s)-nets are negatively dependent, so the same bound
+    holds for every box anchored at a corner of the cell (which is the case
+    of the monotone regions classified by BMNN22). Sobol samples keep their
+    balance properties only for powers of 2, so n is rounded up. No such
+    result is known for Halton, which uses the bound of independent samples
+    as an approximation.
+
+    Args:
+        p0 (float): Minimum fraction of the cell that must be detected.
+        alpha (float): Maximum probability of missing it.
+        sampler (str): One of SAMPLERS.
+
+    Returns:
+        int: Number of samples.
+
+    Example:
+    >>> num_samples_bound(0.01, 0.05)
+    >>> 299
+    >>> num_samples_bound(0.01, 0.05, SAMPLER_SOBOL)
+    >>> 512
+    """
+    assert sampler in SAMPLERS, 'Unknown sampler {0}'.format(sampler)
+    n = int(math.ceil(math.log(alpha) / math.log(1.0 - p0)))
+    if sampler == SAMPLER_SOBOL:
+        n = 1 << (n - 1).bit_length()
+    return n
+
+
+@cython.locals(num_samples=cython.ulong, p0=cython.double, sampler=str)
+@cython.returns(cython.double)
+def detection_confidence(num_samples, p0=P0, sampler=SAMPLER_UNIFORM):
+    # type: (int, float, str) -> float
+    """
+    Probability of detecting a region covering a fraction p0 of a cell
+    with num_samples samples (see num_samples_bound).
+
+    Example:
+    >>> detection_confidence(299, 0.01)
+    >>> 0.9505...
+    """
+    assert sampler in SAMPLERS, 'Unknown sampler {0}'.format(sampler)
+    if sampler == SAMPLER_SOBOL:
+        # Only the first power of 2 samples are balanced
+        num_samples = 1 << (num_samples.bit_length() - 1) if num_samples > 0 else 0
+    return 1.0 - (1.0 - p0) ** num_samples
+
+
+@cython.locals(cells=list, num_samples=cython.uint, rng=object, sampler=str, low=object, high=object)
+@cython.returns(object)
+def sampling(cells, num_samples, rng, sampler=SAMPLER_UNIFORM):
+    # type: (list, int, np.random.Generator, str) -> np.ndarray
+    """
+    Draws num_samples samples in every cell with the given sampler.
+
+    Args:
+        cells (list): List of Rectangles.
+        num_samples (int): Number of samples per cell.
+        rng (np.random.Generator): Source of randomness.
+        sampler (str): One of SAMPLERS.
+
+    Returns:
+        np.ndarray: Array of shape (len(cells), num_samples, d).
+    """
+    low = np.array([cell.min_corner for cell in cells], dtype=float)
+    high = np.array([cell.max_corner for cell in cells], dtype=float)
+    return box_sampling(low, high, num_samples, rng, sampler)
+
+
+@cython.locals(low=object, high=object, num_samples=cython.uint, rng=object, sampler=str, c=cython.ulong,
+               d=cython.ushort, unit=object, strata=object, m=cython.ushort)
+@cython.returns(object)
+def box_sampling(low, high, num_samples, rng, sampler=SAMPLER_UNIFORM):
+    # type: (np.ndarray, np.ndarray, int, np.random.Generator, str) -> np.ndarray
+    """
+    Same as sampling(), for cells given by two arrays of shape (c, d)
+    with their minimal and maximal corners.
+    """
+    assert sampler in SAMPLERS, 'Unknown sampler {0}'.format(sampler)
+    (c, d) = low.shape
+    if sampler == SAMPLER_UNIFORM:
+        # Same samples as uniform_sampling
+        return rng.uniform(low[:, np.newaxis, :], high[:, np.newaxis, :], size=(c, num_samples, d))
+
+    if sampler == SAMPLER_LHS:
+        # One random permutation of the strata per cell and dimension, and a uniform offset inside every stratum
+        strata = rng.permuted(np.broadcast_to(np.arange(num_samples), (c, d, num_samples)), axis=2)
+        unit = (strata + rng.random((c, d, num_samples))) / num_samples
+        unit = unit.transpose((0, 2, 1))
+    elif sampler == SAMPLER_SOBOL:
+        # Independent scrambling for every cell. Sobol points are drawn in blocks of a power of 2
+        m = (num_samples - 1).bit_length()
+        unit = np.array([qmc.Sobol(d, scramble=True, seed=rng).random_base2(m)[:num_samples] for _ in range(c)])
+    else:
+        unit = np.array([qmc.Halton(d, scramble=True, seed=rng).random(num_samples) for _ in range(c)])
+    return low[:, np.newaxis, :] + unit.reshape((c, num_samples, d)) * (high - low)[:, np.newaxis, :]
+
+
+@cython.locals(cell=object, samples=object, answers=object, d=cython.ushort, mid=object, child=object,
+               i=cython.ulong)
+@cython.returns(list)
+def split_samples(cell, samples, answers):
+    # type: (Rectangle, np.ndarray, np.ndarray) -> list
+    """
+    Distributes the samples of a cell, together with the answers of the
+    oracles for them, among the 2^d sub-cells returned by
+    cell.cell_partition_bin(2^d). Every sample falls in exactly one
+    sub-cell, so BMNN22 opt_1 only needs to draw the rest.
+
+    Args:
+        cell (Rectangle): The cell.
+        samples (np.ndarray): Samples in the cell, shape (n, d).
+        answers (np.ndarray): Boolean answers for the samples, shape (n,).
+
+    Returns:
+        list: One pair (samples, answers) per sub-cell, in the order of
+              cell_partition_bin.
+    """
+    d = cell.dim()
+    mid = np.add(cell.min_corner, np.divide(np.subtract(cell.max_corner, cell.min_corner), 2))
+    # Row-major index of the sub-cell of every sample
+    child = (samples >= mid).astype(int) @ (2 ** np.arange(d - 1, -1, -1))
+    return [(samples[child == i], answers[child == i]) for i in range(2 ** d)]
+
+
+@cython.locals(cell=object, seed_seq=object, num_samples=cython.uint, sampler=str, samples=object,
+               missing=cython.long)
+@cython.returns(object)
+def missing_samples(cell, seed_seq, num_samples, sampler, samples=None):
+    # type: (Rectangle, np.random.SeedSequence, int, str, np.ndarray) -> np.ndarray
+    """
+    New samples of a cell of BMNN22 opt_1, i.e., the ones that are drawn
+    from the random stream of the cell to complete the samples inherited
+    from its parent (see split_samples) up to num_samples.
+
+    Returns:
+        np.ndarray: Samples with shape (num_samples - len(samples), d).
+    """
+    missing = num_samples - (0 if samples is None else len(samples))
+    if missing <= 0:
+        return np.empty((0, cell.dim()))
+    return sampling([cell], missing, np.random.default_rng(seed_seq), sampler)[0]
+
+
+@cython.locals(cell=object, conj=object, seed_seq=object, num_samples=cython.uint, sampler=str, samples=object,
+               answers=object, new_samples=object)
+@cython.returns(tuple)
+def complete_samples(cell, conj, seed_seq, num_samples, sampler, samples=None, answers=None):
+    # type: (Rectangle, OracleConjunction, np.random.SeedSequence, int, str, np.ndarray, np.ndarray) -> tuple
+    """
+    Samples of a cell of BMNN22 opt_1 and the answers of the conjunction
+    for them. The samples inherited from the parent cell (see
+    split_samples) are kept, and only the missing ones up to num_samples
+    are drawn from the random stream of the cell and evaluated.
+
+    Returns:
+        tuple: (samples, answers), with shapes (n, d) and (n,).
+    """
+    if samples is None:
+        samples = np.empty((0, cell.dim()))
+        answers = np.empty(0, dtype=bool)
+    new_samples = missing_samples(cell, seed_seq, num_samples, sampler, samples)
+    if len(new_samples) > 0:
+        samples = np.concatenate((samples, new_samples))
+        answers = np.concatenate((answers, np.array(conj.batch(list(new_samples)), dtype=bool)))
+    return samples, answers
+
+
+@cython.locals(cell=object, answers=object, ps=cython.double, g=tuple, counter=cython.ulong)
+@cython.returns(object)
+def cell_verdict(cell, answers, ps, g):
+    # type: (Rectangle, np.ndarray, float, tuple) -> bool
+    """
+    Verdict of BMNN22 opt_1 for a cell given the answers for its samples:
+    False (no sample satisfies the oracles), True (a fraction ps of the
+    samples does, or the cell is smaller than g) or None (mixed verdict,
+    the cell must be split).
+    """
+    counter = int(np.count_nonzero(answers))
+    if counter == 0:
+        return False
+    elif counter / len(answers) >= ps or less_equal(cell.diag_vector(), g):
+        return True
+    return None
+
+
+@cython.locals(cell=object, answers=object, p=cython.double)
+@cython.returns(cython.double)
+def boundary_score(cell, answers):
+    # type: (Rectangle, np.ndarray) -> float
+    """
+    Priority of a cell with mixed verdict in the boundary-first refinement
+    of BMNN22 (opt_level=2): its volume times 4p(1 - p), where p is the
+    fraction of its samples that satisfy the oracles. Large cells that
+    are split evenly by the boundary are refined first.
+    """
+    p = np.count_nonzero(answers) / len(answers)
+    return cell.volume() * 4.0 * p * (1.0 - p)
+
+
+# Monotonicity of the oracles along every dimension of the space (see monotone_projection)
+(MONO_UNKNOWN, MONO_INCREASING, MONO_DECREASING) = (0, 1, -1)
+
+
+@cython.locals(num_samples=cython.uint, monotonicity=tuple)
+@cython.returns(cython.uint)
+def monotone_num_samples(num_samples, monotonicity=None):
+    # type: (int, tuple) -> int
+    # When the oracles are monotone along every dimension, one sample (i.e., the best corner) settles a cell
+    if monotonicity is not None and all(m != MONO_UNKNOWN for m in monotonicity):
+        return 1
+    return num_samples
+
+
+@cython.locals(low=object, high=object, samples=object, monotonicity=tuple, i=cython.ushort, m=cython.short)
+@cython.returns(object)
+def monotone_projection(low, high, samples, monotonicity):
+    # type: (np.ndarray, np.ndarray, np.ndarray, tuple) -> np.ndarray
+    """
+    Moves the samples of every cell to the best face of the cell along
+    the dimensions where the oracles are monotone.
+
+    If the oracles are increasing (resp. decreasing) along dimension i,
+    a point of the cell satisfies them only if the point with the same
+    coordinates and the maximal (resp. minimal) i-th coordinate of the
+    cell also does. Thus, BMNN22 opt_0 finds a point that satisfies the
+    oracles in a cell iff it finds one among the projected samples, and
+    the samples are only spent along the non-monotone dimensions.
+
+    Args:
+        low (np.ndarray): Minimal corners of the cells, shape (c, d).
+        high (np.ndarray): Maximal corners of the cells, shape (c, d).
+        samples (np.ndarray): Samples of the cells, shape (c, n, d).
+        monotonicity (tuple): MONO_INCREASING, MONO_DECREASING or
+                              MONO_UNKNOWN for every dimension.
+
+    Returns:
+        np.ndarray: Projected samples, shape (c, n, d).
+
+    Example:
+    >>> monotone_projection(low, high, samples, (MONO_INCREASING, MONO_UNKNOWN))
+    """
+    assert len(monotonicity) == samples.shape[2], 'One monotonicity per dimension is required'
+    for i, m in enumerate(monotonicity):
+        if m == MONO_INCREASING:
+            samples[:, :, i] = high[:, np.newaxis, i]
+        elif m == MONO_DECREASING:
+            samples[:, :, i] = low[:, np.newaxis, i]
+    return samples
+
+
+# Maximum number of coordinates of the samples of a chunk of CellGrid (i.e., 64 MB of samples)
+GRID_CHUNK_SIZE = 1 << 23
+
+
+class CellGrid(object):
+    """
+    Regular grid of k^d cells of equal size over a Rectangle.
+
+    The grid replaces the list of Rectangles returned by
+    Rectangle.cell_partition_bin() in BMNN22. Cells are identified by
+    their flat index in row-major order (i.e., the order of
+    cell_partition_bin), their corners are computed on demand by chunks,
+    and their classification is stored in a boolean numpy array. Thus,
+    fine grids (e.g., 1000x1000 cells) fit in memory. Rectangles are only
+    built at the end, by merging adjacent cells with the same state
+    (see rectangles()).
+
+    Example:
+    >>> grid = CellGrid(Rectangle((0.0, 0.0), (1.0, 1.0)), 100)
+    >>> grid.shape
+    >>> (10, 10)
+    >>> low, high = grid.bounds(0, 10)
+    >>> grid.green[0, :] = True
+    >>> grid.rectangles(grid.green)
+    >>> [[(0.0, 0.0), (0.1, 1.0)]]
+    """
+    cython.declare(xspace=object, shape=tuple, min_corner=object, step=object, green=object)
+
+    @cython.locals(xspace=object, num_cells=cython.ulong, d=cython.ushort, k=cython.ulong)
+    @cython.returns(cython.void)
+    def __init__(self, xspace, num_cells):
+        # type: (CellGrid, Rectangle, int) -> None
+        """
+        Args:
+            xspace (Rectangle): Space covered by the grid.
+            num_cells (int): Number of cells. As in cell_partition_bin,
+                             it is rounded to k^d cells.
+        """
+        d = xspace.dim()
+        k = math.ceil(pow(10, math.log(num_cells, 10) / d))
+        self.xspace = xspace
+        self.shape = (k,) * d
+        self.min_corner = np.array(xspace.min_corner, dtype=float)
+        self.step = np.subtract(xspace.max_corner, xspace.min_corner) / k
+        # Classification of the cells
+        self.green = np.zeros(self.shape, dtype=bool)
+
+    @cython.returns(cython.ulong)
+    def __len__(self):
+        # type: (CellGrid) -> int
+        return self.green.size
+
+    @cython.returns(cython.double)
+    def cell_volume(self):
+        # type: (CellGrid) -> float
+        return float(np.prod(self.step))
+
+    @cython.locals(num_samples=cython.uint, num_chunks=cython.ulong, size=cython.ulong, i=cython.ulong)
+    @cython.returns(list)
+    def chunks(self, num_samples, num_chunks=CELL_CHUNKS):
+        # type: (CellGrid, int, int) -> list
+        """
+        Splits the grid in ranges (start, stop) of consecutive flat indices.
+
+        There are at least num_chunks ranges, and enough ranges so that
+        the samples of a range fit in GRID_CHUNK_SIZE coordinates. The
+        ranges only depend on the grid, num_samples and num_chunks, so
+        that every range can have its own random stream (see cell_chunks).
+        """
+        num_chunks = max(num_chunks, -(-len(self) * num_samples * len(self.shape) // GRID_CHUNK_SIZE))
+        size = max(1, -(-len(self) // num_chunks))
+        return [(i, min(i + size, len(self))) for i in range(0, len(self), size)]
+
+    @cython.locals(start=cython.ulong, stop=cython.ulong, index=object, low=object)
+    @cython.returns(tuple)
+    def bounds(self, start, stop):
+        # type: (CellGrid, int, int) -> (np.ndarray, np.ndarray)
+        """
+        Minimal and maximal corners of the cells with flat indices in
+        [start, stop), as two arrays of shape (stop - start, d).
+        They are the corners of the Rectangles of cell_partition_bin.
+        """
+        index = np.stack(np.unravel_index(np.arange(start, stop), self.shape), axis=1)
+        low = self.min_corner + index * self.step
+        return low, low + self.step
+
+    @cython.locals(index=object, size=object, low=object, high=object, k=object)
+    @cython.returns(object)
+    def box(self, index, size):
+        # type: (CellGrid, np.ndarray, np.ndarray) -> Rectangle
+        # Rectangle that covers size[i] cells from index[i] on every axis i
+        low = self.min_corner + index * self.step
+        high = self.min_corner + (index + size) * self.step
+        # The upper cells end exactly at the border of xspace
+        k = np.array(self.shape)
+        high = np.where(index + size == k, self.xspace.max_corner, high)
+        return Rectangle(tuple(low.tolist()), tuple(high.tolist()))
+
+    @cython.locals(mask=object, todo=object, flat=object, pos=cython.ulong, d=cython.ushort, index=object,
+                   end=object, row=object, axis=cython.ushort, box=list, rect_list=list)
+    @cython.returns(list)
+    def rectangles(self, mask):
+        # type: (CellGrid, np.ndarray) -> list
+        """
+        Covers the cells where mask is True with disjoint Rectangles.
+
+        Cells are greedily merged in row-major order: every box grows
+        along the last axis first and then along the previous ones,
+        as long as all the cells it adds are in the mask and not covered
+        yet.
+
+        Args:
+            mask (np.ndarray): Boolean array with the shape of the grid
+                               (e.g., grid.green or ~grid.green).
+
+        Returns:
+            list: List of Rectangles.
+        """
+        todo = np.array(mask, dtype=bool)
+        flat = todo.reshape(-1)
+        d = len(self.shape)
+        rect_list = list()
+        pos = 0
+        while True:
+            # Next cell that is not covered yet
+            pos = pos + int(np.argmax(flat[pos:])) if pos < flat.size else flat.size
+            if pos >= flat.size or not flat[pos]:
+                break
+            index = np.array(np.unravel_index(pos, self.shape))
+            end = index + 1
+            # Run of cells along the last axis
+            row = flat[pos:pos + self.shape[-1] - index[-1]]
+            end[-1] = index[-1] + (int(np.argmin(row)) if not row.all() else row.size)
+            for axis in reversed(range(d - 1)):
+                # Slabs of the box that can be added along the axis
+                box = [slice(i, j) for i, j in zip(index, end)]
+                box[axis] = slice(end[axis], None)
+                row = np.moveaxis(todo[tuple(box)], axis, 0)
+                row = row.reshape((row.shape[0], int(np.prod(row.shape[1:])))).all(axis=1)
+                end[axis] = end[axis] + (int(np.argmin(row)) if not row.all() else row.size)
+            todo[tuple(slice(i, j) for i, j in zip(index, end))] = False
+            rect_list.append(self.box(index, end - index))
+        return rect_list
+
+
+# Surrogate pre-screening of binary_search (see BoundarySurrogate)
+SURROGATE_POINTS = 4096
+SURROGATE_MARGIN = 1.0 / 16.0
+SURROGATE_MIN_MARGIN = 1.0 / 256.0
+
+
+@cython.locals(y=object, error=tuple, i=cython.ushort, yval=tuple, dist=cython.double)
+@cython.returns(cython.ushort)
+def bisection(y, member, error):
+    # type: (Segment, callable, tuple) -> int
+    # Bisection of a segment such that member(y.low) is False and member(y.high) is True
+    i = 0
+    # dist = subtract(y.high, y.low)
+    dist = y.norm()
+    # while not less_equal(dist, error):
+    while dist > error[0]:
+        i += 1
+        # yval = div(add(y.low, y.high), 2.0)
+        yval = y.center()
+        # We need a oracle() for guiding the search
+        if member(yval):
+            y.high = yval
+        else:
+            y.low = yval
+        # dist = subtract(y.high, y.low)
+        dist = y.norm()
+    return i
+
+
+@cython.locals(x=object, error=tuple, surrogate=object, i=cython.ushort, y=object, xlow=tuple, xhigh=tuple,
+               guess=tuple, glow=tuple, ghigh=tuple)
 @cython.returns((object, cython.ushort))
 def binary_search(x,
                   member,
-                  error):
-    # type: (Segment, callable, tuple) -> (Segment, int)
+                  error,
+                  surrogate=None):
+    # type: (Segment, callable, tuple, BoundarySurrogate) -> (Segment, int)
+    # If provided, surrogate proposes a narrowed interval of the segment that is confirmed by member
+    # before the bisection starts. The result is exact with and without surrogate.
     i = 0
     y = x
+    xlow, xhigh = x.low, x.high
+    guess = surrogate.guess(x) if surrogate is not None else None
 
-    if member(y.low):
+    if guess is not None:
+        glow, ghigh = guess
+        if member(glow):
+            if glow == y.low or member(y.low):
+                # All the cube belongs to B1
+                y.high = y.low
+            else:
+                # The boundary is below the guess
+                y.high = glow
+                i = bisection(y, member, error)
+        elif not member(ghigh):
+            if ghigh == y.high or not member(y.high):
+                # All the cube belongs to B0
+                y.low = y.high
+            else:
+                # The boundary is above the guess
+                y.low = ghigh
+                i = bisection(y, member, error)
+        else:
+            # The guess is confirmed
+            surrogate.num_hits += 1
+            y.low = glow
+            y.high = ghigh
+            i = bisection(y, member, error)
+    elif member(y.low):
         # All the cube belongs to B1
         y.low = x.low
         y.high = x.low
@@ -58,23 +577,138 @@ def binary_search(x,
         y.high = x.high
     else:
         # We don't know. We search for a point in the diagonal
-        # dist = subtract(y.high, y.low)
-        dist = y.norm()
-        # while not less_equal(dist, error):
-        while dist > error[0]:
-            i += 1
-            # yval = div(add(y.low, y.high), 2.0)
-            yval = y.center()
-            # We need a oracle() for guiding the search
-            if member(yval):
-                y.high = yval
-            else:
-                y.low = yval
-            # dist = subtract(y.high, y.low)
-            dist = y.norm()
+        i = bisection(y, member, error)
+
+    if surrogate is not None and y.low != xlow and y.high != xhigh:
+        surrogate.add(Segment(xlow, xhigh), y.center())
     return y, i
 
 
+class BoundarySurrogate(object):
+    """
+    Cheap model of the boundary of an expensive monotone membership
+    function, fitted online on the boundary points found by binary_search.
+
+    Given a new segment, the surrogate fits a hyperplane through the known
+    boundary points that are nearest to the segment (i.e., a secant of the
+    boundary) and predicts that the boundary crosses the segment where the
+    hyperplane does. binary_search confirms the interval [t - margin,
+    t + margin] around the prediction with two oracle calls before
+    bisecting it, so the result is exact even if the prediction is wrong.
+    The margin, measured as a fraction of the segment, follows the errors
+    of the previous predictions: a confirmed guess with margin m saves
+    log2(1/(2*m)) oracle calls, a wrong one costs a single extra call.
+
+    Example:
+    >>> surrogate = BoundarySurrogate(dim=2)
+    >>> y, steps = binary_search(x, f, error, surrogate)
+    >>> surrogate.num_hits
+    """
+    cython.declare(dim=cython.ushort, max_points=cython.ulong, margin=cython.double, num_guesses=cython.ulong,
+                   num_hits=cython.ulong, _points=list, _cache=object, _last_guess=tuple)
+
+    @cython.locals(dim=cython.ushort, max_points=cython.ulong, margin=cython.double)
+    @cython.returns(cython.void)
+    def __init__(self, dim, max_points=SURROGATE_POINTS, margin=SURROGATE_MARGIN):
+        # type: (BoundarySurrogate, int, int, float) -> None
+        """
+        Args:
+            dim (int): Dimension of the space.
+            max_points (int): Number of boundary points remembered by the surrogate.
+            margin (float): Initial half width of the proposed intervals, as a fraction of the segment.
+        """
+        self.dim = dim
+        self.max_points = max_points
+        self.margin = margin
+        self.num_guesses = 0
+        self.num_hits = 0
+        self._points = []
+        self._cache = None
+        self._last_guess = None
+
+    @cython.locals(x=object, point=tuple, t=cython.double, t_guess=cython.double, error=cython.double)
+    @cython.returns(cython.void)
+    def add(self, x, point):
+        # type: (BoundarySurrogate, Segment, tuple) -> None
+        """
+        Remembers a boundary point found in segment x, and updates the margin
+        with the error of the last guess for that segment.
+        """
+        if self._last_guess is not None and self._last_guess[0] == (x.low, x.high):
+            t_guess = self._last_guess[1]
+            t = self._position(x, point)
+            error = abs(t - t_guess)
+            # Exponential moving average of (twice) the error
+            self.margin = min(0.25, max(SURROGATE_MIN_MARGIN, 0.75 * self.margin + 0.25 * 2.0 * error))
+        self._last_guess = None
+
+        self._points.append(point)
+        if len(self._points) > 2 * self.max_points:
+            self._points = self._points[-self.max_points:]
+        self._cache = None
+
+    @staticmethod
+    @cython.locals(x=object, point=tuple, low=object, v=object)
+    @cython.returns(cython.double)
+    def _position(x, point):
+        # type: (Segment, tuple) -> float
+        # Position of the projection of point on the segment, as a fraction of the segment
+        low = np.array(x.low, dtype=float)
+        v = np.array(x.high, dtype=float) - low
+        return float(np.dot(np.array(point, dtype=float) - low, v) / np.dot(v, v))
+
+    @cython.locals(x=object, low=object, v=object, scale=object, points=object, dist=object, k=cython.ushort,
+                   nearest=object, centre=object, normal=object, slope=cython.double, t=cython.double,
+                   t_low=cython.double, t_high=cython.double, glow=tuple, ghigh=tuple)
+    @cython.returns(tuple)
+    def guess(self, x):
+        # type: (BoundarySurrogate, Segment) -> tuple
+        """
+        Proposes an interval of the segment that contains the boundary.
+
+        Args:
+            x (Segment): Segment of the space.
+
+        Returns:
+            tuple: Couple of points (low, high) of the segment, or None if
+                   the surrogate cannot narrow the segment.
+        """
+        k = 2 * self.dim
+        if len(self._points) < k:
+            return None
+        if self._cache is None:
+            self._cache = np.array(self._points, dtype=float)
+
+        low = np.array(x.low, dtype=float)
+        v = np.array(x.high, dtype=float) - low
+        if not np.all(v > 0.0):
+            return None
+
+        # Boundary points nearest to the centre of the segment, measured in units of the segment
+        points = (self._cache - low) / v
+        dist = ((points - 0.5) ** 2).sum(axis=1)
+        nearest = points[np.argpartition(dist, k - 1)[:k]]
+
+        # Least squares hyperplane through the nearest points
+        centre = nearest.mean(axis=0)
+        normal = np.linalg.svd(nearest - centre)[2][-1]
+        slope = normal.sum()
+        if abs(slope) < 1e-12:
+            return None
+        # The segment is the diagonal t * (1, ..., 1) in units of the segment
+        t = float(np.dot(normal, centre) / slope)
+        if not 0.0 < t < 1.0:
+            return None
+
+        self.num_guesses += 1
+        self._last_guess = ((x.low, x.high), t)
+        t_low = t - self.margin
+        t_high = t + self.margin
+        glow = x.low if t_low <= 0.0 else tuple((low + t_low * v).tolist())
+        ghigh = x.high if t_high >= 1.0 else tuple((low + t_high * v).tolist())
+        return glow, ghigh
+
+
 # No intersection: -2
 # There exists an intersection: +1
 # Don't know: -1
@@ -121,9 +755,12 @@ def intersection_empty_constrained(x, member1, member2, list_constraints):
 
 @cython.locals(x=object)
 @cython.returns(cython.bint)
-def intersection_empty(x, member1, member2):
-    # type: (Segment, callable, callable) -> bool
+def intersection_empty(x, member1, member2, conjunction=None):
+    # type: (Segment, callable, callable, OracleConjunction) -> bool
     # The cube doesn't contain an intersection.
+    # If provided, conjunction wraps [member1, member2] and decides which oracle is queried first.
+    if conjunction is not None:
+        return not conjunction.all_at((x.high, x.low))
     return (not member1(x.high)) or (not member2(x.low))
 
 
@@ -231,3 +868,296 @@ def intersection_expansion_search(x,
             yIn.high = ygrek.low
 
     return yIn, yCover, intersect_indicator, i
+
+
+# Number of evaluations between two reorderings of an OracleConjunction
+REORDER_STEPS = 16
+# Size of the first chunk of points evaluated by OracleConjunction.any() in batch mode
+ANY_CHUNK = 8
+
+
+class OracleConjunction(object):
+    """
+    Conjunction of membership functions with adaptive evaluation order.
+
+    The conjunction f_1(x) and ... and f_k(x) is evaluated with short-circuit.
+    Every function records online its average cost (seconds per point) and
+    its rejection rate (fraction of points where it returns False). Functions
+    are periodically sorted by increasing cost/rejection rate, which minimizes
+    the expected cost per point when the answers are independent. Thus, a
+    cheap and selective oracle is queried before an expensive one, regardless
+    of the order chosen by the user.
+
+    If every oracle is vectorized (see Oracle.is_vectorized()), batch()
+    evaluates a list of points oracle by oracle, in the same adaptive order,
+    and only sends to the next oracle the points that were not rejected yet.
+
+    The statistics can be exported with stats() and loaded in another
+    conjunction with update_stats(), so that the order learnt by a parallel
+    task is not lost when the task finishes.
+
+    Example:
+    >>> conj = OracleConjunction.from_oracles([ora_slow, ora_fast])
+    >>> conj((0.5, 0.5))
+    >>> True
+    >>> conj.order
+    >>> [1, 0]
+    """
+    cython.declare(mems=list, batch_mems=list, order=list, num_calls=list, num_rejects=list, cost=list,
+                   _steps=cython.ulong)
+
+    @cython.locals(mems=list, batch_mems=list)
+    @cython.returns(cython.void)
+    def __init__(self, mems, batch_mems=None):
+        # type: (OracleConjunction, list, list) -> None
+        """
+        Args:
+            mems (list): Membership functions (see Oracle.membership()).
+            batch_mems (list): Optional vectorized version of mems, i.e.,
+                               functions that receive a list of points and
+                               return a list of booleans.
+        """
+        self.mems = list(mems)
+        self.batch_mems = list(batch_mems) if batch_mems is not None else None
+        self.order = list(range(len(self.mems)))
+        self.num_calls = [0] * len(self.mems)
+        self.num_rejects = [0] * len(self.mems)
+        self.cost = [0.0] * len(self.mems)
+        self._steps = 0
+
+    @staticmethod
+    @cython.locals(oracles=list)
+    @cython.returns(object)
+    def from_oracles(oracles):
+        # type: (list) -> OracleConjunction
+        """
+        Conjunction of the membership functions of a list of oracles.
+        The batch mode is enabled when every oracle is vectorized.
+        """
+        batch_mems = None
+        if len(oracles) > 0 and all(ora.is_vectorized() for ora in oracles):
+            batch_mems = [ora.member_batch for ora in oracles]
+        return OracleConjunction([ora.membership() for ora in oracles], batch_mems)
+
+    @property
+    def vectorized(self):
+        # type: (OracleConjunction) -> bool
+        return self.batch_mems is not None
+
+    @cython.locals(i=cython.ushort)
+    @cython.returns(cython.double)
+    def rank(self, i):
+        # type: (OracleConjunction, int) -> float
+        """
+        Expected cost of the i-th function per rejected point.
+        Functions with lower rank are evaluated first.
+        """
+        # Laplace smoothing: functions that were never called are tried first
+        if self.num_calls[i] == 0:
+            return 0.0
+        return (self.cost[i] / self.num_calls[i]) * (self.num_calls[i] + 2.0) / (self.num_rejects[i] + 1.0)
+
+    @cython.returns(cython.void)
+    def _reorder(self):
+        # type: (OracleConjunction) -> None
+        self._steps = self._steps + 1
+        if self._steps >= REORDER_STEPS:
+            self._steps = 0
+            self.order.sort(key=self.rank)
+
+    @cython.locals(i=cython.ushort, num_points=cython.ulong, num_rejects=cython.ulong, elapsed=cython.double)
+    @cython.returns(cython.void)
+    def _record(self, i, num_points, num_rejects, elapsed):
+        # type: (OracleConjunction, int, int, int, float) -> None
+        self.num_calls[i] = self.num_calls[i] + num_points
+        self.num_rejects[i] = self.num_rejects[i] + num_rejects
+        self.cost[i] = self.cost[i] + elapsed
+
+    @cython.locals(points=tuple, i=cython.ushort, start=cython.double, res=cython.bint)
+    @cython.returns(cython.bint)
+    def all_at(self, points):
+        # type: (OracleConjunction, tuple) -> bool
+        """
+        Evaluates f_1(points[0]) and ... and f_k(points[k-1]).
+
+        Args:
+            points (tuple): One point per membership function.
+
+        Returns:
+            bool: True if every function accepts its point.
+        """
+        res = True
+        for i in self.order:
+            start = time.perf_counter()
+            res = self.mems[i](points[i])
+            self._record(i, 1, 0 if res else 1, time.perf_counter() - start)
+            if not res:
+                break
+        self._reorder()
+        return res
+
+    @cython.locals(point=tuple)
+    @cython.returns(cython.bint)
+    def __call__(self, point):
+        # type: (OracleConjunction, tuple) -> bool
+        """
+        Evaluates f_1(point) and ... and f_k(point).
+        """
+        return self.all_at((point,) * len(self.mems))
+
+    @cython.locals(points=list, res=list, pending=list, i=cython.ushort, answers=list, start=cython.double,
+                   j=cython.ulong, ans=cython.bint)
+    @cython.returns(list)
+    def batch(self, points):
+        # type: (OracleConjunction, list) -> list
+        """
+        Evaluates the conjunction over a list of points.
+
+        In batch mode, every oracle receives the points that were accepted
+        by the previous oracles in a single call. Otherwise, points are
+        evaluated one by one with short-circuit.
+
+        Args:
+            points (list): List of points.
+
+        Returns:
+            list: List of booleans, one for each point.
+        """
+        if not self.vectorized:
+            return [self(point) for point in points]
+
+        res = [True] * len(points)
+        pending = list(range(len(points)))
+        for i in self.order:
+            if len(pending) == 0:
+                break
+            start = time.perf_counter()
+            answers = self.batch_mems[i]([points[j] for j in pending])
+            self._record(i, len(pending), len(answers) - sum(answers), time.perf_counter() - start)
+            for j, ans in zip(pending, answers):
+                res[j] = ans
+            pending = [j for j, ans in zip(pending, answers) if ans]
+        # Batches are large, so the order is updated after every one
+        self.order.sort(key=self.rank)
+        return res
+
+    @cython.locals(points=list, start=cython.ulong, size=cython.ulong)
+    @cython.returns(cython.bint)
+    def any(self, points):
+        # type: (OracleConjunction, list) -> bool
+        """
+        True if some point satisfies the conjunction.
+        Equivalent to any(all(f(p) for f in mems) for p in points).
+
+        In batch mode, points are sent in chunks of doubling size
+        (ANY_CHUNK, 2*ANY_CHUNK, ...), so that the search stops soon after
+        the first point that satisfies the conjunction.
+        """
+        if not self.vectorized:
+            return any(self(point) for point in points)
+        start = 0
+        size = ANY_CHUNK
+        while start < len(points):
+            if any(self.batch(points[start:start + size])):
+                return True
+            start = start + size
+            size = 2 * size
+        return False
+
+    @cython.locals(points=object, res=object, pending=object, i=cython.ushort, answers=object,
+                   start=cython.double)
+    @cython.returns(object)
+    def _batch_array(self, points):
+        # type: (OracleConjunction, np.ndarray) -> np.ndarray
+        # batch() for an array of points of shape (m, d). The bookkeeping of the pending points is done by numpy
+        res = np.ones(len(points), dtype=bool)
+        pending = np.arange(len(points))
+        for i in self.order:
+            if len(pending) == 0:
+                break
+            start = time.perf_counter()
+            answers = np.asarray(self.batch_mems[i](points[pending]), dtype=bool)
+            self._record(i, len(pending), len(answers) - int(np.count_nonzero(answers)), time.perf_counter() - start)
+            res[pending] = answers
+            pending = pending[answers]
+        self.order.sort(key=self.rank)
+        return res
+
+    @cython.locals(samples=object, found=object, pending=object, start=cython.ulong, size=cython.ulong,
+                   points=object, res=object)
+    @cython.returns(object)
+    def any_rows(self, samples):
+        # type: (OracleConjunction, np.ndarray) -> np.ndarray
+        """
+        any() over every row of an array of samples of shape (c, n, d).
+
+        In batch mode, the rows that are not decided yet are evaluated
+        together, in chunks of doubling size as in any(). Thus, a single
+        batch call serves the samples of many cells.
+
+        Returns:
+            np.ndarray: Boolean array with c elements.
+        """
+        if not self.vectorized:
+            return np.array([self.any(row) for row in samples], dtype=bool)
+        found = np.zeros(len(samples), dtype=bool)
+        pending = np.arange(len(samples))
+        start = 0
+        size = ANY_CHUNK
+        while start < samples.shape[1] and len(pending) > 0:
+            points = samples[pending, start:start + size]
+            res = self._batch_array(points.reshape((-1, points.shape[2])))
+            res = res.reshape(points.shape[:2]).any(axis=1)
+            found[pending[res]] = True
+            pending = pending[~res]
+            start = start + size
+            size = 2 * size
+        return found
+
+    @cython.locals(points=list)
+    @cython.returns(cython.ulong)
+    def count(self, points):
+        # type: (OracleConjunction, list) -> int
+        """
+        Number of points that satisfy the conjunction.
+        Equivalent to sum(all(f(p) for f in mems) for p in points).
+        """
+        if self.vectorized:
+            return sum(self.batch(points))
+        return sum(self(point) for point in points)
+
+    @cython.locals(base=tuple)
+    @cython.returns(tuple)
+    def stats(self, base=None):
+        # type: (OracleConjunction, tuple) -> tuple
+        """
+        Statistics learnt by the conjunction.
+
+        Args:
+            base (tuple): Optional statistics returned by a previous call.
+                          If given, only the statistics learnt since then
+                          are returned.
+
+        Returns:
+            tuple: (num_calls, num_rejects, cost), one list per statistic.
+        """
+        current = (list(self.num_calls), list(self.num_rejects), list(self.cost))
+        if base is None:
+            return current
+        return tuple([x - y for x, y in zip(cur, old)] for cur, old in zip(current, base))
+
+    @cython.locals(stats=tuple, i=cython.ushort)
+    @cython.returns(cython.void)
+    def update_stats(self, stats):
+        # type: (OracleConjunction, tuple) -> None
+        """
+        Adds the statistics of another conjunction of the same functions
+        (see stats()) and sorts the functions accordingly.
+
+        Example:
+        >>> conj.update_stats(task_conj.stats())
+        """
+        num_calls, num_rejects, cost = stats
+        for i in range(len(self.mems)):
+            self._record(i, num_calls[i], num_rejects[i], cost[i])
+        self.order.sort(key=self.rank)
@@ -23,12 +23,12 @@ The ResultSet class provides functions for:
 
 from multiprocessing import Pool, cpu_count
 from itertools import combinations
-from scipy.spatial.distance import directed_hausdorff as dhf
 import cython
 
 from ParetoLib.Geometry.Rectangle import Rectangle
-from ParetoLib.Geometry.ParRectangle import pvertices, pinside, pvol
-from ParetoLib.Search.ResultSet import ResultSet
+from ParetoLib.Geometry.ParRectangle import pinside, pvol
+# The nearest neighbour queries of champions_selection are batched in a cKDTree, so it does not require a Pool
+from ParetoLib.Search.ResultSet import ResultSet, champions_selection
 
 
 # @cython.cclass
@@ -43,53 +43,8 @@ class ParResultSet(ResultSet):
         ResultSet.__init__(self, border, ylow, yup, xspace)
 
     # Vertex functions
-    # @cython.ccall
-    @cython.locals(vertices_list=list, vertices=set)
-    @cython.returns(set)
-    def vertices_yup(self):
-        # type: (ParResultSet) -> set
-        p = Pool(cpu_count())
-
-        # vertices_list = (rect.vertices() for rect in self.yup)
-        vertices_list = p.map(pvertices, self.yup)
-        vertices = set()
-        vertices = vertices.union(*vertices_list)
-
-        p.close()
-        p.join()
-        return vertices
-
-    # @cython.ccall
-    @cython.locals(vertices_list=list, vertices=set)
-    @cython.returns(set)
-    def vertices_ylow(self):
-        # type: (ParResultSet) -> set
-        p = Pool(cpu_count())
-
-        # vertices_list = (rect.vertices() for rect in self.ylow)
-        vertices_list = p.map(pvertices, self.ylow)
-        vertices = set()
-        vertices = vertices.union(*vertices_list)
-
-        p.close()
-        p.join()
-        return vertices
-
-    # @cython.ccall
-    @cython.locals(vertices_list=list, vertices=set)
-    @cython.returns(set)
-    def vertices_border(self):
-        # type: (ParResultSet) -> set
-        p = Pool(cpu_count())
-
-        # vertices_list = (rect.vertices() for rect in self.border)
-        vertices_list = p.map(pvertices, self.border)
-        vertices = set()
-        vertices = vertices.union(*vertices_list)
-
-        p.close()
-        p.join()
-        return vertices
+    # The vertices are generated by broadcasting over the stacked corners of the rectangles (see
+    # ResultSet.vertex_array), which is faster than spawning a Pool for computing them
 
     # Volume functions
     @cython.returns(cython.double)
@@ -238,15 +193,3 @@ class ParResultSet(ResultSet):
         # p.join()
         # return any(isMember)
         return self.member_space(xpoint) and not self.member_yup(xpoint) and not self.member_ylow(xpoint)
-
-
-@cython.locals(rs_list=list, args=tuple, p=object, dist_list=list)
-@cython.returns(list)
-def champions_selection(rs_list):
-    # type: (list[ParResultSet]) -> list[tuple]
-    args = ((rs, rs_list) for rs in rs_list)
-    p = Pool(cpu_count())
-    dist_list = list(p.map(lambda rs, rs_list: rs.select_champion(rs_list), args))
-    p.close()
-    p.join()
-    return dist_list
@@ -17,10 +17,13 @@ doc/article.pdf.
 import os
 import copy
 import time
+import pickle
 import tempfile
 import itertools
+import heapq
 import multiprocessing as mp
 import cython
+import numpy as np
 from typing import List, Tuple, Union
 from multiprocessing import Manager, Pool, cpu_count
 from sortedcontainers import SortedSet, SortedListWithKey
@@ -31,7 +34,9 @@ import ParetoLib.Search
 RootSearch = ParetoLib.Search
 
 from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, INTERFULL, INTERNULL, INTER, NO_INTER, \
-    binary_search, intersection_empty, intersection_empty_constrained, intersection_expansion_search
+    binary_search, intersection_empty, intersection_empty_constrained, intersection_expansion_search, \
+    OracleConjunction, CellGrid, CELL_CHUNKS, BATCH_SAMPLES, seed_sequence, box_sampling, missing_samples, \
+    split_samples, cell_verdict, boundary_score, monotone_num_samples, monotone_projection, SAMPLER_UNIFORM
 from ParetoLib.Search.SeqSearch import pos_neg_box_gen, pos_overlap_box_gen, bound_box_with_constraints
 from ParetoLib.Search.ParResultSet import ParResultSet
 
@@ -1394,6 +1399,7 @@ def pintersection_search_opt_1(args):
     ora1, ora2, incomparable, incomparable_segment, incomp_pos, incomp_neg_down, incomp_neg_up = dict_man[
         mp.current_process().name]
     f1, f2 = ora1.membership(), ora2.membership()
+    conj = OracleConjunction([f1, f2])
 
     RootSearch.logger.debug('f1 = {0}'.format(f1))
     RootSearch.logger.debug('f2 = {0}'.format(f2))
@@ -1452,7 +1458,7 @@ def pintersection_search_opt_1(args):
         i = irect(incomparable, yrectangle, xrectangle)
 
     for rect in i:
-        if intersection_empty(rect.diag(), f1, f2):
+        if intersection_empty(rect.diag(), f1, f2, conj):
             local_vol_xrest += rect.volume()
         else:
             rect.privilege = current_privilege + 1.0
@@ -1476,6 +1482,7 @@ def pintersection_search_opt_2(args):
 
     ora1, ora2, incomparable, incomparable_segment = dict_man[mp.current_process().name]
     f1, f2 = ora1.membership(), ora2.membership()
+    conj = OracleConjunction([f1, f2])
 
     RootSearch.logger.debug('f1 = {0}'.format(f1))
     RootSearch.logger.debug('f2 = {0}'.format(f2))
@@ -1531,7 +1538,7 @@ def pintersection_search_opt_2(args):
         i = irect(incomparable, yrectangle, xrectangle)
 
     for rect in i:
-        if intersection_empty(rect.diag(), f1, f2):
+        if intersection_empty(rect.diag(), f1, f2, conj):
             local_vol_xrest += rect.volume()
         else:
             rect.privilege = current_privilege + 1.0
@@ -2695,7 +2702,8 @@ def multidim_intersection_search_opt_2_partial(xspace, list_constraints,
 @cython.ccall
 @cython.returns(object)
 @cython.locals(xspace=object, oracles=list, num_samples=cython.int, num_cells=cython.int, blocking=cython.bint,
-               sleep=cython.double, opt_level=cython.uint, logging=cython.bint, md_search=list, start=cython.double,
+               sleep=cython.double, opt_level=cython.uint, logging=cython.bint, seed=object, sampler=str,
+               max_calls=object, max_time=object, monotonicity=tuple, md_search=list, start=cython.double,
                end=cython.double, time0=cython.double, rs=object)
 def multidim_search_BMNN22(xspace : Rectangle,
                            oracles : List[Oracle],
@@ -2704,10 +2712,17 @@ def multidim_search_BMNN22(xspace : Rectangle,
                            blocking : bool = False,
                            sleep : float = 0.0,
                            opt_level : int = 0,
-                           logging : bool = True) -> ParResultSet:
-    # type: (Rectangle, list, int, int, bool, float, int, bool) -> ParResultSet
+                           logging : bool = True,
+                           seed : int = None,
+                           sampler : str = SAMPLER_UNIFORM,
+                           max_calls : int = None,
+                           max_time : float = None,
+                           monotonicity : Tuple[int] = None) -> ParResultSet:
+    # type: (Rectangle, list, int, int, bool, float, int, bool, int, str, int, float, tuple) -> ParResultSet
 
     RootSearch.logger.info('Starting multidimensional search (BMNN22)')
+    if monotonicity is not None and opt_level != 0:
+        RootSearch.logger.warning('The monotonicity of the oracles is only used with opt_level=0')
     start = time.time()
     if opt_level == 0:  # Fixed cell creation
         rs = multidim_search_BMNN22_opt_0(xspace,
@@ -2716,8 +2731,11 @@ def multidim_search_BMNN22(xspace : Rectangle,
                                           num_cells=num_cells,
                                           blocking=blocking,
                                           sleep=sleep,
-                                          logging=logging)
-    else:  # Dinamyc cell creation
+                                          logging=logging,
+                                          seed=seed,
+                                          sampler=sampler,
+                                          monotonicity=monotonicity)
+    elif opt_level == 1:  # Dinamyc cell creation
         ps = 0.95
         g = mult(xspace.diag_vector(), 1.0 / 10.0)
         rs = multidim_search_BMNN22_opt_1(xspace,
@@ -2727,7 +2745,24 @@ def multidim_search_BMNN22(xspace : Rectangle,
                                           sleep=sleep,
                                           logging=logging,
                                           ps=ps,
-                                          g=g)
+                                          g=g,
+                                          seed=seed,
+                                          sampler=sampler)
+    else:  # Dinamyc cell creation, refining first the cells of the boundary
+        ps = 0.95
+        g = mult(xspace.diag_vector(), 1.0 / 10.0)
+        rs = multidim_search_BMNN22_opt_2(xspace,
+                                          oracles,
+                                          num_samples=num_samples,
+                                          blocking=blocking,
+                                          sleep=sleep,
+                                          logging=logging,
+                                          ps=ps,
+                                          g=g,
+                                          seed=seed,
+                                          sampler=sampler,
+                                          max_calls=max_calls,
+                                          max_time=max_time)
     end = time.time()
     time0 = end - start
     RootSearch.logger.info('Time multidim search (Pareto front): ' + str(time0))
@@ -2737,111 +2772,191 @@ def multidim_search_BMNN22(xspace : Rectangle,
 
 ########################################################################################################################
 
+# The oracles are sent once to every worker of the pool (see init_worker), instead of once per task. Tasks receive
+# large batches of cells or samples, so that the OracleConjunction of a task learns the best evaluation order over
+# many points. The statistics learnt by every task are merged and sent to the tasks of the next level. Samples are
+# drawn from independent random streams spawned from the SeedSequence of the search, instead of the global numpy
+# RNG inherited by the forked workers.
+
+# Oracles of the current worker process
+_oracles = None
+
+
+def init_worker(data: bytes) -> None:
+    # The oracles are pickled by the parent (see bmnn22_pool), so that every worker builds its own copy (e.g., its own
+    # connection to the database of an OracleMemo) instead of sharing the objects inherited by fork
+    global _oracles
+    _oracles = pickle.loads(data)
+
+
+@cython.locals(oracles=list)
+@cython.returns(object)
+def bmnn22_pool(oracles: List[Oracle]) -> Pool:
+    # type: (list[Oracle]) -> Pool
+    # As in the other parallel searches, the oracles are deep-copied first. Oracles that hold non-picklable resources
+    # (e.g., processes or shared libraries) only create them when they are used
+    return Pool(cpu_count(), initializer=init_worker, initargs=(pickle.dumps(copy.deepcopy(oracles)),))
+
+
 # Fixed size cell method
-def process_fix(args: Tuple[Rectangle,
-                            List[Oracle],
+def process_fix(args: Tuple[np.ndarray,
+                            np.ndarray,
                             int,
-                            int]) -> bool:
-    cell, oracles, num_samples, d = args
+                            tuple,
+                            np.random.SeedSequence,
+                            str,
+                            Tuple[int]]) -> Tuple[np.ndarray, tuple]:
+    low, high, num_samples, stats, seed_seq, sampler, monotonicity = args
 
-    fs = [ora.membership() for ora in oracles]
+    conj = OracleConjunction.from_oracles(_oracles)
+    conj.update_stats(stats)
+    base = conj.stats()
 
-    # Take num_samples uniformly between cell.min_corner and cell.max_corner
-    samples = cell.uniform_sampling(num_samples)
-    # Call the oracle with the current sample
-    res = any(all(f(sample) for f in fs) for sample in samples)
+    # Take num_samples between the corners low[i] and high[i] of every cell i of the chunk
+    samples = box_sampling(low, high, num_samples, np.random.default_rng(seed_seq), sampler)
+    if monotonicity is not None:
+        samples = monotone_projection(low, high, samples, monotonicity)
+    res = conj.any_rows(samples)
 
-    return res
+    return res, conj.stats(base)
 
 
 @cython.ccall
 @cython.returns(object)
 @cython.locals(xspace=object, oracles=list, num_samples=cython.uint, num_cells=cython.uint,
-               blocking=cython.bint, sleep=cython.double, logging=cython.bint, cells=list,
-               border=list, green=list, red=list, d=cython.uint, p=object, args=tuple, green_cells=list,
-               step=cython.uint, vol_green=cython.uint, vol_red=cython.uint, vol_border=cython.uint,
-               tempdir=cython.basestring,
-               rs=object)
+               blocking=cython.bint, sleep=cython.double, logging=cython.bint, grid=object, d=cython.uint, p=object,
+               args=object, conj=object, chunks=list, seeds=list, seed=object, sampler=str, step=cython.uint,
+               start=cython.ulong, stop=cython.ulong, res=object, stats=tuple, num_green=cython.ulong,
+               num_red=cython.ulong, vol_green=cython.double, vol_red=cython.double, vol_border=cython.double,
+               tempdir=cython.basestring, rs=object, monotonicity=tuple)
 def multidim_search_BMNN22_opt_0(xspace: Rectangle,
                                  oracles: List[Oracle],
                                  num_samples: int,
                                  num_cells: int,
                                  blocking: bool = False,
                                  sleep: float = 0.0,
-                                 logging: bool = True) -> ParResultSet:
-    # type: (Rectangle, list[Oracle], int, int, bool, float, bool) -> ParResultSet
-    cells = xspace.cell_partition_bin(num_cells)
-    border = list()
-    green = list()
-    red = list()
+                                 logging: bool = True,
+                                 seed: int = None,
+                                 sampler: str = SAMPLER_UNIFORM,
+                                 monotonicity: Tuple[int] = None) -> ParResultSet:
+    # type: (Rectangle, list[Oracle], int, int, bool, float, bool, int, str, tuple) -> ParResultSet
+    # As in SeqSearch, the cells are classified in a boolean grid. Workers only receive the corners of their cells
+    grid = CellGrid(xspace, num_cells)
     d = xspace.dim()
     step = 0
 
-    p = Pool(cpu_count())
-    args = ((cell, copy.deepcopy(oracles), num_samples, d) for cell in cells)
-    green_cells = p.map(process_fix, args)
+    p = bmnn22_pool(oracles)
+    conj = OracleConjunction.from_oracles(oracles)
+    num_samples = monotone_num_samples(num_samples, monotonicity)
+    chunks = grid.chunks(num_samples)
+    seeds = seed_sequence(seed).spawn(len(chunks))
+    args = (grid.bounds(start, stop) + (num_samples, conj.stats(), chunk_seed, sampler, monotonicity)
+            for (start, stop), chunk_seed in zip(chunks, seeds))
+    for ((start, stop), (res, stats)) in zip(chunks, p.map(process_fix, args)):
+        grid.green.flat[start:stop] = res
+        conj.update_stats(stats)
+    RootSearch.logger.debug('Oracle order: {0}'.format(conj.order))
     step = step + 1
-    vol_green, vol_red, vol_border = 0.0, 0.0, 0.0  # Area of all the regions for debugging purposess
+    num_green = int(np.count_nonzero(grid.green))
+    num_red = len(grid) - num_green
+    vol_green, vol_red, vol_border = num_green * grid.cell_volume(), num_red * grid.cell_volume(), 0.0
     tempdir = tempfile.mkdtemp()
     RootSearch.logger.info('Report\nStep, Red, Green, Border, Total, nRed, nGreen, nBorder')
     RootSearch.logger.info(
-        '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}'.format(step, vol_red, vol_green, vol_border, xspace.volume(), len(red),
-                                                        len(green), len(border)))  # 0th step
-    for i, cell in enumerate(cells):
-        if green_cells[i]:
-            green.append(cell)
-            vol_green = vol_green + cell.volume()
-        else:
-            red.append(cell)
-            vol_red = vol_red + cell.volume()
-            RootSearch.logger.info(
-                '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}'.format(step, vol_red, vol_green, vol_border, xspace.volume(),
-                                                            len(red), len(green), len(border)))
-        # Visualization
-        if sleep > 0.0:
-            rs = ParResultSet(border, red, green, xspace)
-            if d == 2:
-                rs.plot_2D_light(blocking=blocking, sec=sleep, opacity=0.7)
-            elif d == 3:
-                rs.plot_3D_light(blocking=blocking, sec=sleep, opacity=0.7)
+        '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}'.format(step, vol_red, vol_green, vol_border, xspace.volume(), num_red,
+                                                        num_green, 0))
+    rs = ParResultSet(border=list(), ylow=grid.rectangles(~grid.green), yup=grid.rectangles(grid.green),
+                      xspace=xspace)
+
+    # Visualization
+    if sleep > 0.0:
+        if d == 2:
+            rs.plot_2D_light(blocking=blocking, sec=sleep, opacity=0.7)
+        elif d == 3:
+            rs.plot_3D_light(blocking=blocking, sec=sleep, opacity=0.7)
 
-        if logging:
-            rs = ParResultSet(border, red, green, xspace)
-            name = os.path.join(tempdir, str(step))
-            rs.to_file(name)
+    if logging:
+        name = os.path.join(tempdir, str(step))
+        rs.to_file(name)
 
     p.close()
     p.join()
-    return ParResultSet(border=border, ylow=red, yup=green, xspace=xspace)
+    return rs
 
 
 # Dynamic size cell method
-def process_dyn(args: Tuple[Rectangle,
-                            List[Oracle],
-                            int,
-                            int,
-                            float,
-                            Tuple[float]]) -> Tuple[Rectangle, Union[bool,None]]:
-    cell, oracles, num_samples, d, ps, g = args
+def process_batch(args: Tuple[np.ndarray, tuple]) -> Tuple[np.ndarray, tuple]:
+    points, stats = args
+
+    conj = OracleConjunction.from_oracles(_oracles)
+    conj.update_stats(stats)
+    base = conj.stats()
 
-    fs = [ora.membership() for ora in oracles]
+    res = np.array(conj.batch(list(points)), dtype=bool)
 
-    # Take num_samples uniformly between cell.min_corner and cell.max_corner
-    samples = cell.uniform_sampling(num_samples)
-    all_fs_in_sample = (all(f(s) for f in fs) for s in samples)
-    counter = sum(all_fs_in_sample)
-    if counter == 0:
-        return cell, False
-    elif counter / num_samples >= ps or less_equal(cell.diag_vector(), g):
-        return cell, True
-    return cell, None
+    return res, conj.stats(base)
+
+
+@cython.locals(p=object, conj=object, cell_list=list, num_samples=cython.uint, sampler=str, new_samples=list,
+               points=object, num_batches=cython.ulong, args=object, answers=list, res=object, stats=tuple,
+               samples=object, cell_answers=object, level=list)
+@cython.returns(list)
+def evaluate_level(p: Pool,
+                   conj: OracleConjunction,
+                   cell_list: List[Tuple[Rectangle, np.random.SeedSequence, np.ndarray, np.ndarray]],
+                   num_samples: int,
+                   sampler: str) -> List[Tuple[np.ndarray, np.ndarray]]:
+    # type: (Pool, OracleConjunction, list, int, str) -> list
+    """
+    Evaluates a whole level of cells of the dynamic BMNN22 methods.
+
+    As in SeqSearch, every cell has its own SeedSequence and keeps the
+    samples inherited from its parent. The missing samples of all the
+    cells are drawn by the parent process and evaluated in large batches
+    by the pool, so the cost of a task is amortized over many samples
+    even when the cells are small.
+
+    Args:
+        p (Pool): Pool of processes created by bmnn22_pool.
+        conj (OracleConjunction): Conjunction of the oracles. It receives
+                                  the statistics learnt by the tasks.
+        cell_list (list): Tuples (cell, seed of the cell, inherited
+                          samples, answers for the inherited samples).
+        num_samples (int): Number of samples per cell.
+        sampler (str): Sampling method (see SAMPLERS).
+
+    Returns:
+        list: One pair (samples, answers) per cell, with num_samples
+              samples each.
+    """
+    new_samples = [missing_samples(cell, seed_seq, num_samples, sampler, samples)
+                   for cell, seed_seq, samples, _ in cell_list]
+    points = np.concatenate(new_samples)
+    answers = list()
+    if len(points) > 0:
+        num_batches = min(CELL_CHUNKS, -(-len(points) // BATCH_SAMPLES))
+        args = ((batch, conj.stats()) for batch in np.array_split(points, num_batches))
+        for (res, stats) in p.map(process_batch, args):
+            answers.append(res)
+            conj.update_stats(stats)
+    answers = np.split(np.concatenate(answers) if len(answers) > 0 else np.empty(0, dtype=bool),
+                       np.cumsum([len(new) for new in new_samples])[:-1])
+
+    level = list()
+    for (_, _, samples, cell_answers), new, res in zip(cell_list, new_samples, answers):
+        if samples is None:
+            level.append((new, res))
+        else:
+            level.append((np.concatenate((samples, new)), np.concatenate((cell_answers, res))))
+    return level
 
 
 @cython.ccall
 @cython.returns(object)
 @cython.locals(xspace=object, oracles=list, num_samples=cython.uint, num_cells=cython.uint, g=tuple,
                blocking=cython.bint, sleep=cython.double, logging=cython.bint, ps=cython.double, m=cython.uint,
-               args=tuple, cols_list=list, green=list, red=list, border=list, step=cython.uint,
+               cols_list=list, next_cell_list=list, green=list, red=list, border=list, conj=object, seed=object,
+               sampler=str, seed_seq=object, samples=object, answers=object, verdict=object, step=cython.uint,
                tempdir=cython.basestring)
 def multidim_search_BMNN22_opt_1(xspace: Rectangle,
                                  oracles: List[Oracle],
@@ -2850,32 +2965,40 @@ def multidim_search_BMNN22_opt_1(xspace: Rectangle,
                                  blocking: bool = False,
                                  sleep: float = 0.0,
                                  logging: bool = True,
-                                 ps: float = 0.95) -> ParResultSet:
-    # type: (Rectangle, list[Oracle], int, tuple[float], bool, float, bool, float) -> ParResultSet
+                                 ps: float = 0.95,
+                                 seed: int = None,
+                                 sampler: str = SAMPLER_UNIFORM) -> ParResultSet:
+    # type: (Rectangle, list[Oracle], int, tuple[float], bool, float, bool, float, int, str) -> ParResultSet
 
     green = list()
     red = list()
     border = list()
     step = 0
     d = xspace.dim()
-    p = Pool(cpu_count())
+    p = bmnn22_pool(oracles)
 
     # Create temporary directory for storing the result of each step
     tempdir = tempfile.mkdtemp()
-    cell_list = [xspace]
+    # Tuples (cell, seed of the cell, samples inherited from the parent cell, answers for the samples)
+    cell_list = [(xspace, seed_sequence(seed), None, None)]
 
+    conj = OracleConjunction.from_oracles(oracles)
+    # Level-synchronous refinement: the undecided cells of a level are evaluated together and split afterwards
     while len(cell_list) > 0:
-        args = ((cell, copy.deepcopy(oracles), num_samples, d, ps, g) for cell in cell_list)
-        cols_list = p.map(process_dyn, args)
-        cell_list = list()
-        for (cell, is_green) in cols_list:
-            if is_green is None:
+        cols_list = evaluate_level(p, conj, cell_list, num_samples, sampler)
+        next_cell_list = list()
+        for ((cell, seed_seq, _, _), (samples, answers)) in zip(cell_list, cols_list):
+            verdict = cell_verdict(cell, answers, ps, g)
+            if verdict is None:
                 n = pow(2, d)
-                cell_list = cell_list + cell.cell_partition_bin(n)
-            elif is_green:
+                for r, r_seed, (r_samples, r_answers) in zip(cell.cell_partition_bin(n), seed_seq.spawn(n),
+                                                             split_samples(cell, samples, answers)):
+                    next_cell_list.append((r, r_seed, r_samples, r_answers))
+            elif verdict:
                 green.append(cell)
             else:
                 red.append(cell)
+        cell_list = next_cell_list
 
     if logging:
         rs = ParResultSet(border, red, green, xspace)
@@ -2885,3 +3008,96 @@ def multidim_search_BMNN22_opt_1(xspace: Rectangle,
     p.close()
     p.join()
     return ParResultSet(border, red, green, xspace)
+
+
+@cython.ccall
+@cython.returns(object)
+@cython.locals(xspace=object, oracles=list, num_samples=cython.uint, g=tuple, blocking=cython.bint,
+               sleep=cython.double, logging=cython.bint, ps=cython.double, seed=object, sampler=str,
+               max_calls=object, max_time=object, conj=object, green=list, red=list, heap=list, tie=object,
+               calls=cython.ulong, start=cython.double, d=cython.ushort, n=cython.uint, step=cython.uint,
+               tempdir=cython.basestring, cell_list=list, cols_list=list, cell=object, seed_seq=object,
+               samples=object, answers=object, verdict=object, vol_green=cython.double, vol_red=cython.double,
+               vol_border=cython.double, rs=object)
+def multidim_search_BMNN22_opt_2(xspace: Rectangle,
+                                 oracles: List[Oracle],
+                                 num_samples: int,
+                                 g: Tuple[float],
+                                 blocking: bool = False,
+                                 sleep: float = 0.0,
+                                 logging: bool = True,
+                                 ps: float = 0.95,
+                                 seed: int = None,
+                                 sampler: str = SAMPLER_UNIFORM,
+                                 max_calls: int = None,
+                                 max_time: float = None) -> ParResultSet:
+    # type: (Rectangle, list[Oracle], int, tuple[float], bool, float, bool, float, int, str, int, float) -> ParResultSet
+    # See SeqSearch.multidim_search_BMNN22_opt_2. Every round splits all the cells of the heap that fit in the budget,
+    # in order of boundary_score, and evaluates their sub-cells in the pool of processes
+    conj = OracleConjunction.from_oracles(oracles)
+    green = list()
+    red = list()
+    vol_green, vol_red, vol_border = 0.0, 0.0, 0.0
+    heap = list()
+    tie = itertools.count()
+    start = time.time()
+    d = xspace.dim()
+    n = pow(2, d)
+    step = 0
+    p = bmnn22_pool(oracles)
+
+    # Create temporary directory for storing the result of each step
+    tempdir = tempfile.mkdtemp()
+
+    RootSearch.logger.info('Report\nStep, Red, Green, Border, Total, nRed, nGreen, nBorder, Calls')
+    cell_list = [(xspace, seed_sequence(seed), None, None)]
+    calls = num_samples
+    while len(cell_list) > 0:
+        cols_list = evaluate_level(p, conj, cell_list, num_samples, sampler)
+
+        for ((cell, seed_seq, _, _), (cell_samples, cell_answers)) in zip(cell_list, cols_list):
+            verdict = cell_verdict(cell, cell_answers, ps, g)
+            if verdict is None:
+                heapq.heappush(heap, (-boundary_score(cell, cell_answers), next(tie), cell, seed_seq, cell_samples,
+                                      cell_answers))
+                vol_border = vol_border + cell.volume()
+            elif verdict:
+                green.append(cell)
+                vol_green = vol_green + cell.volume()
+            else:
+                red.append(cell)
+                vol_red = vol_red + cell.volume()
+
+        RootSearch.logger.info(
+            '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}, {8}'.format(step, vol_red, vol_green, vol_border, xspace.volume(),
+                                                                 len(red), len(green), len(heap), calls))
+
+        # Visualization
+        if sleep > 0.0:
+            rs = ParResultSet([item[2] for item in heap], red, green, xspace)
+            if d == 2:
+                rs.plot_2D_light(blocking=blocking, sec=sleep, opacity=0.7)
+            elif d == 3:
+                rs.plot_3D_light(blocking=blocking, sec=sleep, opacity=0.7)
+
+        cell_list = list()
+        if max_time is not None and time.time() - start >= max_time:
+            break
+        # The calls of the cells split in this round are reserved before evaluating them
+        while len(heap) > 0 and (max_calls is None or calls + n * num_samples - len(heap[0][4]) <= max_calls):
+            _, _, cell, seed_seq, samples, answers = heapq.heappop(heap)
+            vol_border = vol_border - cell.volume()
+            calls = calls + n * num_samples - len(samples)
+            for r, r_seed, (r_samples, r_answers) in zip(cell.cell_partition_bin(n), seed_seq.spawn(n),
+                                                         split_samples(cell, samples, answers)):
+                cell_list.append((r, r_seed, r_samples, r_answers))
+        step = step + 1
+
+    rs = ParResultSet([item[2] for item in heap], red, green, xspace)
+    if logging:
+        name = os.path.join(tempdir, str(step))
+        rs.to_file(name)
+
+    p.close()
+    p.join()
+    return rs
@@ -23,25 +23,152 @@ The ResultSet class provides functions for:
 import os
 import sys
 import pickle
-from itertools import chain, combinations  # combinations_with_replacement
+from itertools import combinations  # combinations_with_replacement
 import zipfile
 import tempfile
 import cython
+import numpy as np
 # import shutil
 
-from scipy.spatial.distance import directed_hausdorff as dhf
+from scipy.spatial import cKDTree
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.figure import Figure
 
-from ParetoLib.Oracle.NDTree import NDTree
+from ParetoLib.Oracle.ParetoArchive import pareto_archive
 from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Geometry.Indicators import as_front, nondominated, hypervolume, igd, igd_plus, epsilon_indicator, \
+    hausdorff, PAIRS_CHUNK
 # import ParetoLib.Search as RootSearch
 import ParetoLib.Search
 
 RootSearch = ParetoLib.Search
 
 
+# Array versions of the vertex and membership functions of lists of rectangles
+@cython.locals(rects=list, d=cython.ushort)
+@cython.returns(tuple)
+def corner_arrays(rects, d):
+    # type: (list, int) -> tuple
+    """
+    Minimal and maximal corners of a list of rectangles, as two arrays
+    of shape (n, d).
+    """
+    return as_front((rect.min_corner for rect in rects), d), as_front((rect.max_corner for rect in rects), d)
+
+
+@cython.locals(mins=object, maxs=object, d=cython.ushort, bits=object, verts=object)
+@cython.returns(object)
+def vertex_array(mins, maxs):
+    # type: (np.ndarray, np.ndarray) -> np.ndarray
+    """
+    Vertices of the rectangles [mins[i], maxs[i]], without repetitions.
+    The 2^d vertices of every rectangle are generated by broadcasting.
+
+    Returns:
+        np.ndarray: Vertices with shape (m, d).
+    """
+    d = mins.shape[1]
+    # Row k of bits selects the coordinates of the k-th vertex that are shifted to the maximal corner.
+    # As in Rectangle.vertices(), vertices are computed as min_corner + delta
+    bits = (np.arange(2 ** d)[:, None] >> np.arange(d - 1, -1, -1)) & 1
+    verts = mins[:, None, :] + bits[None, :, :] * (maxs - mins)[:, None, :]
+    return np.unique(verts.reshape((-1, d)), axis=0)
+
+
+@cython.locals(mins=object, maxs=object, n=cython.ulong, rng=object, vol=object, index=object)
+@cython.returns(object)
+def uniform_points(mins, maxs, n, rng=None):
+    # type: (np.ndarray, np.ndarray, int, np.random.Generator) -> np.ndarray
+    """
+    n points drawn uniformly from the union of the rectangles
+    [mins[i], maxs[i]]. Every point falls in a rectangle chosen with
+    probability proportional to its volume (or uniformly, if every
+    rectangle is degenerate), so overlapping regions are oversampled.
+
+    Args:
+        mins (np.ndarray): Minimal corners with shape (m, d).
+        maxs (np.ndarray): Maximal corners with shape (m, d).
+        n (int): Number of points.
+        rng (np.random.Generator): Random generator, or a seed for
+                                   np.random.default_rng.
+
+    Returns:
+        np.ndarray: Points with shape (n, d).
+    """
+    rng = np.random.default_rng(rng)
+    if len(mins) == 0:
+        return np.empty((0, mins.shape[1]))
+    vol = np.prod(maxs - mins, axis=1)
+    index = rng.choice(len(mins), size=n, p=vol / np.sum(vol) if np.sum(vol) > 0 else None)
+    return rng.uniform(mins[index], maxs[index])
+
+
+@cython.locals(mins=object, maxs=object, m=cython.ulong, steps=object)
+@cython.returns(object)
+def diagonal_points(mins, maxs, m):
+    # type: (np.ndarray, np.ndarray, int) -> np.ndarray
+    """
+    m points along the diagonal of every rectangle [mins[i], maxs[i]],
+    excluding the corners (see Rectangle.get_points).
+
+    Returns:
+        np.ndarray: Points with shape (len(mins) * m, d), grouped by
+                    rectangle.
+    """
+    steps = (maxs - mins) / float(m + 1)
+    return (mins[:, None, :] + steps[:, None, :] + steps[:, None, :] * np.arange(m)[None, :, None]).reshape(
+        (-1, mins.shape[1]))
+
+
+@cython.locals(points=object, mins=object, maxs=object, res=object, chunk=cython.ulong, start=cython.ulong,
+               block=object)
+@cython.returns(object)
+def inside_any(points, mins, maxs):
+    # type: (np.ndarray, np.ndarray, np.ndarray) -> np.ndarray
+    """
+    Boolean mask of the points that are inside (or along the border of)
+    some rectangle [mins[i], maxs[i]]. Equivalent to
+    [any(rect.inside(p) for rect in rects) for p in points].
+    """
+    res = np.zeros(len(points), dtype=bool)
+    if len(mins) == 0:
+        return res
+    chunk = max(1, PAIRS_CHUNK // len(mins))
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk, None, :]
+        res[start:start + chunk] = np.any(np.all((block >= mins[None, :, :]) & (block <= maxs[None, :, :]), axis=2),
+                                          axis=1)
+    return res
+
+
+@cython.locals(current=object, others=object, tree=object, dist=object, index=object, i=cython.ulong, near=object)
+@cython.returns(tuple)
+def directed_hausdorff_champion(current, others):
+    # type: (np.ndarray, np.ndarray) -> tuple
+    """
+    Point of current that is the farthest from its nearest neighbour in
+    others (i.e., the directed Hausdorff distance), together with that
+    neighbour. Nearest neighbours are answered by a cKDTree of others in
+    a single batched query.
+
+    Returns:
+        tuple: (distance, point of current, point of others), or
+               (0, None, None) if current or others is empty.
+    """
+    if len(current) == 0 or len(others) == 0:
+        return 0, None, None
+    tree = cKDTree(others)
+    dist, index = tree.query(current)
+    i = int(np.argmax(dist))
+    # Ties between nearest neighbours are broken by the largest one in lexicographic order, so the result does not
+    # depend on the order of the points
+    near = others[tree.query_ball_point(current[i], dist[i] * (1.0 + 1e-9))]
+    near = near[np.isclose(np.linalg.norm(near - current[i], axis=1), dist[i])]
+    near = near[np.lexsort(near.T[::-1])[-1]]
+    return float(dist[i]), tuple(float(x) for x in current[i]), tuple(float(x) for x in near)
+
+
 # @cython.cclass
 class ResultSet(object):
     cython.declare(xspace=object, border=list, ylow=list, yup=list, filename_yup=str, filename_ylow=str,
@@ -72,8 +199,8 @@ class ResultSet(object):
         self.filename_border = 'border'
         self.filename_space = 'space'
 
-        self.ylow_pareto = NDTree()
-        self.yup_pareto = NDTree()
+        self.ylow_pareto = pareto_archive(xspace.dim())
+        self.yup_pareto = pareto_archive(xspace.dim())
 
     def __setattr__(self, name, value):
         # type: (ResultSet, str, None) -> None
@@ -109,11 +236,13 @@ class ResultSet(object):
         # It is used for a lazy computation of volume when requested by the user,
         # and therefore avoiding unecessary computations
 
+        # The Pareto archive is specialised for the dimension of the space (see ParetoArchive)
         if name in [str_xspace, str_border, str_ylow, str_yup]:
+            d = value.dim() if name == str_xspace else self.xspace.dim()
             # self.__dict__[str_ylow_pareto] = NDTree()
             # self.__dict__[str_yup_pareto] = NDTree()
-            object.__setattr__(self, str_ylow_pareto, NDTree())
-            object.__setattr__(self, str_yup_pareto, NDTree())
+            object.__setattr__(self, str_ylow_pareto, pareto_archive(d))
+            object.__setattr__(self, str_yup_pareto, pareto_archive(d))
 
         # self.__dict__[name] = None
         object.__setattr__(self, name, value)
@@ -156,41 +285,47 @@ class ResultSet(object):
         return hash((tuple(self.border), tuple(self.ylow), tuple(self.yup), hash(self.xspace)))
 
     # Vertex functions
-    @cython.locals(vertices=set)
+    # The vertices of a closure are generated from the stacked corners of its rectangles (see vertex_array).
+    # vertex_array_* return an array of shape (n, d) without repetitions, and vertices_* a set of tuples
+    @cython.returns(object)
+    def vertex_array_yup(self):
+        # type: (ResultSet) -> np.ndarray
+        return vertex_array(*corner_arrays(self.yup, self.xspace.dim()))
+
+    @cython.returns(object)
+    def vertex_array_ylow(self):
+        # type: (ResultSet) -> np.ndarray
+        return vertex_array(*corner_arrays(self.ylow, self.xspace.dim()))
+
+    @cython.returns(object)
+    def vertex_array_border(self):
+        # type: (ResultSet) -> np.ndarray
+        return vertex_array(*corner_arrays(self.border, self.xspace.dim()))
+
+    @cython.returns(object)
+    def vertex_array(self):
+        # type: (ResultSet) -> np.ndarray
+        return vertex_array(*corner_arrays(self.yup + self.ylow + self.border, self.xspace.dim()))
+
     @cython.returns(set)
     def vertices_yup(self):
         # type: (ResultSet) -> set
-        vertices_list = (rect.vertices() for rect in self.yup)
-        vertices = set()
-        vertices = vertices.union(*vertices_list)
-        return vertices
+        return set(map(tuple, self.vertex_array_yup().tolist()))
 
-    @cython.locals(vertices=set)
     @cython.returns(set)
     def vertices_ylow(self):
         # type: (ResultSet) -> set
-        vertices_list = (rect.vertices() for rect in self.ylow)
-        vertices = set()
-        vertices = vertices.union(*vertices_list)
-        return vertices
+        return set(map(tuple, self.vertex_array_ylow().tolist()))
 
-    @cython.locals(vertices=set)
     @cython.returns(set)
     def vertices_border(self):
         # type: (ResultSet) -> set
-        vertices_list = (rect.vertices() for rect in self.border)
-        vertices = set()
-        vertices = vertices.union(*vertices_list)
-        return vertices
+        return set(map(tuple, self.vertex_array_border().tolist()))
 
-    @cython.locals(vertices=set)
     @cython.returns(set)
     def vertices(self):
         # type: (ResultSet) -> set
-        vertices = self.vertices_yup()
-        vertices = vertices.union(self.vertices_ylow())
-        vertices = vertices.union(self.vertices_border())
-        return vertices
+        return set(map(tuple, self.vertex_array().tolist()))
 
     # Simplification functions
     # After running simplify(), the number of cubes in the boundary and in each closure should decrease.
@@ -421,21 +556,13 @@ class ResultSet(object):
         # type: (ResultSet) -> list
         return [r.min_corner for r in self.yup]
 
-    @cython.locals(n=cython.long, m=cython.long, merged=list)
+    @cython.locals(n=cython.long, m=cython.long)
     @cython.returns(list)
     def _get_n_points_yup(self, n):
         # type: (ResultSet, int) -> list
         m = int(n / len(self.yup))
         m = 1 if m < 1 else m
-        # point_list = [rect.get_points(m) for rect in self.yup]
-        point_list = (rect.get_points(m) for rect in self.yup)
-        # Flatten list
-        # Before
-        # point_list = [ [] , [], ..., [] ]
-        # After
-        # point_list = [ ... ]
-        merged = list(chain.from_iterable(point_list))
-        return merged
+        return list(map(tuple, diagonal_points(*corner_arrays(self.yup, self.xspace.dim()), m).tolist()))
 
     # @cython.ccall
     @cython.locals(n=cython.long)
@@ -452,16 +579,13 @@ class ResultSet(object):
     def _get_points_ylow(self):
         return [r.max_corner for r in self.ylow]
 
-    @cython.locals(n=cython.long, m=cython.long, merged=list)
+    @cython.locals(n=cython.long, m=cython.long)
     @cython.returns(list)
     def _get_n_points_ylow(self, n):
         # type: (ResultSet, int) -> list
         m = int(n / len(self.ylow))
         m = 1 if m < 1 else m
-        # point_list = [rect.get_points(m) for rect in self.ylow]
-        point_list = (rect.get_points(m) for rect in self.ylow)
-        merged = list(chain.from_iterable(point_list))
-        return merged
+        return list(map(tuple, diagonal_points(*corner_arrays(self.ylow, self.xspace.dim()), m).tolist()))
 
     # @cython.ccall
     @cython.locals(n=cython.long)
@@ -478,16 +602,13 @@ class ResultSet(object):
     def _get_points_border(self):
         return self.get_points_pareto()
 
-    @cython.locals(n=cython.long, m=cython.long, merged=list)
+    @cython.locals(n=cython.long, m=cython.long)
     @cython.returns(list)
     def _get_n_points_border(self, n):
         # type: (ResultSet, int) -> list
         m = int(n / len(self.border))
         m = 1 if m < 1 else m
-        # point_list = [rect.get_points(m) for rect in self.border]
-        point_list = (rect.get_points(m) for rect in self.border)
-        merged = list(chain.from_iterable(point_list))
-        return merged
+        return list(map(tuple, diagonal_points(*corner_arrays(self.border, self.xspace.dim()), m).tolist()))
 
     # @cython.ccall
     @cython.locals(n=cython.long)
@@ -496,6 +617,25 @@ class ResultSet(object):
         # type: (ResultSet, int) -> list
         return self.xspace.get_points(n)
 
+    # Uniform sampling of the closures (see uniform_points)
+    @cython.locals(n=cython.ulong)
+    @cython.returns(object)
+    def sample_yup(self, n, rng=None):
+        # type: (ResultSet, int, np.random.Generator) -> np.ndarray
+        return uniform_points(*corner_arrays(self.yup, self.xspace.dim()), n, rng)
+
+    @cython.locals(n=cython.ulong)
+    @cython.returns(object)
+    def sample_ylow(self, n, rng=None):
+        # type: (ResultSet, int, np.random.Generator) -> np.ndarray
+        return uniform_points(*corner_arrays(self.ylow, self.xspace.dim()), n, rng)
+
+    @cython.locals(n=cython.ulong)
+    @cython.returns(object)
+    def sample_border(self, n, rng=None):
+        # type: (ResultSet, int, np.random.Generator) -> np.ndarray
+        return uniform_points(*corner_arrays(self.border, self.xspace.dim()), n, rng)
+
     # @cython.ccall
     @cython.returns(cython.void)
     def set_points_pareto(self, l):
@@ -508,8 +648,7 @@ class ResultSet(object):
     def get_points_pareto_yup(self):
         # type: (ResultSet) -> set
         if self.yup_pareto.is_empty():
-            for p in (r.min_corner for r in self.yup):
-                self.yup_pareto.update_point(p)
+            self.yup_pareto.update_points([r.min_corner for r in self.yup])
 
         return self.yup_pareto.get_points()
 
@@ -517,8 +656,7 @@ class ResultSet(object):
     def get_points_pareto_ylow(self):
         # type: (ResultSet) -> set
         if self.ylow_pareto.is_empty():
-            for p in (r.max_corner for r in self.ylow):
-                self.ylow_pareto.update_point(p)
+            self.ylow_pareto.update_points([r.max_corner for r in self.ylow])
 
         return self.ylow_pareto.get_points()
 
@@ -662,6 +800,46 @@ class ResultSet(object):
         self.scale_ylow(f)
         self.scale_border(f)
 
+    @staticmethod
+    @cython.locals(rects=list, a=object, b=object, mins=object, maxs=object)
+    @cython.returns(list)
+    def _scale_affine_rect_list(rects, a, b):
+        # type: (list, np.ndarray, np.ndarray) -> list
+        if len(rects) == 0:
+            return list()
+        mins, maxs = corner_arrays(rects, len(a))
+        mins, maxs = a * mins + b, a * maxs + b
+        # Negative factors swap the corners
+        mins, maxs = np.minimum(mins, maxs), np.maximum(mins, maxs)
+        return [Rectangle(tuple(low), tuple(high)) for low, high in zip(mins.tolist(), maxs.tolist())]
+
+    @cython.locals(a=object, b=object)
+    @cython.returns(cython.void)
+    def scale_affine(self, a=1.0, b=0.0):
+        # type: (ResultSet, iter, iter) -> None
+        """
+        Scales all the rectangles in the current result set according to
+        the affine function f(x) = a*x + b, which is applied to the
+        stacked corners of every closure at once. Equivalent to
+        scale(lambda p: tuple(ai * pi + bi for ai, pi, bi in zip(a, p, b))).
+
+        Args:
+            self (ResultSet): The ResultSet,
+            a (iter): Factor, either a number or one number per dimension.
+            b (iter): Offset, either a number or one number per dimension.
+
+        Example:
+        >>> rs.scale_affine((0.5, -1.0), 0.0)
+        >>> rs.xspace
+        >>> [(0.0,-1.0), (0.5,0.0)]
+        """
+        a = np.broadcast_to(np.asarray(a, dtype=float), (self.xspace.dim(),))
+        b = np.broadcast_to(np.asarray(b, dtype=float), (self.xspace.dim(),))
+        self.xspace = ResultSet._scale_affine_rect_list([self.xspace], a, b)[0]
+        self.yup = ResultSet._scale_affine_rect_list(self.yup, a, b)
+        self.ylow = ResultSet._scale_affine_rect_list(self.ylow, a, b)
+        self.border = ResultSet._scale_affine_rect_list(self.border, a, b)
+
     # MatPlot Graphics
     # @cython.ccall
     @cython.locals(xaxe=cython.ushort, yaxe=cython.ushort, opacity=cython.double, patch=list)
@@ -1523,37 +1701,128 @@ class ResultSet(object):
         except OSError:
             RootSearch.logger.error('Unexpected error when removing folder {0}: {1}'.format(tempdir, sys.exc_info()[0]))
 
-    @cython.locals(rs_list=list, yup_verts=set, yup_other=set)
+    # Quality indicators (see ParetoLib.Geometry.Indicators)
+    # The front of a ResultSet is given by the minimal corners of the rectangles of the upper closure
+    @cython.returns(object)
+    def front_yup(self):
+        # type: (ResultSet) -> np.ndarray
+        return nondominated(as_front((rect.min_corner for rect in self.yup), self.xspace.dim()))
+
+    @cython.returns(object)
+    def corners_border(self):
+        # type: (ResultSet) -> np.ndarray
+        return as_front([rect.min_corner for rect in self.border] + [rect.max_corner for rect in self.border],
+                        self.xspace.dim())
+
+    @cython.locals(ref=tuple)
+    @cython.returns(cython.double)
+    def hypervolume(self, ref=None):
+        # type: (ResultSet, tuple) -> float
+        """
+        Hypervolume of the front of the upper closure with respect to ref
+        (by default, the maximal corner of xspace). For the default ref,
+        it is the volume of the upper closure once simplified.
+        """
+        return hypervolume(self.front_yup(), self.xspace.max_corner if ref is None else ref)
+
+    @cython.returns(cython.double)
+    def igd(self, other):
+        # type: (ResultSet, ResultSet) -> float
+        """
+        IGD of the front of self with respect to the front of other.
+        """
+        return igd(self.front_yup(), other.front_yup())
+
+    @cython.returns(cython.double)
+    def igd_plus(self, other):
+        # type: (ResultSet, ResultSet) -> float
+        """
+        IGD+ of the front of self with respect to the front of other.
+        """
+        return igd_plus(self.front_yup(), other.front_yup())
+
+    @cython.returns(cython.double)
+    def epsilon_indicator(self, other):
+        # type: (ResultSet, ResultSet) -> float
+        """
+        Additive epsilon indicator of the front of self with respect to
+        the front of other.
+        """
+        return epsilon_indicator(self.front_yup(), other.front_yup())
+
+    @cython.locals(a=object, b=object)
+    @cython.returns(cython.double)
+    def hausdorff_distance(self, other):
+        # type: (ResultSet, ResultSet) -> float
+        """
+        Hausdorff distance between the corners of the borders of self
+        and other. The fronts of the upper closures are compared instead
+        when some border is empty (e.g., after simplify() in BMNN22).
+        """
+        a, b = self.corners_border(), other.corners_border()
+        if len(a) == 0 or len(b) == 0:
+            a, b = self.front_yup(), other.front_yup()
+        return hausdorff(a, b)
+
+    @cython.returns(tuple)
+    def corners_yup(self):
+        # type: (ResultSet) -> tuple
+        return corner_arrays(self.yup, self.xspace.dim())
+
+    @cython.locals(rs_list=list)
     @cython.returns(tuple)
     def select_champion(self, rs_list):
         # type: (ResultSet, list[ResultSet]) -> tuple
-        current_class = self.vertices_yup()
-        other_classes = set()
-        other_classes_generator = (rs.vertices_yup() for rs in rs_list if rs != self)
-        other_classes = other_classes.union(*other_classes_generator)
-
-        # Adapt data type to directed_hausdorff format. Besides, lists allow indexing.
-        # current_class_list = list(current_class)
-        # other_classes_list = list(other_classes - current_class)
-        # Remove points in other classes that also belong to current class
-        other_classes_list = [point for point in other_classes if not self.member_yup(point)]
-        # Remove points in current class that also belong to other classes
-        current_class_list = [point for point in current_class for other_class in rs_list if
-                              not other_class.member_yup(point)]
+        """
+        Vertex of the upper closure of self that is the farthest from the
+        upper closures of the other ResultSets in rs_list (directed
+        Hausdorff distance), together with its closest vertex in them.
 
-        # Removing current_class vertices from other_classes may raise errors when current_class
-        # is strictly included inside other_classes
-        if len(current_class_list) == 0 or len(other_classes_list) == 0:
-            return 0, None, None
+        Vertices of self that belong to the upper closure of every
+        ResultSet in rs_list, and vertices of the others that belong to
+        the upper closure of self, are discarded.
 
-        # Checked: directed_haussdorf(self, rs_list)
-        distance, current_index, index_other_classes = dhf(current_class_list, other_classes_list)
+        Returns:
+            tuple: (distance, vertex of self, vertex of the others), or
+                   (0, None, None) if no vertex is left.
+        """
+        return _select_champions([self] + list(rs_list), [0], 1)[0]
 
-        return distance, current_class_list[current_index], other_classes_list[index_other_classes]
+@cython.locals(runs=list, candidates=list, first=cython.ulong, corners_list=list, verts_list=list, verts=object,
+               owner=object, inside=object, res=list, i=cython.ulong, current=object, outside=object, others=object)
+@cython.returns(list)
+def _select_champions(runs, candidates, first):
+    # type: (list[ResultSet], list[int], int) -> list
+    # runs[i].select_champion(runs[first:]) for every index i in candidates.
+    # The vertices of all the runs are stacked in a single array, and their membership to the upper closure of every
+    # run is computed once
+    corners_list = [rs.corners_yup() for rs in runs]
+    verts_list = [vertex_array(*corners) for corners in corners_list]
+    verts = np.concatenate(verts_list)
+    owner = np.repeat(np.arange(len(runs)), [len(v) for v in verts_list])
+    # inside[v, j] is True if vertex v belongs to the upper closure of runs[j]
+    inside = np.stack([inside_any(verts, *corners) for corners in corners_list], axis=1)
+
+    res = list()
+    for i in candidates:
+        # Vertices of runs[i] that are outside the upper closure of some run of runs[first:]
+        current = verts[owner == i]
+        outside = ~np.all(inside[owner == i, first:], axis=1)
+        # Vertices of the other runs of runs[first:] that are outside the upper closure of runs[i]
+        others = np.array([j >= first and rs != runs[i] for j, rs in enumerate(runs)], dtype=bool)
+        others = others[owner] & ~inside[:, i]
+        res.append(directed_hausdorff_champion(current[outside], verts[others]))
+    return res
 
 
 @cython.locals(rs_list=list)
 @cython.returns(list)
 def champions_selection(rs_list):
     # type: (list[ResultSet]) -> list(tuple)
-    return [rs.select_champion(rs_list) for rs in rs_list]
+    """
+    rs.select_champion(rs_list) for every rs in rs_list. The vertices of
+    the upper closures are computed and classified once for all the runs.
+    """
+    if len(rs_list) == 0:
+        return list()
+    return _select_champions(rs_list, list(range(len(rs_list))), 0)
@@ -38,6 +38,18 @@ be minimized.
 multithreading capabilities of the computer.
 - logging: boolean that specifies if the algorithm must print traces for
 debugging options.
+- surrogate: boolean that specifies if the binary searches must be narrowed by a
+cheap classifier fitted on the answers of the oracle (sequential search only).
+It reduces the number of calls to expensive oracles (e.g., OracleSTL or OracleMatlab).
+- sampler: in the BMNN22 searches, the method that draws the samples of every cell
+(i.e., 'uniform', 'lhs', 'sobol' or 'halton'; see ParetoLib.Search.CommonSearch.SAMPLERS).
+- max_calls, max_time: in the BMNN22 searches with opt_level=2, the budget of oracle calls
+(i.e., evaluated samples) and seconds. Cells with a mixed verdict are refined in order of
+priority until the budget is exhausted, and the ones left are returned in the border.
+- monotonicity: in the BMNN22 searches with opt_level=0, a tuple with the monotonicity of
+the oracles along every dimension (MONO_INCREASING, MONO_DECREASING or MONO_UNKNOWN in
+ParetoLib.Search.CommonSearch). The samples of a cell are moved to its most favourable face
+along the monotone dimensions, so a single sample settles the cell when every dimension is monotone.
 
 
 As a result, the function returns an object of the class ResultSet with the distribution
@@ -45,7 +57,6 @@ of the space X in three subspaces: a lower closure, an upper closure and a borde
  contains the Pareto front.
 """
 import time
-from math import ceil, log
 from typing import List, Tuple
 import cython
 
@@ -58,7 +69,7 @@ import ParetoLib.Search
 
 RootSearch = ParetoLib.Search
 
-from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, ALPHA, P0, NUMCELLS
+from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, ALPHA, P0, NUMCELLS, SAMPLER_UNIFORM, num_samples_bound
 from ParetoLib.Search.ResultSet import ResultSet
 from ParetoLib.Oracle.Oracle import Oracle
 
@@ -124,7 +135,7 @@ def create_ND_space(args):
                max_cornery=cython.double, epsilon=cython.double, delta=cython.double, max_step=cython.ulonglong,
                blocking=cython.bint,
                sleep=cython.double, opt_level=cython.uint, parallel=cython.bint, logging=cython.bint,
-               simplify=cython.bint, xspace=object, rs=object)
+               simplify=cython.bint, surrogate=cython.bint, xspace=object, rs=object)
 def Search2D(ora,
              min_cornerx=0.0,
              min_cornery=0.0,
@@ -138,15 +149,18 @@ def Search2D(ora,
              opt_level=2,
              parallel=False,
              logging=True,
-             simplify=True):
-    # type: (Oracle, float, float, float, float, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+             simplify=True,
+             surrogate=False):
+    # type: (Oracle, float, float, float, float, float, float, int, bool, float, int, bool, bool, bool, bool) -> ResultSet
     xyspace = create_2D_space(min_cornerx, min_cornery, max_cornerx, max_cornery)
     if parallel:
+        if surrogate:
+            RootSearch.logger.warning('The surrogate is only available in the sequential search')
         rs = ParSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
                                        blocking, sleep, opt_level, logging)
     else:
         rs = SeqSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
-                                       blocking, sleep, opt_level, logging)
+                                       blocking, sleep, opt_level, logging, surrogate)
     # Explicitly print a set of n points in the Pareto boundary for emphasizing the front
     # n = int((max_cornerx - min_cornerx) / 0.1)
     # points = rs.get_points_border(n)
@@ -170,8 +184,8 @@ def Search2D(ora,
 @cython.locals(ora=object, min_cornerx=cython.double, min_cornery=cython.double, min_cornerz=cython.double,
                max_cornerx=cython.double, max_cornery=cython.double, max_cornerz=cython.double, epsilon=cython.double,
                delta=cython.double, max_step=cython.ulonglong, blocking=cython.bint, sleep=cython.double,
-               opt_level=cython.uint, parallel=cython.bint, logging=cython.bint, simplify=cython.bint, xspace=object,
-               rs=object)
+               opt_level=cython.uint, parallel=cython.bint, logging=cython.bint, simplify=cython.bint,
+               surrogate=cython.bint, xspace=object, rs=object)
 def Search3D(ora,
              min_cornerx=0.0,
              min_cornery=0.0,
@@ -187,16 +201,19 @@ def Search3D(ora,
              opt_level=2,
              parallel=False,
              logging=True,
-             simplify=True):
-    # type: (Oracle, float, float, float, float, float, float, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+             simplify=True,
+             surrogate=False):
+    # type: (Oracle, float, float, float, float, float, float, float, float, int, bool, float, int, bool, bool, bool, bool) -> ResultSet
     xyspace = create_3D_space(min_cornerx, min_cornery, min_cornerz, max_cornerx, max_cornery, max_cornerz)
 
     if parallel:
+        if surrogate:
+            RootSearch.logger.warning('The surrogate is only available in the sequential search')
         rs = ParSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
                                        blocking, sleep, opt_level, logging)
     else:
         rs = SeqSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
-                                       blocking, sleep, opt_level, logging)
+                                       blocking, sleep, opt_level, logging, surrogate)
     # Explicitly print a set of n points in the Pareto boundary for emphasizing the front
     # n = int((max_cornerx - min_cornerx) / 0.1)
     # points = rs.get_points_border(n)
@@ -221,7 +238,7 @@ def Search3D(ora,
 @cython.locals(ora=object, min_corner=cython.double, max_corner=cython.double, epsilon=cython.double,
                delta=cython.double, max_step=cython.ulonglong, blocking=cython.bint, sleep=cython.double,
                opt_level=cython.uint, parallel=cython.bint, logging=cython.bint,
-               simplify=cython.bint, xspace=object, rs=object)
+               simplify=cython.bint, surrogate=cython.bint, xspace=object, rs=object)
 def SearchND(ora,
              min_corner=0.0,
              max_corner=1.0,
@@ -233,8 +250,9 @@ def SearchND(ora,
              opt_level=2,
              parallel=False,
              logging=True,
-             simplify=True):
-    # type: (Oracle, float, float, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+             simplify=True,
+             surrogate=False):
+    # type: (Oracle, float, float, float, float, int, bool, float, int, bool, bool, bool, bool) -> ResultSet
     d = ora.dim()
 
     minc = (min_corner,) * d
@@ -242,11 +260,13 @@ def SearchND(ora,
     xyspace = Rectangle(minc, maxc)
 
     if parallel:
+        if surrogate:
+            RootSearch.logger.warning('The surrogate is only available in the sequential search')
         rs = ParSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
                                        blocking, sleep, opt_level, logging)
     else:
         rs = SeqSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
-                                       blocking, sleep, opt_level, logging)
+                                       blocking, sleep, opt_level, logging, surrogate)
     if simplify:
         rs.simplify()
         rs.fusion()
@@ -258,7 +278,7 @@ def SearchND(ora,
 @cython.locals(ora=object, list_intervals=list,
                epsilon=cython.double, delta=cython.double, max_step=cython.ulonglong, blocking=cython.bint,
                sleep=cython.double, opt_level=cython.uint, parallel=cython.bint, logging=cython.bint,
-               simplify=cython.bint, xspace=object, rs=object)
+               simplify=cython.bint, surrogate=cython.bint, xspace=object, rs=object)
 def SearchND_2(ora,
                list_intervals,
                epsilon=EPS,
@@ -269,18 +289,21 @@ def SearchND_2(ora,
                opt_level=2,
                parallel=False,
                logging=True,
-               simplify=True):
-    # type: (Oracle, list, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+               simplify=True,
+               surrogate=False):
+    # type: (Oracle, list, float, float, int, bool, float, int, bool, bool, bool, bool) -> ResultSet
 
     # list_intervals = [(minx, maxx), (miny, maxy),..., (minz, maxz)]
     xyspace = create_ND_space(list_intervals)
 
     if parallel:
+        if surrogate:
+            RootSearch.logger.warning('The surrogate is only available in the sequential search')
         rs = ParSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
                                        blocking, sleep, opt_level, logging)
     else:
         rs = SeqSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
-                                       blocking, sleep, opt_level, logging)
+                                       blocking, sleep, opt_level, logging, surrogate)
     if simplify:
         rs.simplify()
         rs.fusion()
@@ -448,6 +471,7 @@ def SearchIntersectionND_2(ora1, ora2,
 @cython.returns(object)
 @cython.locals(oralist=list, list_intervals=list, blocking=cython.bint, sleep=cython.double,
                parallel=cython.bint, logging=cython.bint, simplify=cython.bint, dyn_cell_creation=cython.bint,
+               seed=object, sampler=str, max_calls=object, max_time=object, monotonicity=tuple,
                mining_result=object)
 def Search_BMNN22(ora_list: List[Oracle],
                   intervals: List,
@@ -457,19 +481,29 @@ def Search_BMNN22(ora_list: List[Oracle],
                   parallel=bool,
                   logging=True,
                   simplify=True,
-                  dyn_cell_creation=False):
+                  dyn_cell_creation=False,
+                  seed=None,
+                  sampler=SAMPLER_UNIFORM,
+                  max_calls=None,
+                  max_time=None,
+                  monotonicity=None):
     assert (len(ora_list) > 0, "Oracle list can't be empty")
     assert (all(orac.dim() == ora_list[0].dim() for orac in ora_list), "Every oracle in list must have the same diemension")
 
     if ora_list[0].dim() == 2:
         rs = Search2D_BMNN22(ora_list, intervals[0][0], intervals[0][1],
-                             intervals[1][0], intervals[1][1], blocking, sleep, opt_level, parallel, logging, simplify)
+                             intervals[1][0], intervals[1][1], blocking=blocking, sleep=sleep, opt_level=opt_level,
+                             parallel=parallel, logging=logging, simplify=simplify, seed=seed, sampler=sampler,
+                             max_calls=max_calls, max_time=max_time, monotonicity=monotonicity)
     elif ora_list[0].dim() == 3:
         rs = Search3D_BMNN22(ora_list, intervals[0][0], intervals[0][1], intervals[0][2],
-                             intervals[1][0], intervals[1][1], intervals[1][2], blocking, sleep, opt_level, parallel,
-                             logging, simplify)
+                             intervals[1][0], intervals[1][1], intervals[1][2], blocking=blocking, sleep=sleep,
+                             opt_level=opt_level, parallel=parallel, logging=logging, simplify=simplify, seed=seed,
+                             sampler=sampler, max_calls=max_calls, max_time=max_time, monotonicity=monotonicity)
     elif ora_list[0].dim() > 3:
-        rs = SearchND_BMNN22(ora_list, intervals, blocking, sleep, opt_level, parallel, logging, simplify)
+        rs = SearchND_2_BMNN22(ora_list, list(zip(intervals[0], intervals[1])), blocking=blocking, sleep=sleep,
+                               opt_level=opt_level, parallel=parallel, logging=logging, simplify=simplify, seed=seed,
+                               sampler=sampler, max_calls=max_calls, max_time=max_time, monotonicity=monotonicity)
     return rs
 
 
@@ -478,7 +512,8 @@ def Search_BMNN22(ora_list: List[Oracle],
 @cython.locals(ora_list=list, min_cornerx=cython.double, min_cornery=cython.double, max_cornerx=cython.double,
                max_cornery=cython.double, p0=cython.double, alpha=cython.double, num_cells=cython.int,
                blocking=cython.bint, sleep=cython.double, opt_level=cython.int, parallel=cython.bint,
-               logging=cython.bint, simplify=cython.bint, rs=object)
+               logging=cython.bint, simplify=cython.bint, seed=object, sampler=str, max_calls=object,
+               max_time=object, monotonicity=tuple, rs=object)
 def Search2D_BMNN22(ora_list,
                     min_cornerx=0.0,
                     min_cornery=0.0,
@@ -492,19 +527,25 @@ def Search2D_BMNN22(ora_list,
                     opt_level=0,
                     parallel=False,
                     logging=True,
-                    simplify=True):
-    # type: (list[Oracle], float, float, float, float, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+                    simplify=True,
+                    seed=None,
+                    sampler=SAMPLER_UNIFORM,
+                    max_calls=None,
+                    max_time=None,
+                    monotonicity=None):
+    # type: (list[Oracle], float, float, float, float, float, float, int, bool, float, int, bool, bool, bool, int, str, int, float, tuple) -> ResultSet
     assert (len(ora_list) > 0, "Oracle list can't be empty")
     assert (all(orac.dim() == 2 for orac in ora_list), "Oracles in list must have dimension 2")
 
     xyspace = create_2D_space(min_cornerx, min_cornery, max_cornerx, max_cornery)
-    num_samples = ceil(log(alpha, 1.0 - p0))
+    num_samples = num_samples_bound(p0, alpha, sampler)
 
-    # if parallel:
-    # rs = ParSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells)
-    if not parallel:
+    if parallel:
+        rs = ParSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
+    else:
         rs = SeqSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
-                                              logging)
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
 
     if simplify:
         rs.simplify()
@@ -520,7 +561,8 @@ def Search2D_BMNN22(ora_list,
                min_cornerz=cython.double, max_cornerx=cython.double, max_cornery=cython.double,
                max_cornerz=cython.double, p0=cython.double, alpha=cython.double, num_cells=cython.int,
                blocking=cython.bint, sleep=cython.double, opt_level=cython.int, parallel=cython.bint,
-               logging=cython.bint, simplify=cython.bint, rs=object)
+               logging=cython.bint, simplify=cython.bint, seed=object, sampler=str, max_calls=object,
+               max_time=object, monotonicity=tuple, rs=object)
 def Search3D_BMNN22(ora_list,
                     min_cornerx=0.0,
                     min_cornery=0.0,
@@ -536,20 +578,25 @@ def Search3D_BMNN22(ora_list,
                     opt_level=0,
                     parallel=False,
                     logging=True,
-                    simplify=True):
-    # type: (list[Oracle], float, float, float, float, float, float, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+                    simplify=True,
+                    seed=None,
+                    sampler=SAMPLER_UNIFORM,
+                    max_calls=None,
+                    max_time=None,
+                    monotonicity=None):
+    # type: (list[Oracle], float, float, float, float, float, float, float, float, int, bool, float, int, bool, bool, bool, int, str, int, float, tuple) -> ResultSet
     assert (len(ora_list) > 0, "Oracle list can't be empty")
     assert (all(orac.dim() == 3 for orac in ora_list), "Oracles in list must have dimension 3")
 
     xyspace = create_3D_space(min_cornerx, min_cornery, min_cornerz, max_cornerx, max_cornery, max_cornerz)
-    num_samples = ceil(log(alpha, 1.0 - p0))
+    num_samples = num_samples_bound(p0, alpha, sampler)
 
     if parallel:
-        rs = ParSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, num_cells, blocking, sleep, opt_level,
-                                              logging)
+        rs = ParSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
     else:
         rs = SeqSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
-                                              logging)
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
 
     if simplify:
         rs.simplify()
@@ -563,7 +610,8 @@ def Search3D_BMNN22(ora_list,
 @cython.returns(object)
 @cython.locals(ora_list=list, min_corner=cython.double, max_corner=cython.double, p0=cython.double, alpha=cython.double,
                num_cells=cython.int, blocking=cython.bint, sleep=cython.double, opt_level=cython.int,
-               parallel=cython.bint, logging=cython.bint, simplify=cython.bint, rs=object)
+               parallel=cython.bint, logging=cython.bint, simplify=cython.bint, seed=object, sampler=str,
+               max_calls=object, max_time=object, monotonicity=tuple, rs=object)
 def SearchND_BMNN22(ora_list,
                     min_corner=0.0,
                     max_corner=1.0,
@@ -575,8 +623,13 @@ def SearchND_BMNN22(ora_list,
                     opt_level=0,
                     parallel=False,
                     logging=True,
-                    simplify=True):
-    # type: (list, float, float, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+                    simplify=True,
+                    seed=None,
+                    sampler=SAMPLER_UNIFORM,
+                    max_calls=None,
+                    max_time=None,
+                    monotonicity=None):
+    # type: (list, float, float, float, float, int, bool, float, int, bool, bool, bool, int, str, int, float, tuple) -> ResultSet
     assert (len(ora_list) > 0, "Oracle list can't be empty")
     assert (all(orac.dim() == ora_list[0].dim() for orac in ora_list), "Every oracle in list must have the same diemension")
     d = ora_list[0].dim()
@@ -585,14 +638,14 @@ def SearchND_BMNN22(ora_list,
     maxc = (max_corner,) * d
     xyspace = Rectangle(minc, maxc)
 
-    num_samples = ceil(log(alpha, 1.0 - p0))
+    num_samples = num_samples_bound(p0, alpha, sampler)
 
     if parallel:
         rs = ParSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
-                                              logging)
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
     else:
         rs = SeqSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
-                                              logging)
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
 
     if simplify:
         rs.simplify()
@@ -604,7 +657,8 @@ def SearchND_BMNN22(ora_list,
 @cython.returns(object)
 @cython.locals(oralist=list, list_intervals=list, p0=cython.double, alpha=cython.double, num_cells=cython.int,
                blocking=cython.bint, sleep=cython.double, opt_level=cython.int, parallel=cython.bint,
-               logging=cython.bint, simplify=cython.bint, rs=object)
+               logging=cython.bint, simplify=cython.bint, seed=object, sampler=str, max_calls=object,
+               max_time=object, monotonicity=tuple, rs=object)
 def SearchND_2_BMNN22(ora_list,
                       list_intervals,
                       p0=P0,
@@ -615,8 +669,13 @@ def SearchND_2_BMNN22(ora_list,
                       opt_level=int,
                       parallel=bool,
                       logging=True,
-                      simplify=True):
-    # type: (list[Oracle], list, float, float, int, bool, float, int, bool, bool, bool) -> ResultSet
+                      simplify=True,
+                      seed=None,
+                      sampler=SAMPLER_UNIFORM,
+                      max_calls=None,
+                      max_time=None,
+                      monotonicity=None):
+    # type: (list[Oracle], list, float, float, int, bool, float, int, bool, bool, bool, int, str, int, float, tuple) -> ResultSet
     assert len(ora_list) > 0, "Oracle list can't be empty"
     assert all(orac.dim() == ora_list[0].dim() for orac in ora_list), "Every oracle in list must have the same diemension"
 
@@ -624,13 +683,13 @@ def SearchND_2_BMNN22(ora_list,
 
     assert ora_list[0].dim() == xyspace.dim(), "The oracles and the space must have the same dimension"
 
-    num_samples = ceil(log(alpha, 1.0 - p0))
+    num_samples = num_samples_bound(p0, alpha, sampler)
     if parallel:
         rs = ParSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
-                                              logging)
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
     else:
         rs = SeqSearch.multidim_search_BMNN22(xyspace, ora_list, num_samples, num_cells, blocking, sleep, opt_level,
-                                              logging)
+                                              logging, seed, sampler, max_calls, max_time, monotonicity)
 
     if simplify:
         rs.simplify()
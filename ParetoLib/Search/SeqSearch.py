@@ -25,7 +25,9 @@ import os
 import time
 import tempfile
 import itertools
+import heapq
 import cython
+import numpy as np
 
 from typing import List, Tuple
 from sortedcontainers import SortedListWithKey, SortedSet
@@ -36,7 +38,9 @@ import ParetoLib.Search
 RootSearch = ParetoLib.Search
 
 from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, INTERFULL, INTERNULL, INTER, DKNOW, NO_INTER, \
-    binary_search, intersection_empty, intersection_empty_constrained, intersection_expansion_search
+    binary_search, intersection_empty, intersection_empty_constrained, intersection_expansion_search, \
+    OracleConjunction, BoundarySurrogate, CellGrid, seed_sequence, box_sampling, complete_samples, split_samples, \
+    cell_verdict, boundary_score, monotone_num_samples, monotone_projection, SAMPLER_UNIFORM
 from ParetoLib.Search.ResultSet import ResultSet
 
 from ParetoLib.Oracle.Oracle import Oracle
@@ -56,7 +60,8 @@ from ParetoLib.Geometry.Point import less_equal, mult
 @cython.returns(object)
 @cython.locals(xspace=object, oracle=object, epsilon=cython.double, delta=cython.double, max_step=cython.ulonglong,
                blocking=cython.bint, sleep=cython.double, opt_level=cython.uint, logging=cython.bint, md_search=list,
-               start=cython.double, end=cython.double, time0=cython.double, rs=object)
+               start=cython.double, end=cython.double, time0=cython.double, rs=object, surrogate=cython.bint,
+               model=object)
 def multidim_search(xspace,
                     oracle,
                     epsilon=EPS,
@@ -65,13 +70,17 @@ def multidim_search(xspace,
                     blocking=False,
                     sleep=0.0,
                     opt_level=2,
-                    logging=True):
-    # type: (Rectangle, Oracle, float, float, int, bool, float, int, bool) -> ResultSet
+                    logging=True,
+                    surrogate=False):
+    # type: (Rectangle, Oracle, float, float, int, bool, float, int, bool, bool) -> ResultSet
     md_search = [multidim_search_opt_0,
                  multidim_search_opt_1,
                  multidim_search_opt_2,
                  multidim_search_opt_3]
 
+    # The surrogate narrows the binary searches of expensive oracles (e.g., OracleSTL or OracleMatlab)
+    model = BoundarySurrogate(xspace.dim()) if surrogate else None
+
     RootSearch.logger.info('Starting multidimensional search')
     start = time.time()
     rs = md_search[opt_level](xspace,
@@ -81,10 +90,13 @@ def multidim_search(xspace,
                               max_step=max_step,
                               blocking=blocking,
                               sleep=sleep,
-                              logging=logging)
+                              logging=logging,
+                              surrogate=model)
     end = time.time()
     time0 = end - start
     RootSearch.logger.info('Time multidim search (Pareto front): ' + str(time0))
+    if model is not None:
+        RootSearch.logger.info('Surrogate guesses confirmed: {0}/{1}'.format(model.num_hits, model.num_guesses))
 
     return rs
 
@@ -139,7 +151,8 @@ def multidim_intersection_search(xspace, list_constraints,
 @cython.ccall
 @cython.returns(object)
 @cython.locals(xspace=object, oracles=list, num_samples=cython.int, num_cells=cython.int, blocking=cython.bint,
-               sleep=cython.double, opt_level=cython.uint, logging=cython.bint, md_search=list, start=cython.double,
+               sleep=cython.double, opt_level=cython.uint, logging=cython.bint, seed=object, sampler=str,
+               max_calls=object, max_time=object, monotonicity=tuple, md_search=list, start=cython.double,
                end=cython.double, time0=cython.double, rs=object)
 def multidim_search_BMNN22(xspace: Rectangle,
                            oracles: List[Oracle],
@@ -148,10 +161,17 @@ def multidim_search_BMNN22(xspace: Rectangle,
                            blocking: bool = False,
                            sleep: float = 0.0,
                            opt_level: int = 0,
-                           logging: bool = True) -> ResultSet:
-    # type: (Rectangle, list[Oracle], int, int, bool, float, int, bool) -> ResultSet
+                           logging: bool = True,
+                           seed: int = None,
+                           sampler: str = SAMPLER_UNIFORM,
+                           max_calls: int = None,
+                           max_time: float = None,
+                           monotonicity: Tuple[int] = None) -> ResultSet:
+    # type: (Rectangle, list[Oracle], int, int, bool, float, int, bool, int, str, int, float, tuple) -> ResultSet
 
     RootSearch.logger.info('Starting multidimensional search (BMNN22)')
+    if monotonicity is not None and opt_level != 0:
+        RootSearch.logger.warning('The monotonicity of the oracles is only used with opt_level=0')
     start = time.time()
     if opt_level == 0:  # Fixed cell creation
         rs = multidim_search_BMNN22_opt_0(xspace,
@@ -160,8 +180,11 @@ def multidim_search_BMNN22(xspace: Rectangle,
                                           num_cells=num_cells,
                                           blocking=blocking,
                                           sleep=sleep,
-                                          logging=logging)
-    else:  # Dinamyc cell creation
+                                          logging=logging,
+                                          seed=seed,
+                                          sampler=sampler,
+                                          monotonicity=monotonicity)
+    elif opt_level == 1:  # Dinamyc cell creation
         ps = 0.95
         g = mult(xspace.diag_vector(), 1.0 / 10.0)
         rs = multidim_search_BMNN22_opt_1(xspace,
@@ -171,7 +194,24 @@ def multidim_search_BMNN22(xspace: Rectangle,
                                           sleep=sleep,
                                           logging=logging,
                                           ps=ps,
-                                          g=g)
+                                          g=g,
+                                          seed=seed,
+                                          sampler=sampler)
+    else:  # Dinamyc cell creation, refining first the cells of the boundary
+        ps = 0.95
+        g = mult(xspace.diag_vector(), 1.0 / 10.0)
+        rs = multidim_search_BMNN22_opt_2(xspace,
+                                          oracles,
+                                          num_samples=num_samples,
+                                          blocking=blocking,
+                                          sleep=sleep,
+                                          logging=logging,
+                                          ps=ps,
+                                          g=g,
+                                          seed=seed,
+                                          sampler=sampler,
+                                          max_calls=max_calls,
+                                          max_time=max_time)
     end = time.time()
     time0 = end - start
     RootSearch.logger.info('Time multidim search (Pareto front): ' + str(time0))
@@ -207,8 +247,9 @@ def multidim_search_opt_3(xspace,
                           max_step=STEPS,
                           blocking=False,
                           sleep=0.0,
-                          logging=True):
-    # type: (Rectangle, Oracle, float, float, float, bool, float, bool) -> ResultSet
+                          logging=True,
+                          surrogate=None):
+    # type: (Rectangle, Oracle, float, float, float, bool, float, bool, BoundarySurrogate) -> ResultSet
 
     # xspace is a particular case of maximal rectangle
     # xspace = [min_corner, max_corner]^n = [0, 1]^n
@@ -285,7 +326,7 @@ def multidim_search_opt_3(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = binary_search(xrectangle.diag(), f, error, surrogate)
         RootSearch.logger.debug('y: {0}'.format(y))
         # discovered_segments.append(y)
 
@@ -442,8 +483,9 @@ def multidim_search_opt_2(xspace,
                           max_step=STEPS,
                           blocking=False,
                           sleep=0.0,
-                          logging=True):
-    # type: (Rectangle, Oracle, float, float, float, bool, float, bool) -> ResultSet
+                          logging=True,
+                          surrogate=None):
+    # type: (Rectangle, Oracle, float, float, float, bool, float, bool, BoundarySurrogate) -> ResultSet
 
     # xspace is a particular case of maximal rectangle
     # xspace = [min_corner, max_corner]^n = [0, 1]^n
@@ -511,7 +553,7 @@ def multidim_search_opt_2(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = binary_search(xrectangle.diag(), f, error, surrogate)
         RootSearch.logger.debug('y: {0}'.format(y))
         # discovered_segments.append(y)
 
@@ -646,8 +688,9 @@ def multidim_search_opt_1(xspace,
                           max_step=STEPS,
                           blocking=False,
                           sleep=0.0,
-                          logging=True):
-    # type: (Rectangle, Oracle, float, float, float, bool, float, bool) -> ResultSet
+                          logging=True,
+                          surrogate=None):
+    # type: (Rectangle, Oracle, float, float, float, bool, float, bool, BoundarySurrogate) -> ResultSet
 
     # Xspace is a particular case of maximal rectangle
     # Xspace = [min_corner, max_corner]^n = [0, 1]^n
@@ -711,7 +754,7 @@ def multidim_search_opt_1(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = binary_search(xrectangle.diag(), f, error, surrogate)
         RootSearch.logger.debug('y: {0}'.format(y))
         # discovered_segments.append(y)
 
@@ -861,8 +904,9 @@ def multidim_search_opt_inf(xspace,
                             max_step=STEPS,
                             blocking=False,
                             sleep=0.0,
-                            logging=True):
-    # type: (Rectangle, Oracle, float, float, float, bool, float, bool) -> ResultSet
+                            logging=True,
+                            surrogate=None):
+    # type: (Rectangle, Oracle, float, float, float, bool, float, bool, BoundarySurrogate) -> ResultSet
 
     # Xspace is a particular case of maximal rectangle
     # Xspace = [min_corner, max_corner]^n = [0, 1]^n
@@ -926,7 +970,7 @@ def multidim_search_opt_inf(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = binary_search(xrectangle.diag(), f, error, surrogate)
         RootSearch.logger.debug('y: {0}'.format(y))
 
         # b0 = Rectangle(xspace.min_corner, y.low)
@@ -1029,8 +1073,9 @@ def multidim_search_opt_0(xspace,
                           max_step=STEPS,
                           blocking=False,
                           sleep=0.0,
-                          logging=True):
-    # type: (Rectangle, Oracle, float, float, float, bool, float, bool) -> ResultSet
+                          logging=True,
+                          surrogate=None):
+    # type: (Rectangle, Oracle, float, float, float, bool, float, bool, BoundarySurrogate) -> ResultSet
 
     # Xspace is a particular case of maximal rectangle
     # Xspace = [min_corner, max_corner]^n = [0, 1]^n
@@ -1093,7 +1138,7 @@ def multidim_search_opt_0(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = binary_search(xrectangle.diag(), f, error, surrogate)
         RootSearch.logger.debug('y: {0}'.format(y))
 
         # b0 = Rectangle(xspace.min_corner, y.low)
@@ -1459,6 +1504,7 @@ def multidim_intersection_search_opt_1(xspace, list_constraints,
     # oracle functions
     f1 = oracle1.membership()
     f2 = oracle2.membership()
+    conj = OracleConjunction([f1, f2])
 
     error = (epsilon,) * n
     vol_total = xspace.volume()
@@ -1546,7 +1592,7 @@ def multidim_intersection_search_opt_1(xspace, list_constraints,
             i = irect(incomparable, yrectangle, xrectangle)
 
         for rect in i:
-            if intersection_empty(rect.diag(), f1, f2):
+            if intersection_empty(rect.diag(), f1, f2, conj):
                 vol_xrest += rect.volume()
             else:
                 rect.privilege = current_privilege + 1.0
@@ -1632,6 +1678,7 @@ def multidim_intersection_search_opt_2(xspace, list_constraints,
     # oracle functions
     f1 = oracle1.membership()
     f2 = oracle2.membership()
+    conj = OracleConjunction([f1, f2])
 
     error = (epsilon,) * n
     vol_total = xspace.volume()
@@ -1716,7 +1763,7 @@ def multidim_intersection_search_opt_2(xspace, list_constraints,
             i = irect(incomparable, yrectangle, xrectangle)
 
         for rect in i:
-            if intersection_empty(rect.diag(), f1, f2):
+            if intersection_empty(rect.diag(), f1, f2, conj):
                 vol_xrest += rect.volume()
             else:
                 rect.privilege = current_privilege + 1.0
@@ -1770,29 +1817,33 @@ def multidim_intersection_search_opt_2(xspace, list_constraints,
 @cython.ccall
 @cython.returns(object)
 @cython.locals(xpace=object, oracles=list, num_samples=cython.uint, num_cells=cython.uint,
-               blocking=cython.bint, sleep=cython.double, logging=cython.bint, n=cython.uint, rect_list=list,
-               green=list, red=list, border=list, mems=list, step=cython.uint, tempdir=cython.basestring,
-               cell=object, samples=list, rs=object, vol_green=cython.double, vol_red=cython.double,
-               vol_border=cython.double)
+               blocking=cython.bint, sleep=cython.double, logging=cython.bint, n=cython.uint, grid=object,
+               conj=object, step=cython.uint, tempdir=cython.basestring, samples=object, rs=object,
+               vol_green=cython.double, vol_red=cython.double, vol_border=cython.double, seed=object, chunks=list,
+               seeds=list, start=cython.ulong, stop=cython.ulong, chunk_seed=object, low=object, high=object,
+               num_green=cython.ulong, num_red=cython.ulong, sampler=str, monotonicity=tuple)
 def multidim_search_BMNN22_opt_0(xspace: Rectangle,
                                  oracles: List[Oracle],
                                  num_samples: int,
                                  num_cells: int,
                                  blocking : bool = False,
                                  sleep : float = 0.0,
-                                 logging : bool = True) -> ResultSet:
-    # type: (Rectangle, list[Oracle], int, int, bool, float, bool) -> ResultSet
+                                 logging : bool = True,
+                                 seed : int = None,
+                                 sampler : str = SAMPLER_UNIFORM,
+                                 monotonicity : Tuple[int] = None) -> ResultSet:
+    # type: (Rectangle, list[Oracle], int, int, bool, float, bool, int, str, tuple) -> ResultSet
     # - Write asserts and logger info (useful for debugging and defensive programming)
 
     # Dimension
     n = xspace.dim()
 
-    rect_list = xspace.cell_partition_bin(num_cells)
-    green = list()
-    red = list()
-    border = list()
+    # The cells are classified in a boolean grid, and converted to Rectangles at the end
+    grid = CellGrid(xspace, num_cells)
+    num_green, num_red = 0, 0
     vol_green, vol_red, vol_border = 0.0, 0.0, 0.0  # Area of all the regions for debugging purposes
-    mems = [ora.membership() for ora in oracles]
+    # Oracles are queried in the order that minimizes the expected cost per sample
+    conj = OracleConjunction.from_oracles(oracles)
 
     step = 0
 
@@ -1801,51 +1852,66 @@ def multidim_search_BMNN22_opt_0(xspace: Rectangle,
 
     RootSearch.logger.info('Report\nStep, Red, Green, Border, Total, nRed, nGreen, nBorder')
     RootSearch.logger.info(
-        '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}'.format(step, vol_red, vol_green, vol_border, xspace.volume(), len(red),
-                                                        len(green), len(border)))  # 0th step
+        '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}'.format(step, vol_red, vol_green, vol_border, xspace.volume(), num_red,
+                                                        num_green, 0))  # 0th step
+
+    # Samples are only spent along the dimensions where the oracles are not monotone
+    num_samples = monotone_num_samples(num_samples, monotonicity)
+
+    # Every chunk of cells has its own random stream, as in ParSearch
+    chunks = grid.chunks(num_samples)
+    seeds = seed_sequence(seed).spawn(len(chunks))
+    for (start, stop), chunk_seed in zip(chunks, seeds):
+        # Samples of all the cells in the chunk
+        low, high = grid.bounds(start, stop)
+        samples = box_sampling(low, high, num_samples, np.random.default_rng(chunk_seed), sampler)
+        if monotonicity is not None:
+            samples = monotone_projection(low, high, samples, monotonicity)
+        grid.green.flat[start:stop] = conj.any_rows(samples)
 
-    for cell in rect_list:
         step = step + 1
-        # Write some Logg info here: step, red area size, green area size, ... total area (xspace), number of rectangles
-        # in each region, etc.
-
-        samples = cell.uniform_sampling(num_samples)
-
-        if any(all(f(s) for f in mems) for s in samples):
-            green.append(cell)
-            vol_green = vol_green + cell.volume()
-        else:
-            red.append(cell)
-            vol_red = vol_red + cell.volume()
-
+        # Write some Logg info here: step, red area size, green area size, ... total area (xspace), number of
+        # rectangles in each region, etc.
+        num_green = int(np.count_nonzero(grid.green))
+        num_red = stop - num_green
+        vol_green = num_green * grid.cell_volume()
+        vol_red = num_red * grid.cell_volume()
         RootSearch.logger.info(
             '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}'.format(step, vol_red, vol_green, vol_border, xspace.volume(),
-                                                            len(red), len(green), len(border)))
+                                                            num_red, num_green, 0))
+
+        if sleep > 0.0 or logging:
+            rs = _grid_result_set(grid, stop)
 
         # Visualization
         if sleep > 0.0:
-            rs = ResultSet(border, red, green, xspace)
             if n == 2:
                 rs.plot_2D_light(blocking=blocking, sec=sleep, opacity=0.7)
             elif n == 3:
                 rs.plot_3D_light(blocking=blocking, sec=sleep, opacity=0.7)
 
         if logging:
-            rs = ResultSet(border, red, green, xspace)
             name = os.path.join(tempdir, str(step))
             rs.to_file(name)
 
-    return ResultSet(yup=green, ylow=red, border=border, xspace=xspace)
+    return _grid_result_set(grid, len(grid))
+
+
+@cython.locals(grid=object, stop=cython.ulong, red=object)
+@cython.returns(object)
+def _grid_result_set(grid, stop):
+    # type: (CellGrid, int) -> ResultSet
+    # ResultSet with the first stop cells of the grid (i.e., the cells classified so far)
+    red = ~grid.green
+    red.flat[stop:] = False
+    return ResultSet(yup=grid.rectangles(grid.green), ylow=grid.rectangles(red), border=list(), xspace=grid.xspace)
 
 
 # Dynamic size cell method
 @cython.ccall
 @cython.returns(object)
-@cython.locals(xpace=object, oracles=list, num_samples=cython.uint, num_cells=cython.uint, g=tuple,
-               blocking=cython.bint, sleep=cython.double, logging=cython.bint, ps=cython.double, m=cython.uint,
-               n=cython.uint, rect_list=list, new_rect_list=list, green=set, red=set, border=set, mems=list,
-               counter=cython.uint,
-               tempdir=cython.basestring, cell=object, samples=list, rs=object)
+@cython.locals(xpace=object, oracles=list, num_samples=cython.uint, g=tuple, blocking=cython.bint,
+               sleep=cython.double, logging=cython.bint, ps=cython.double, seed=object, sampler=str, conj=object)
 def multidim_search_BMNN22_opt_1(xspace: Rectangle,
                                  oracles: List[Oracle],
                                  num_samples: int,
@@ -1853,31 +1919,51 @@ def multidim_search_BMNN22_opt_1(xspace: Rectangle,
                                  blocking: bool = False,
                                  sleep: float = 0.0,
                                  logging: bool = True,
-                                 ps: float = 0.95) -> ResultSet:
-    # type: (Rectangle, list[Oracle], int, tuple, bool, float, bool, float) -> ResultSet
+                                 ps: float = 0.95,
+                                 seed: int = None,
+                                 sampler: str = SAMPLER_UNIFORM) -> ResultSet:
+    # type: (Rectangle, list[Oracle], int, tuple, bool, float, bool, float, int, str) -> ResultSet
+    # The statistics of the oracles are shared by the recursive calls
+    conj = OracleConjunction.from_oracles(oracles)
+    return _multidim_search_BMNN22_opt_1(xspace, conj, seed_sequence(seed), num_samples, g, blocking, sleep, logging,
+                                         ps, sampler)
+
+
+@cython.ccall
+@cython.returns(object)
+@cython.locals(xpace=object, conj=object, seed_seq=object, num_samples=cython.uint, g=tuple, blocking=cython.bint,
+               sleep=cython.double, logging=cython.bint, ps=cython.double, n=cython.uint, rect_list=list,
+               green=set, red=set, border=set, verdict=object, tempdir=cython.basestring, samples=object,
+               answers=object, rs=object, sampler=str, r_samples=object, r_answers=object)
+def _multidim_search_BMNN22_opt_1(xspace, conj, seed_seq, num_samples, g, blocking, sleep, logging, ps, sampler,
+                                  samples=None, answers=None):
+    # type: (Rectangle, OracleConjunction, np.random.SeedSequence, int, tuple, bool, float, bool, float, str, np.ndarray, np.ndarray) -> ResultSet
+    # Every cell has its own SeedSequence, and the seeds of its sub-cells are spawned from it. Thus, the samples of a
+    # cell only depend on its position in the tree of cells, and ParSearch draws the same samples.
+    # The samples of a cell that was split, and their answers, are handed down to its sub-cells
 
     green = set()
     red = set()
     border = set()
     d = xspace.dim()
-    mems = [ora.membership() for ora in oracles]
-    samples = xspace.uniform_sampling(num_samples)
+    samples, answers = complete_samples(xspace, conj, seed_seq, num_samples, sampler, samples, answers)
     step = 0
 
     # Create temporary directory for storing the result of each step
     tempdir = tempfile.mkdtemp()
 
-    all_fs_in_sample = (all(f(s) for f in mems) for s in samples)
-    counter = sum(all_fs_in_sample)
-    if counter == 0:
+    verdict = cell_verdict(xspace, answers, ps, g)
+    if verdict is False:
         red.add(xspace)
-    elif counter / num_samples >= ps or less_equal(xspace.diag_vector(), g):
+    elif verdict:
         green.add(xspace)
     else:
         n = pow(2, d)
         rect_list = xspace.cell_partition_bin(n)
-        for r in rect_list:
-            temp_rs = multidim_search_BMNN22_opt_1(r, oracles, num_samples, g, blocking, sleep, logging, ps)
+        for r, r_seed, (r_samples, r_answers) in zip(rect_list, seed_seq.spawn(n),
+                                                     split_samples(xspace, samples, answers)):
+            temp_rs = _multidim_search_BMNN22_opt_1(r, conj, r_seed, num_samples, g, blocking, sleep, logging, ps,
+                                                    sampler, r_samples, r_answers)
             green = green.union(set(temp_rs.yup))
             red = red.union(set(temp_rs.ylow))
             border = border.union(set(temp_rs.border))
@@ -1888,3 +1974,95 @@ def multidim_search_BMNN22_opt_1(xspace: Rectangle,
         rs.to_file(name)
 
     return ResultSet(yup=list(green), ylow=list(red), border=list(border), xspace=xspace)
+
+
+# Dynamic size cell method, refining first the cells of the boundary
+@cython.ccall
+@cython.returns(object)
+@cython.locals(xpace=object, oracles=list, num_samples=cython.uint, g=tuple, blocking=cython.bint,
+               sleep=cython.double, logging=cython.bint, ps=cython.double, seed=object, sampler=str,
+               max_calls=object, max_time=object, conj=object, green=list, red=list, heap=list, tie=object,
+               calls=cython.ulong, start=cython.double, d=cython.ushort, n=cython.uint, step=cython.uint,
+               tempdir=cython.basestring, cell=object, seed_seq=object, samples=object, answers=object,
+               cell_list=list, verdict=object, vol_green=cython.double, vol_red=cython.double,
+               vol_border=cython.double, rs=object)
+def multidim_search_BMNN22_opt_2(xspace: Rectangle,
+                                 oracles: List[Oracle],
+                                 num_samples: int,
+                                 g: Tuple[float],
+                                 blocking: bool = False,
+                                 sleep: float = 0.0,
+                                 logging: bool = True,
+                                 ps: float = 0.95,
+                                 seed: int = None,
+                                 sampler: str = SAMPLER_UNIFORM,
+                                 max_calls: int = None,
+                                 max_time: float = None) -> ResultSet:
+    # type: (Rectangle, list[Oracle], int, tuple, bool, float, bool, float, int, str, int, float) -> ResultSet
+    # Same verdicts as opt_1, but cells with a mixed verdict are split in order of boundary_score until the budget of
+    # oracle calls (i.e., evaluated samples) or time is exhausted. The cells with a mixed verdict that are not refined
+    # within the budget are returned in the border. Without budget, the result is the one of opt_1
+    conj = OracleConjunction.from_oracles(oracles)
+    green = list()
+    red = list()
+    vol_green, vol_red, vol_border = 0.0, 0.0, 0.0
+    # Max-heap of cells with mixed verdict: (-boundary_score, tie, cell, seed of the cell, samples, answers)
+    heap = list()
+    tie = itertools.count()
+    calls = 0
+    start = time.time()
+    d = xspace.dim()
+    n = pow(2, d)
+    step = 0
+
+    # Create temporary directory for storing the result of each step
+    tempdir = tempfile.mkdtemp()
+
+    RootSearch.logger.info('Report\nStep, Red, Green, Border, Total, nRed, nGreen, nBorder, Calls')
+    cell_list = [(xspace, seed_sequence(seed), None, None)]
+    while len(cell_list) > 0:
+        for cell, seed_seq, samples, answers in cell_list:
+            calls = calls + num_samples - (0 if samples is None else len(samples))
+            samples, answers = complete_samples(cell, conj, seed_seq, num_samples, sampler, samples, answers)
+            verdict = cell_verdict(cell, answers, ps, g)
+            if verdict is None:
+                heapq.heappush(heap, (-boundary_score(cell, answers), next(tie), cell, seed_seq, samples, answers))
+                vol_border = vol_border + cell.volume()
+            elif verdict:
+                green.append(cell)
+                vol_green = vol_green + cell.volume()
+            else:
+                red.append(cell)
+                vol_red = vol_red + cell.volume()
+
+        RootSearch.logger.info(
+            '{0}, {1}, {2}, {3}, {4}, {5}, {6}, {7}, {8}'.format(step, vol_red, vol_green, vol_border, xspace.volume(),
+                                                                 len(red), len(green), len(heap), calls))
+
+        # Visualization
+        if sleep > 0.0:
+            rs = ResultSet(border=[item[2] for item in heap], ylow=red, yup=green, xspace=xspace)
+            if d == 2:
+                rs.plot_2D_light(blocking=blocking, sec=sleep, opacity=0.7)
+            elif d == 3:
+                rs.plot_3D_light(blocking=blocking, sec=sleep, opacity=0.7)
+
+        cell_list = list()
+        if len(heap) == 0:
+            break
+        # The samples of a cell are inherited by its sub-cells, which only draw the rest
+        if max_calls is not None and calls + n * num_samples - len(heap[0][4]) > max_calls:
+            break
+        if max_time is not None and time.time() - start >= max_time:
+            break
+        _, _, cell, seed_seq, samples, answers = heapq.heappop(heap)
+        vol_border = vol_border - cell.volume()
+        cell_list = [(r, r_seed, r_samples, r_answers) for r, r_seed, (r_samples, r_answers)
+                     in zip(cell.cell_partition_bin(n), seed_seq.spawn(n), split_samples(cell, samples, answers))]
+        step = step + 1
+
+    rs = ResultSet(border=[item[2] for item in heap], ylow=red, yup=green, xspace=xspace)
+    if logging:
+        name = os.path.join(tempdir, str(step))
+        rs.to_file(name)
+    return rs
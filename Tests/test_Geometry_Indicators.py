@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+
+from ParetoLib.Geometry.Indicators import as_front, nondominated, hypervolume, igd, igd_plus, epsilon_indicator, \
+    directed_hausdorff, hausdorff
+
+
+##############
+# Indicators #
+##############
+
+class IndicatorsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (IndicatorsTestCase) -> None
+        self.rng = np.random.default_rng(0)
+
+    def test_nondominated(self):
+        # type: (IndicatorsTestCase) -> None
+        front = np.array([[0.0, 1.0], [1.0, 1.0], [1.0, 0.0], [0.0, 1.0], [0.5, 0.5]])
+        self.assertTrue(np.array_equal(nondominated(front), np.array([[0.0, 1.0], [0.5, 0.5], [1.0, 0.0]])))
+        self.assertTupleEqual(as_front([], 3).shape, (0, 3))
+        self.assertTupleEqual(nondominated(as_front([], 3)).shape, (0, 3))
+
+        # No point of the result is dominated by a point of the front, and the rest of points are dominated.
+        # 2D fronts are swept, and higher dimensions are filtered in blocks
+        for d in (2, 3, 4):
+            front = np.concatenate((self.rng.random((300, d)), self.rng.integers(0, 4, size=(300, d)) / 4.0))
+            res = nondominated(front)
+            for p in res:
+                self.assertFalse(np.any(np.all(front <= p, axis=1) & np.any(front < p, axis=1)))
+            rest = front[~np.any(np.all(front[:, None, :] == res[None, :, :], axis=2), axis=1)]
+            for p in rest:
+                self.assertTrue(np.any(np.all(res <= p, axis=1)))
+            self.assertEqual(len(np.unique(res, axis=0)), len(res))
+
+    def test_hypervolume(self):
+        # type: (IndicatorsTestCase) -> None
+        self.assertAlmostEqual(hypervolume(np.array([[0.0, 0.5], [0.5, 0.0]]), (1.0, 1.0)), 0.75)
+        self.assertAlmostEqual(hypervolume([(0.5,)], (1.0,)), 0.5)
+        self.assertAlmostEqual(hypervolume([(0.5, 0.5, 0.5)], (1.0, 1.0, 1.0)), 0.125)
+        # Points that do not dominate the reference point are ignored
+        self.assertAlmostEqual(hypervolume([(0.5, 0.5), (2.0, 0.0)], (1.0, 1.0)), 0.25)
+        self.assertEqual(hypervolume(as_front([], 2), (1.0, 1.0)), 0.0)
+
+        # Inclusion-exclusion over every subset of a small front
+        for d in (3, 4, 5):
+            front = self.rng.random((8, d))
+            ref = np.ones(d)
+            vol = 0.0
+            for mask in range(1, 2 ** len(front)):
+                subset = front[[i for i in range(len(front)) if mask & (1 << i)]]
+                vol = vol + (-1) ** (len(subset) + 1) * np.prod(ref - np.max(subset, axis=0))
+            self.assertAlmostEqual(hypervolume(front, ref), vol)
+
+    def test_distances(self):
+        # type: (IndicatorsTestCase) -> None
+        reference = np.array([[0.0, 1.0], [0.5, 0.5], [1.0, 0.0]])
+        front = reference + 0.1
+        self.assertAlmostEqual(igd(reference, reference), 0.0)
+        self.assertAlmostEqual(igd(front, reference), 0.1 * np.sqrt(2))
+        self.assertAlmostEqual(igd_plus(front, reference), 0.1 * np.sqrt(2))
+        self.assertAlmostEqual(epsilon_indicator(front, reference), 0.1)
+
+        # A front that dominates the reference front is not penalized by IGD+ and the epsilon indicator
+        front = reference - 0.1
+        self.assertAlmostEqual(igd(front, reference), 0.1 * np.sqrt(2))
+        self.assertAlmostEqual(igd_plus(front, reference), 0.0)
+        self.assertAlmostEqual(epsilon_indicator(front, reference), -0.1)
+
+        a = np.array([[0.0, 0.0]])
+        b = np.array([[0.0, 0.0], [3.0, 4.0]])
+        self.assertAlmostEqual(directed_hausdorff(a, b), 0.0)
+        self.assertAlmostEqual(directed_hausdorff(b, a), 5.0)
+        self.assertAlmostEqual(hausdorff(a, b), 5.0)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,173 @@
+import os
+import unittest
+import copy
+import pickle
+import tempfile
+import shutil
+
+import numpy as np
+
+from ParetoLib.Oracle.OracleFunction import OracleFunction
+from ParetoLib.Oracle.OracleMemo import OracleMemo
+from ParetoLib.Oracle.OracleSTL import OracleSTL
+from ParetoLib.Search.Search import create_2D_space
+import ParetoLib.Search.ParSearch as ParSearch
+
+
+##############
+# OracleMemo #
+##############
+
+
+class CountingOracleFunction(OracleFunction):
+
+    def __init__(self):
+        super(CountingOracleFunction, self).__init__()
+        self.num_oracle_calls = 0
+
+    def member(self, point):
+        self.num_oracle_calls = self.num_oracle_calls + 1
+        return super(CountingOracleFunction, self).member(point)
+
+
+class OracleMemoTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (OracleMemoTestCase) -> None
+        self.this_dir = tempfile.mkdtemp()
+        self.memo_file = os.path.join(self.this_dir, 'memo.db')
+        # x > 0 and y > 1 - x
+        self.oracle_file = 'Oracle/OracleFunction/2D/test1.txt'
+        self.points = [tuple(p) for p in np.random.uniform(0.0, 1.0, size=(50, 2))]
+
+    def tearDown(self):
+        # type: (OracleMemoTestCase) -> None
+        shutil.rmtree(self.this_dir)
+
+    def new_oracle(self):
+        # type: (OracleMemoTestCase) -> CountingOracleFunction
+        ora = CountingOracleFunction()
+        ora.from_file(self.oracle_file, human_readable=True)
+        return ora
+
+    def test_member(self):
+        # type: (OracleMemoTestCase) -> None
+        ora = self.new_oracle()
+        expected = [ora.member(p) for p in self.points]
+        ora.num_oracle_calls = 0
+
+        # First run: every query goes to the oracle
+        memo = OracleMemo(ora, self.memo_file)
+        self.assertEqual(memo.dim(), 2)
+        self.assertListEqual([memo.member(p) for p in self.points], expected)
+        self.assertEqual(ora.num_oracle_calls, len(self.points))
+        self.assertEqual(memo.hit_ratio(), 0.0)
+        self.assertEqual(memo.size(), len(self.points))
+        memo.close()
+
+        # Second run: answers are read from disk
+        ora = self.new_oracle()
+        memo = OracleMemo(ora, self.memo_file)
+        f = memo.membership()
+        self.assertListEqual([f(p) for p in self.points], expected)
+        self.assertListEqual(memo.member_batch(self.points), expected)
+        self.assertEqual(ora.num_oracle_calls, 0)
+        self.assertEqual(memo.hit_ratio(), 1.0)
+        self.assertTupleEqual(memo.stats(), (3 * len(self.points), 2 * len(self.points), 2.0 / 3.0))
+        memo.close()
+
+    def test_fingerprint(self):
+        # type: (OracleMemoTestCase) -> None
+        memo1 = OracleMemo(self.new_oracle(), self.memo_file)
+        memo1.member_batch(self.points)
+
+        # A different oracle does not reuse the answers of test1.txt
+        ora2 = OracleFunction()
+        ora2.from_file('Oracle/OracleFunction/2D/test2.txt', human_readable=True)
+        memo2 = OracleMemo(ora2, self.memo_file)
+        self.assertNotEqual(memo1.fingerprint(), memo2.fingerprint())
+        self.assertEqual(memo2.size(), 0)
+
+        memo2.member(self.points[0])
+        self.assertEqual(memo2.hit_ratio(), 0.0)
+
+        memo1.clear()
+        self.assertEqual(memo1.size(), 0)
+        self.assertEqual(memo2.size(), 1)
+        memo1.close()
+        memo2.close()
+
+    def test_resolution(self):
+        # type: (OracleMemoTestCase) -> None
+        # Answers stored with a coarse resolution are not reused with a finer one
+        memo1 = OracleMemo(self.new_oracle(), self.memo_file, resolution=0.1)
+        self.assertTrue(memo1.member((0.5, 0.6)))
+        memo2 = OracleMemo(self.new_oracle(), self.memo_file)
+        self.assertNotEqual(memo1.fingerprint(), memo2.fingerprint())
+        self.assertFalse(memo2.member((5e-9, 6e-9)))
+        memo1.close()
+        memo2.close()
+
+    def test_fingerprint_files(self):
+        # type: (OracleMemoTestCase) -> None
+        # The fingerprint depends on the content of the files of the oracle, not on their location
+        files = {'.stl': 'p1 + p2 >= 1', '.param': 'p1\np2\n', '.vcd': 'signal', '.alias': 'alias'}
+        fnames = {}
+        for folder in ('a', 'b'):
+            os.mkdir(os.path.join(self.this_dir, folder))
+            for ext, content in files.items():
+                fnames[folder, ext] = os.path.join(self.this_dir, folder, 'oracle' + ext)
+                with open(fnames[folder, ext], 'w') as foutput:
+                    foutput.write(content)
+
+        def fingerprint(folder):
+            ora = OracleSTL(stl_prop_file=fnames[folder, '.stl'], vcd_signal_file=fnames[folder, '.vcd'],
+                            var_alias_file=fnames[folder, '.alias'], stl_param_file=fnames[folder, '.param'])
+            return OracleMemo(ora, self.memo_file).fingerprint()
+
+        self.assertEqual(fingerprint('a'), fingerprint('b'))
+        with open(fnames['b', '.vcd'], 'w') as foutput:
+            foutput.write('new signal')
+        self.assertNotEqual(fingerprint('a'), fingerprint('b'))
+
+    def test_copy(self):
+        # type: (OracleMemoTestCase) -> None
+        memo1 = OracleMemo(self.new_oracle(), self.memo_file)
+        memo1.member(self.points[0])
+
+        memo2 = copy.deepcopy(memo1)
+        memo3 = pickle.loads(pickle.dumps(memo1))
+        self.assertEqual(memo1, memo2)
+        self.assertEqual(hash(memo1), hash(memo3))
+        self.assertEqual(memo2.num_calls, 0)
+        self.assertEqual(memo3.member(self.points[0]), memo1.member(self.points[0]))
+        self.assertEqual(memo3.hit_ratio(), 1.0)
+        for memo in (memo1, memo2, memo3):
+            memo.close()
+
+    def test_parsearch(self):
+        # type: (OracleMemoTestCase) -> None
+        # The database is shared by the workers of ParSearch
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        memo = OracleMemo(self.new_oracle(), self.memo_file)
+        rs1 = ParSearch.multidim_search(xspace, memo, epsilon=1e-3, delta=0.01, max_step=20, opt_level=2,
+                                        logging=False)
+        calls, hits, _ = memo.stats()
+        self.assertGreater(calls, 0)
+        self.assertGreater(memo.size(), 0)
+
+        # Repeating the search does not query the oracle anymore
+        size = memo.size()
+        rs2 = ParSearch.multidim_search(xspace, memo, epsilon=1e-3, delta=0.01, max_step=20, opt_level=2,
+                                        logging=False)
+        self.assertEqual(memo.size(), size)
+        calls2, hits2, _ = memo.stats()
+        self.assertEqual(calls2 - calls, hits2 - hits)
+        self.assertGreater(hits2, hits)
+        self.assertAlmostEqual(rs1.volume_border(), rs2.volume_border())
+        memo.close()
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
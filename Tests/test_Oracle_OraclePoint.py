@@ -5,7 +5,8 @@ import unittest
 import numpy as np
 
 from ParetoLib.Oracle.OraclePoint import OraclePoint
-from ParetoLib.Oracle.NDTree import NDTree
+from ParetoLib.Oracle.NDTree import NDTree, read_points
+from ParetoLib.Oracle.ParetoArchive import Archive2D, Archive3D, pareto_archive
 
 
 ###############
@@ -94,6 +95,121 @@ class OraclePointTestCase(unittest.TestCase):
         self.assertEqual(ND1, oldND1)
         self.assertNotEqual(ND1, ND2)
 
+    def test_front_NDTree(self):
+        # type: (OraclePointTestCase) -> None
+
+        def dominates(p, q):
+            return all(pi <= qi for pi, qi in zip(p, q))
+
+        rng = np.random.default_rng(0)
+        for d, max_points, min_children in ((2, 2, 2), (3, 5, 3), (4, 10, 1)):
+            # Points on a grid, with repetitions and dominated points
+            points = [tuple(p) for p in rng.integers(0, 10, size=(300, d)).astype(float).tolist()]
+            front = set(p for p in points if not any(dominates(q, p) and q != p for q in points))
+
+            nd = NDTree(max_points=max_points, min_children=min_children)
+            for p in points:
+                nd.update_point(p)
+            self.assertSetEqual(nd.get_points(), front)
+            self.assertEqual(nd.point_array().shape, (len(front), d))
+            self.assertEqual(nd.dim(), d)
+
+            for q in rng.uniform(-1.0, 10.0, size=(100, d)).tolist():
+                self.assertEqual(nd.dominates(tuple(q)), any(dominates(p, q) for p in front))
+            for p in front:
+                self.assertTrue(p in nd)
+                self.assertTrue(nd.dominates(p))
+
+        # Deep trees are traversed iteratively
+        nd = NDTree()
+        xs = rng.uniform(0.0, 1.0, size=5000)
+        for x in xs:
+            nd.update_point((x, 1.0 - x))
+        self.assertEqual(len(nd.get_points()), len(set(xs)))
+        self.assertTrue(nd.dominates((0.5, 1.0)))
+        self.assertFalse(nd.dominates((-0.1, 1.0)))
+        nd.update_point((0.0, 0.0))
+        self.assertSetEqual(nd.get_points(), {(0.0, 0.0)})
+
+    def test_bulk_NDTree(self):
+        # type: (OraclePointTestCase) -> None
+        # Bulk loading and point by point insertion lead to the same front
+        for fname in ('Oracle/OraclePoint/2D/test-2d-1000points.txt', 'Oracle/OraclePoint/3D/test-3d-1000points.txt'):
+            with open(fname, 'r') as finput:
+                points = read_points(finput)
+            nd1 = NDTree()
+            for p in points.tolist():
+                nd1.update_point(tuple(p))
+            nd2 = NDTree()
+            nd2.update_points(points[:len(points) // 2])
+            nd2.update_points(points[len(points) // 2:])
+            self.assertEqual(nd1, nd2)
+            for q in np.random.default_rng(0).uniform(np.min(points, axis=0), np.max(points, axis=0),
+                                                      size=(200, points.shape[1])).tolist():
+                self.assertEqual(nd1.dominates(tuple(q)), nd2.dominates(tuple(q)))
+
+            ora = OraclePoint()
+            ora.from_file(fname, human_readable=True)
+            self.assertEqual(ora.get_points(), nd1.get_points())
+
+    def test_batch_NDTree(self):
+        # type: (OraclePointTestCase) -> None
+
+        def dominates(p, q):
+            return all(pi <= qi for pi, qi in zip(p, q))
+
+        rng = np.random.default_rng(1)
+        for d, max_points in ((2, 2), (3, 5), (4, 10)):
+            nd = NDTree(max_points=max_points)
+            self.assertFalse(nd.dominates_batch(rng.uniform(size=(10, d))).any())
+            nd.update_points(rng.integers(0, 10, size=(300, d)).astype(float))
+            front = nd.get_points()
+            queries = np.concatenate((rng.uniform(-1.0, 10.0, size=(500, d)), nd.point_array()))
+            self.assertListEqual(nd.dominates_batch(queries).tolist(),
+                                 [nd.dominates(tuple(q)) for q in queries.tolist()])
+            self.assertListEqual(nd.dominated_batch(queries).tolist(),
+                                 [any(dominates(q, p) for p in front) for q in queries.tolist()])
+            self.assertTrue(nd.dominates_batch(nd.point_array()).all())
+            self.assertTrue(nd.dominated_batch(nd.point_array()).all())
+            self.assertEqual(len(nd.dominates_batch(np.empty((0, d)))), 0)
+
+            ora = OraclePoint(max_points=max_points)
+            ora.add_points(front)
+            self.assertTrue(ora.is_vectorized())
+            self.assertListEqual(ora.member_batch(queries.tolist()), [ora.member(tuple(q)) for q in queries.tolist()])
+
+    def test_ParetoArchive(self):
+        # type: (OraclePointTestCase) -> None
+        # Archives specialised for 2D and 3D store the same front and answer the same queries as the NDTree
+        rng = np.random.default_rng(2)
+        for d, cls in ((2, Archive2D), (3, Archive3D), (4, NDTree)):
+            self.assertIs(type(pareto_archive(d)), cls)
+            points = rng.integers(0, 12, size=(400, d)).astype(float)
+            nd = NDTree()
+            ar1 = pareto_archive(d)
+            for p in points.tolist():
+                nd.update_point(tuple(p))
+                ar1.update_point(tuple(p))
+            ar2 = pareto_archive(d)
+            ar2.update_points(points[:150])
+            ar2.update_points(points[150:])
+            self.assertSetEqual(ar1.get_points(), nd.get_points())
+            self.assertEqual(ar1, ar2)
+            self.assertEqual(ar1.dim(), d)
+            self.assertEqual(copy.deepcopy(ar1), ar1)
+
+            queries = np.concatenate((rng.uniform(-1.0, 13.0, size=(300, d)), points))
+            self.assertListEqual(ar1.dominates_batch(queries).tolist(), nd.dominates_batch(queries).tolist())
+            self.assertListEqual(ar1.dominated_batch(queries).tolist(), nd.dominated_batch(queries).tolist())
+            self.assertListEqual([ar1.dominates(tuple(q)) for q in queries.tolist()],
+                                 nd.dominates_batch(queries).tolist())
+
+            # OraclePoint picks the archive for the dimension of its points
+            ora = OraclePoint()
+            ora.add_points(set(map(tuple, points.tolist())))
+            self.assertIs(type(ora.oracle), cls)
+            self.assertSetEqual(ora.get_points(), nd.get_points())
+
     def test_files_NDTree(self):
         # type: (OraclePointTestCase) -> None
         self.read_write_ndtree_files(read_human_readable=True, write_human_readable=True)
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import unittest
+import copy
+import pickle
+
+import numpy as np
+
+from ParetoLib.Oracle.OracleFunction import OracleFunction
+from ParetoLib.Oracle.OracleProcess import OracleProcess, REFERENCE_CHILD_CMD, TRANSPORT_PIPE, TRANSPORT_SOCKET
+
+
+#################
+# OracleProcess #
+#################
+
+
+class OracleProcessTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (OracleProcessTestCase) -> None
+        # x > 0 and y > 1 - x
+        self.oracle_file = os.path.abspath('Oracle/OracleFunction/2D/test1.txt')
+        self.oracle_function = OracleFunction()
+        self.oracle_function.from_file(self.oracle_file, human_readable=True)
+        self.points = [tuple(p) for p in np.random.uniform(0.0, 1.0, size=(50, 2))]
+
+    def membership_test(self, transport):
+        # type: (OracleProcessTestCase, str) -> None
+        ora = OracleProcess(cmd=REFERENCE_CHILD_CMD + [self.oracle_file], num_workers=2, transport=transport,
+                            timeout=30.0)
+
+        self.assertEqual(ora.dim(), 2)
+        self.assertListEqual(ora.get_var_names(), self.oracle_function.get_var_names())
+
+        expected = [self.oracle_function.member(p) for p in self.points]
+        self.assertListEqual(ora.member_batch(self.points), expected)
+        self.assertEqual(ora.member(self.points[0]), expected[0])
+        self.assertEqual(ora.membership()(self.points[1]), expected[1])
+
+        # Robustness is positive inside the upper closure
+        robustness = ora.robustness_batch(self.points)
+        self.assertListEqual([r > 0 for r in robustness], expected)
+        self.assertAlmostEqual(ora.robustness((0.5, 0.75)), 0.25)
+
+        self.assertListEqual(ora.health_check(), [True, True])
+        self.assertEqual(ora.num_restarts, 0)
+        ora.close()
+
+    def test_membership_pipe(self):
+        # type: (OracleProcessTestCase) -> None
+        self.membership_test(TRANSPORT_PIPE)
+
+    def test_membership_socket(self):
+        # type: (OracleProcessTestCase) -> None
+        self.membership_test(TRANSPORT_SOCKET)
+
+    def test_restart(self):
+        # type: (OracleProcessTestCase) -> None
+        ora = OracleProcess(cmd=REFERENCE_CHILD_CMD + [self.oracle_file], timeout=30.0)
+        expected = [self.oracle_function.member(p) for p in self.points]
+        self.assertListEqual(ora.member_batch(self.points), expected)
+
+        # A dead child is detected by the health check and restarted
+        ora._workers[0].proc.kill()
+        ora._workers[0].proc.wait()
+        self.assertListEqual(ora.health_check(), [False])
+        self.assertEqual(ora.num_restarts, 1)
+        self.assertListEqual(ora.member_batch(self.points), expected)
+        ora.close()
+
+    def test_timeout(self):
+        # type: (OracleProcessTestCase) -> None
+        ora = OracleProcess(cmd=REFERENCE_CHILD_CMD + ['--delay', '5.0', self.oracle_file], timeout=0.5,
+                            max_restarts=1)
+        with self.assertRaises(RuntimeError):
+            ora.member(self.points[0])
+        self.assertEqual(ora.num_restarts, 1)
+        ora.close()
+
+    def test_errors(self):
+        # type: (OracleProcessTestCase) -> None
+        ora = OracleProcess(cmd=REFERENCE_CHILD_CMD + [self.oracle_file], num_workers=2, timeout=30.0)
+        expected = [self.oracle_function.member(p) for p in self.points]
+
+        # Points of a lower dimension are rejected by both children.
+        # Both answers are read, so they are not mistaken for the answers of the next call.
+        with self.assertRaises(RuntimeError):
+            ora.member_batch([(0.1,), (0.4,)])
+        self.assertListEqual(ora.member_batch(self.points), expected)
+        self.assertEqual(ora.num_restarts, 0)
+        ora.close()
+
+    def test_wrong_number_of_results(self):
+        # type: (OracleProcessTestCase) -> None
+        # Child answering a single result whatever the size of the batch
+        code = ('import sys\n'
+                'from ParetoLib.Oracle.OracleProcess import read_message, write_message, encode_results, MSG_MEMBER\n'
+                'while True:\n'
+                '    read_message(sys.stdin.buffer)\n'
+                '    write_message(sys.stdout.buffer, encode_results(MSG_MEMBER, [True]))\n')
+        ora = OracleProcess(cmd=[sys.executable, '-c', code], timeout=30.0)
+        self.assertTrue(ora.member(self.points[0]))
+        with self.assertRaises(RuntimeError):
+            ora.member_batch(self.points[:2])
+        ora.close()
+
+    def test_no_restarts(self):
+        # type: (OracleProcessTestCase) -> None
+        ora = OracleProcess(cmd=REFERENCE_CHILD_CMD + ['--delay', '5.0', self.oracle_file], timeout=0.5,
+                            max_restarts=0)
+        with self.assertRaises(RuntimeError):
+            ora.member(self.points[0])
+        self.assertEqual(ora.num_restarts, 0)
+        ora.close()
+
+    def test_socket_child_exits(self):
+        # type: (OracleProcessTestCase) -> None
+        # A child that exits before connecting to the socket does not block the parent
+        ora = OracleProcess(cmd=[sys.executable, '-c', 'pass'], transport=TRANSPORT_SOCKET, max_restarts=0)
+        start = time.time()
+        with self.assertRaises(EOFError):
+            ora._start_worker(0)
+        self.assertLess(time.time() - start, 10.0)
+        ora.close()
+
+    def test_copy(self):
+        # type: (OracleProcessTestCase) -> None
+        ora1 = OracleProcess(cmd=REFERENCE_CHILD_CMD + [self.oracle_file], num_workers=2)
+        ora1.member(self.points[0])
+
+        # Copies do not share the pool of children
+        ora2 = copy.deepcopy(ora1)
+        ora3 = pickle.loads(pickle.dumps(ora1))
+        self.assertEqual(ora1, ora2)
+        self.assertEqual(hash(ora1), hash(ora3))
+        self.assertListEqual(ora2._workers, [None, None])
+        self.assertListEqual(ora3._workers, [None, None])
+        self.assertEqual(ora2.member(self.points[0]), ora1.member(self.points[0]))
+
+        ora1.close()
+        ora2.close()
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
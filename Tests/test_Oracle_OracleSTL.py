@@ -1,9 +1,11 @@
 import os
+import sys
 import tempfile as tf
 import unittest
 import copy
 
 from ParetoLib.Oracle.OracleSTL import OracleSTL
+from ParetoLib.JAMT.JAMT import JAMT_WORKER_STUB
 
 
 #############
@@ -53,6 +55,57 @@ class OracleSTLTestCase(unittest.TestCase):
         self.read_write_files(human_readable=False)
         self.read_write_files(human_readable=True)
 
+    # Test OracleSTL in worker mode
+    def test_OracleSTL_worker(self):
+        # type: (OracleSTLTestCase) -> None
+
+        # The stub worker evaluates the instance of the STL formula as a Python expression
+        files = {'.stl': 'p1 + p2 >= 1', '.param': 'p1\np2\n', '.vcd': '', '.alias': ''}
+        fnames = {}
+        for ext, content in files.items():
+            tmpfile = tf.NamedTemporaryFile(mode='w', suffix=ext, delete=False)
+            tmpfile.write(content)
+            tmpfile.close()
+            fnames[ext] = tmpfile.name
+            self.add_file_to_clean(tmpfile.name)
+
+        ora = OracleSTL(stl_prop_file=fnames['.stl'], vcd_signal_file=fnames['.vcd'], var_alias_file=fnames['.alias'],
+                        stl_param_file=fnames['.param'], worker_cmd=JAMT_WORKER_STUB)
+
+        self.assertTrue(ora.member((0.7, 0.6)))
+        self.assertFalse(ora.member((0.1, 0.2)))
+
+        # The worker is started only once and it is reused by the following queries
+        worker = ora.jamt_worker
+        xpoints = [(0.1, 0.2), (0.5, 0.5), (1.0, 0.0), (0.3, 0.3)]
+        self.assertListEqual(ora.member_batch(xpoints), [False, True, True, False])
+        self.assertIs(worker, ora.jamt_worker)
+
+        # Copies keep the worker mode, but run their own worker
+        ora2 = copy.deepcopy(ora)
+        self.assertEqual(ora2.worker_cmd, ora.worker_cmd)
+        self.assertListEqual(ora2.member_batch(xpoints), [False, True, True, False])
+        self.assertIsNot(ora2.jamt_worker, ora.jamt_worker)
+
+        ora.close()
+        ora2.close()
+        self.assertIsNone(ora._jamt_worker)
+        self.assertEqual(worker.poll(), 0)
+
+        # A worker that hangs is stopped after worker_timeout seconds
+        hang_cmd = [sys.executable, '-c', 'import time; print("ok", flush=True); time.sleep(30)']
+        ora3 = OracleSTL(stl_prop_file=fnames['.stl'], vcd_signal_file=fnames['.vcd'], var_alias_file=fnames['.alias'],
+                         stl_param_file=fnames['.param'], worker_cmd=hang_cmd, worker_timeout=0.5)
+        with self.assertRaises(RuntimeError):
+            ora3.member((0.7, 0.6))
+        self.assertIsNone(ora3._jamt_worker)
+
+        # A worker that dies is detected as well
+        ora4 = OracleSTL(stl_prop_file=fnames['.stl'], vcd_signal_file=fnames['.vcd'], var_alias_file=fnames['.alias'],
+                         stl_param_file=fnames['.param'], worker_cmd=[sys.executable, '-c', 'print("ok")'])
+        with self.assertRaises(RuntimeError):
+            ora4.member((0.7, 0.6))
+
     def read_write_files(self,
                          human_readable=False):
         # type: (OracleSTLTestCase, bool) -> None
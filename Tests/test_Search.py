@@ -319,7 +319,8 @@ class SearchTestCase(unittest.TestCase):
                                      opt_level=opt_level,
                                      parallel=False,
                                      logging=False,
-                                     simplify=False)
+                                     simplify=False,
+                                     seed=0)
 
                 print('Parallel search {0}'.format(True))
 
@@ -334,7 +335,8 @@ class SearchTestCase(unittest.TestCase):
                                          opt_level=opt_level,
                                          parallel=True,
                                          logging=False,
-                                         simplify=False)
+                                         simplify=False,
+                                         seed=0)
 
                 # set(rs.yup) == set(rs_par.yup) ...
                 self.assertSetEqual(set(rs.yup), set(rs_par.yup))
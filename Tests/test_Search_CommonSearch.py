@@ -0,0 +1,509 @@
+import os
+import time
+import unittest
+import numpy as np
+import tempfile
+import shutil
+
+from ParetoLib.Search.CommonSearch import OracleConjunction, REORDER_STEPS, ANY_CHUNK, intersection_empty, \
+    BoundarySurrogate, binary_search, cell_chunks, uniform_sampling, sampling, num_samples_bound, \
+    detection_confidence, SAMPLERS, SAMPLER_UNIFORM, SAMPLER_LHS, SAMPLER_SOBOL, SAMPLER_HALTON, CellGrid, \
+    split_samples, complete_samples, monotone_num_samples, monotone_projection, MONO_UNKNOWN, MONO_INCREASING, \
+    MONO_DECREASING
+import ParetoLib.Search.SeqSearch as SeqSearch
+import ParetoLib.Search.ParSearch as ParSearch
+from ParetoLib.Search.Search import create_2D_space
+from ParetoLib.Geometry.Segment import Segment
+from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Oracle.OracleFunction import OracleFunction
+from ParetoLib.Oracle.OracleMemo import OracleMemo
+
+
+#####################
+# OracleConjunction #
+#####################
+
+
+class CountingOracleFunction(OracleFunction):
+
+    def __init__(self):
+        super(CountingOracleFunction, self).__init__()
+        self.num_oracle_calls = 0
+
+    def member(self, point):
+        self.num_oracle_calls = self.num_oracle_calls + 1
+        return super(CountingOracleFunction, self).member(point)
+
+
+class CountingFunction(object):
+
+    def __init__(self, f, delay=0.0):
+        self.f = f
+        self.delay = delay
+        self.num_calls = 0
+
+    def __call__(self, point):
+        self.num_calls = self.num_calls + 1
+        if self.delay > 0.0:
+            time.sleep(self.delay)
+        return self.f(point)
+
+    def batch(self, points):
+        return [self(point) for point in points]
+
+
+class OracleConjunctionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (OracleConjunctionTestCase) -> None
+        # Expensive and permissive, cheap and selective
+        self.slow = CountingFunction(lambda p: p[0] > 0.0, delay=1e-3)
+        self.fast = CountingFunction(lambda p: p[1] > 0.75)
+        self.points = [(i / 100.0, j / 10.0) for i in range(10) for j in range(10)]
+        self.expected = [self.slow.f(p) and self.fast.f(p) for p in self.points]
+
+    def test_reorder(self):
+        # type: (OracleConjunctionTestCase) -> None
+        conj = OracleConjunction([self.slow, self.fast])
+        self.assertListEqual(conj.order, [0, 1])
+
+        self.assertListEqual([conj(p) for p in self.points], self.expected)
+        # The cheap and selective function is evaluated first after a few points
+        self.assertListEqual(conj.order, [1, 0])
+        self.assertLessEqual(self.slow.num_calls, REORDER_STEPS + sum(self.expected))
+
+        self.assertEqual(conj.count(self.points), sum(self.expected))
+        self.assertEqual(conj.any(self.points), any(self.expected))
+
+    def test_batch(self):
+        # type: (OracleConjunctionTestCase) -> None
+        conj = OracleConjunction([self.slow, self.fast], [self.slow.batch, self.fast.batch])
+        self.assertTrue(conj.vectorized)
+
+        self.assertListEqual(conj.batch(self.points), self.expected)
+        self.assertEqual(self.slow.num_calls, len(self.points))
+        self.assertListEqual(conj.order, [1, 0])
+
+        # Only the points accepted by the first oracle reach the second one
+        self.slow.num_calls = 0
+        self.assertListEqual(conj.batch(self.points), self.expected)
+        self.assertEqual(self.slow.num_calls, sum(self.fast.f(p) for p in self.points))
+
+    def test_any(self):
+        # type: (OracleConjunctionTestCase) -> None
+        # In batch mode, any() stops after the first chunk that contains a solution
+        conj = OracleConjunction([self.slow, self.fast], [self.slow.batch, self.fast.batch])
+        points = [(1.0, 1.0)] + self.points
+        self.assertTrue(conj.any(points))
+        self.assertLessEqual(self.fast.num_calls, ANY_CHUNK)
+        self.assertFalse(conj.any([(0.0, 0.0)] * 100))
+
+    def test_any_rows(self):
+        # type: (OracleConjunctionTestCase) -> None
+        samples = np.random.default_rng(0).uniform(0.0, 1.0, size=(50, 40, 2))
+        samples[0, -1] = (1.0, 1.0)
+        expected = [any(self.slow.f(p) and self.fast.f(p) for p in row) for row in samples]
+        conj = OracleConjunction([self.slow, self.fast])
+        self.assertListEqual(list(conj.any_rows(samples)), expected)
+        conj = OracleConjunction([self.slow, self.fast], [self.slow.batch, self.fast.batch])
+        self.fast.num_calls = 0
+        self.assertListEqual(list(conj.any_rows(samples)), expected)
+        # The samples of a cell after its first solution are not evaluated
+        self.assertLess(self.fast.num_calls, samples.shape[0] * samples.shape[1])
+
+    def test_from_oracles(self):
+        # type: (OracleConjunctionTestCase) -> None
+        # Oracles that provide member_batch but are not vectorized keep the short-circuit evaluation
+        this_dir = tempfile.mkdtemp()
+        ora = OracleFunction()
+        ora.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+        memo = OracleMemo(ora, os.path.join(this_dir, 'memo.db'))
+        self.assertFalse(ora.is_vectorized())
+        self.assertFalse(memo.is_vectorized())
+        conj = OracleConjunction.from_oracles([ora, memo])
+        self.assertFalse(conj.vectorized)
+        self.assertTrue(conj.any([(1.0, 1.0)] + self.points))
+        self.assertEqual(memo.stats()[0], 1)
+        memo.close()
+        shutil.rmtree(this_dir)
+
+    def test_stats(self):
+        # type: (OracleConjunctionTestCase) -> None
+        # The order learnt by a conjunction can be transferred to another one
+        conj1 = OracleConjunction([self.slow, self.fast])
+        base = conj1.stats()
+        conj1.count(self.points)
+        conj2 = OracleConjunction([self.slow, self.fast])
+        conj2.update_stats(conj1.stats(base))
+        self.assertListEqual(conj2.order, [1, 0])
+        self.assertTupleEqual(conj2.stats(), conj1.stats())
+
+    def test_intersection_empty(self):
+        # type: (OracleConjunctionTestCase) -> None
+        conj = OracleConjunction([self.slow, self.fast])
+        for p in self.points:
+            x = Segment((0.0, 0.0), p)
+            self.assertEqual(intersection_empty(x, self.slow, self.fast, conj),
+                             intersection_empty(x, self.slow.f, self.fast.f))
+
+
+#####################
+# BoundarySurrogate #
+#####################
+
+
+class BoundarySurrogateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (BoundarySurrogateTestCase) -> None
+        # Upper closure of the boundary x^2 + y^2 = 1
+        self.f = CountingFunction(lambda p: p[0] ** 2 + p[1] ** 2 >= 1.0)
+        self.error = (1e-5, 1e-5)
+        self.segments = [((i / 40.0, 0.0), (1.0, 1.0 - i / 40.0)) for i in range(40)] + \
+                        [((0.0, i / 40.0), (1.0 - i / 40.0, 1.0)) for i in range(1, 40)]
+
+    def search(self, surrogate):
+        # type: (BoundarySurrogateTestCase, BoundarySurrogate) -> list
+        self.f.num_calls = 0
+        return [binary_search(Segment(low, high), self.f, self.error, surrogate)[0] for (low, high) in self.segments]
+
+    def test_binary_search(self):
+        # type: (BoundarySurrogateTestCase) -> None
+        expected = self.search(None)
+        num_calls = self.f.num_calls
+
+        surrogate = BoundarySurrogate(dim=2)
+        result = self.search(surrogate)
+        self.assertLess(self.f.num_calls, num_calls)
+        self.assertGreater(surrogate.num_hits, 0)
+        self.assertLessEqual(surrogate.num_hits, surrogate.num_guesses)
+        for y, z in zip(result, expected):
+            # The surrogate only changes the number of oracle calls, not the result
+            self.assertLessEqual(y.norm(), self.error[0])
+            self.assertEqual(self.f.f(y.low), self.f.f(z.low))
+            self.assertEqual(self.f.f(y.high), self.f.f(z.high))
+            self.assertAlmostEqual(y.low[0], z.low[0], delta=2 * self.error[0])
+
+    def test_wrong_guess(self):
+        # type: (BoundarySurrogateTestCase) -> None
+        # Boundary points of a different function mislead the surrogate, but the result is still exact
+        surrogate = BoundarySurrogate(dim=2)
+        for i in range(10):
+            surrogate.add(Segment((0.0, 0.0), (1.0, 1.0)), (i / 10.0, 0.2 - i / 50.0))
+        x = Segment((0.0, 0.0), (1.0, 1.0))
+        self.assertIsNotNone(surrogate.guess(x))
+        y, _ = binary_search(x, self.f, self.error, surrogate)
+        self.assertLessEqual(y.norm(), self.error[0])
+        self.assertAlmostEqual(y.low[0], 1.0 / 2.0 ** 0.5, delta=2 * self.error[0])
+
+        # Whole segment inside and outside of the upper closure
+        y, _ = binary_search(Segment((0.8, 0.8), (0.9, 0.9)), self.f, self.error, surrogate)
+        self.assertTupleEqual(y.high, (0.8, 0.8))
+        y, _ = binary_search(Segment((0.1, 0.1), (0.4, 0.4)), self.f, self.error, surrogate)
+        self.assertTupleEqual(y.low, (0.4, 0.4))
+
+
+############
+# CellGrid #
+############
+
+
+class CellGridTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (CellGridTestCase) -> None
+        self.xspace = Rectangle((0.0, -1.0, 2.0), (1.0, 1.0, 5.0))
+        self.grid = CellGrid(self.xspace, 1000)
+
+    def covering(self, rect_list):
+        # type: (CellGridTestCase, list) -> np.ndarray
+        # Number of rectangles that contain every cell of the grid
+        cover = np.zeros(self.grid.shape, dtype=int)
+        for rect in rect_list:
+            low = np.rint((np.array(rect.min_corner) - self.grid.min_corner) / self.grid.step).astype(int)
+            high = np.rint((np.array(rect.max_corner) - self.grid.min_corner) / self.grid.step).astype(int)
+            cover[tuple(slice(i, j) for i, j in zip(low, high))] += 1
+        return cover
+
+    def test_bounds(self):
+        # type: (CellGridTestCase) -> None
+        # The cells of the grid are the ones of cell_partition_bin
+        cells = self.xspace.cell_partition_bin(1000)
+        self.assertTupleEqual(self.grid.shape, (10, 10, 10))
+        self.assertEqual(len(self.grid), len(cells))
+        for (start, stop) in self.grid.chunks(num_samples=30, num_chunks=7):
+            low, high = self.grid.bounds(start, stop)
+            self.assertListEqual([tuple(x) for x in low], [cell.min_corner for cell in cells[start:stop]])
+            self.assertListEqual([tuple(x) for x in high], [cell.max_corner for cell in cells[start:stop]])
+        self.assertAlmostEqual(self.grid.cell_volume() * len(self.grid), self.xspace.volume())
+
+    def test_chunks(self):
+        # type: (CellGridTestCase) -> None
+        # Same chunks as cell_chunks, unless the samples of a chunk are too many
+        chunks = self.grid.chunks(num_samples=30, num_chunks=7)
+        self.assertListEqual([stop - start for (start, stop) in chunks],
+                             [len(chunk) for chunk in cell_chunks(list(range(len(self.grid))), 7)])
+        chunks = self.grid.chunks(num_samples=10 ** 6, num_chunks=7)
+        self.assertGreater(len(chunks), 7)
+        self.assertEqual(chunks[-1][1], len(self.grid))
+
+    def test_rectangles(self):
+        # type: (CellGridTestCase) -> None
+        i, j, k = np.indices(self.grid.shape)
+        self.grid.green = (i + j + k >= 12) | (np.random.default_rng(0).random(self.grid.shape) < 0.1)
+        yup = self.grid.rectangles(self.grid.green)
+        ylow = self.grid.rectangles(~self.grid.green)
+        # Every cell is covered by exactly one rectangle of its class
+        self.assertTrue(np.array_equal(self.covering(yup), self.grid.green.astype(int)))
+        self.assertTrue(np.array_equal(self.covering(ylow), (~self.grid.green).astype(int)))
+        self.assertLess(len(yup), np.count_nonzero(self.grid.green))
+        self.assertAlmostEqual(sum(r.volume() for r in yup + ylow), self.xspace.volume())
+
+        self.grid.green[:] = True
+        self.assertListEqual(self.grid.rectangles(self.grid.green), [self.xspace])
+        self.assertListEqual(self.grid.rectangles(~self.grid.green), [])
+
+    def test_search(self):
+        # type: (CellGridTestCase) -> None
+        # Cells far from the boundary x + y = 1 are merged in a few rectangles
+        ora = OracleFunction()
+        ora.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        rs = SeqSearch.multidim_search_BMNN22(xspace, [ora], 4, 400, opt_level=0, logging=False, seed=0)
+        self.assertLess(len(rs.yup) + len(rs.ylow), 400)
+        self.assertAlmostEqual(rs.volume_yup() + rs.volume_ylow(), 1.0)
+        self.assertTrue(all(sum(cell.max_corner) > 1.0 for cell in rs.yup))
+
+
+############
+# Sampling #
+############
+
+
+class SamplingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (SamplingTestCase) -> None
+        self.xspace = create_2D_space(0.0, 0.0, 1.0, 2.0)
+        self.cells = self.xspace.cell_partition_bin(100)
+
+    def test_uniform_sampling(self):
+        # type: (SamplingTestCase) -> None
+        samples = uniform_sampling(self.cells, 30, np.random.default_rng(0))
+        self.assertTupleEqual(samples.shape, (len(self.cells), 30, 2))
+        for cell, cell_samples in zip(self.cells, samples):
+            self.assertTrue(all(tuple(s) in cell for s in cell_samples))
+
+        # Drawing the samples chunk by chunk or at once gives the same samples
+        rng = np.random.default_rng(0)
+        chunks = [uniform_sampling(chunk, 30, rng) for chunk in cell_chunks(self.cells, 7)]
+        self.assertTrue(np.array_equal(np.concatenate(chunks), samples))
+
+    def test_sampling(self):
+        # type: (SamplingTestCase) -> None
+        for sampler in SAMPLERS:
+            samples = sampling(self.cells, 30, np.random.default_rng(0), sampler)
+            self.assertTupleEqual(samples.shape, (len(self.cells), 30, 2))
+            for cell, cell_samples in zip(self.cells, samples):
+                self.assertTrue(all(tuple(s) in cell for s in cell_samples))
+
+        # Latin hypercube: one sample in each of the 30 slices of the cell along every axis
+        samples = sampling(self.cells, 30, np.random.default_rng(0), SAMPLER_LHS)
+        for cell, cell_samples in zip(self.cells, samples):
+            low, high = np.array(cell.min_corner), np.array(cell.max_corner)
+            slices = np.floor((cell_samples - low) / (high - low) * 30)
+            for i in range(2):
+                self.assertListEqual(sorted(slices[:, i]), list(range(30)))
+
+        # The uniform sampler is the one of uniform_sampling
+        self.assertTrue(np.array_equal(sampling(self.cells, 30, np.random.default_rng(0), SAMPLER_UNIFORM),
+                                       uniform_sampling(self.cells, 30, np.random.default_rng(0))))
+
+    def test_num_samples_bound(self):
+        # type: (SamplingTestCase) -> None
+        for sampler in (SAMPLER_UNIFORM, SAMPLER_LHS, SAMPLER_HALTON):
+            self.assertEqual(num_samples_bound(0.01, 0.05, sampler), 299)
+        self.assertEqual(num_samples_bound(0.01, 0.05, SAMPLER_SOBOL), 512)
+        for sampler in SAMPLERS:
+            n = num_samples_bound(0.01, 0.05, sampler)
+            self.assertGreaterEqual(detection_confidence(n, 0.01, sampler), 0.95)
+            self.assertLess(detection_confidence(n // 2, 0.01, sampler), 0.95)
+
+        # Empirical miss rate of a corner box that covers 1% of the cell
+        cells = self.cells[:1] * 2000
+        for sampler in SAMPLERS:
+            samples = sampling(cells, num_samples_bound(0.01, 0.05, sampler), np.random.default_rng(1), sampler)
+            high = np.array(cells[0].max_corner) - 0.1 * np.array(cells[0].diag_vector())
+            missed = np.mean(~np.any(np.all(samples >= high, axis=2), axis=1))
+            self.assertLess(missed, 0.07)
+
+    def test_cell_chunks(self):
+        # type: (SamplingTestCase) -> None
+        chunks = cell_chunks(self.cells, 7)
+        self.assertLessEqual(len(chunks), 7)
+        self.assertListEqual([cell for chunk in chunks for cell in chunk], self.cells)
+
+    def test_seed(self):
+        # type: (SamplingTestCase) -> None
+        # The same seed gives the same classification, for the fixed and the dynamic cell methods
+        ora = OracleFunction()
+        ora.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+        rs1 = SeqSearch.multidim_search_BMNN22(self.xspace, [ora], 3, 100, opt_level=0, logging=False, seed=1)
+        rs2 = SeqSearch.multidim_search_BMNN22(self.xspace, [ora], 3, 100, opt_level=0, logging=False, seed=1)
+        self.assertListEqual(rs1.yup, rs2.yup)
+        rs1 = SeqSearch.multidim_search_BMNN22(self.xspace, [ora], 3, 100, opt_level=1, logging=False, seed=1)
+        rs2 = SeqSearch.multidim_search_BMNN22(self.xspace, [ora], 3, 100, opt_level=1, logging=False, seed=1)
+        self.assertSetEqual(set(rs1.yup), set(rs2.yup))
+
+        # The random streams do not depend on the process that evaluates each cell
+        for opt_level in range(2):
+            rs1 = SeqSearch.multidim_search_BMNN22(self.xspace, [ora], 3, 100, opt_level=opt_level, logging=False,
+                                                   seed=2)
+            rs2 = ParSearch.multidim_search_BMNN22(self.xspace, [ora], 3, 100, opt_level=opt_level, logging=False,
+                                                   seed=2)
+            self.assertSetEqual(set(rs1.yup), set(rs2.yup))
+            self.assertSetEqual(set(rs1.ylow), set(rs2.ylow))
+
+    def test_split_samples(self):
+        # type: (SamplingTestCase) -> None
+        samples = sampling([self.xspace], 200, np.random.default_rng(0))[0]
+        answers = samples[:, 0] > 0.5
+        children = split_samples(self.xspace, samples, answers)
+        self.assertEqual(sum(len(s) for (s, _) in children), len(samples))
+        for cell, (cell_samples, cell_answers) in zip(self.xspace.cell_partition_bin(4), children):
+            self.assertTrue(all(tuple(s) in cell for s in cell_samples))
+            self.assertListEqual(list(cell_answers), list(cell_samples[:, 0] > 0.5))
+
+        # A sub-cell only draws and evaluates the samples that it does not inherit
+        f = CountingFunction(lambda p: p[0] > 0.5)
+        conj = OracleConjunction([f])
+        cell_samples, cell_answers = children[0]
+        samples, answers = complete_samples(self.xspace.cell_partition_bin(4)[0], conj, np.random.SeedSequence(0),
+                                            200, SAMPLER_UNIFORM, cell_samples, cell_answers)
+        self.assertEqual(len(samples), 200)
+        self.assertEqual(f.num_calls, 200 - len(cell_samples))
+        self.assertTrue(np.array_equal(samples[:len(cell_samples)], cell_samples))
+
+    def test_sample_reuse(self):
+        # type: (SamplingTestCase) -> None
+        # Every cell of the dynamic method has num_samples samples, but the ones inherited from its parent are not
+        # evaluated again
+        f = CountingFunction(lambda p: p[0] + p[1] > 1.0)
+        conj = OracleConjunction([f])
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        g = tuple(x / 10.0 for x in xspace.diag_vector())
+        rs = SeqSearch._multidim_search_BMNN22_opt_1(xspace, conj, np.random.SeedSequence(0), 40, g, False, 0.0,
+                                                     False, 0.95, SAMPLER_UNIFORM)
+        # Every sample ends in exactly one leaf of the tree of cells
+        leaves = len(rs.yup) + len(rs.ylow)
+        self.assertGreater(leaves, 1)
+        self.assertEqual(f.num_calls, 40 * leaves)
+
+    def test_evaluate_level(self):
+        # type: (SamplingTestCase) -> None
+        # The level-synchronous evaluation of ParSearch returns the samples and answers of complete_samples
+        ora = OracleFunction()
+        ora.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        seeds = np.random.SeedSequence(0).spawn(4)
+        cells = xspace.cell_partition_bin(4)
+        inherited = np.array([[0.1, 0.2], [0.3, 0.4]])
+        cell_list = [(cells[0], seeds[0], inherited, np.array([False, False]))] + \
+                    [(cell, seed, None, None) for cell, seed in zip(cells[1:], seeds[1:])]
+        conj = OracleConjunction.from_oracles([ora])
+
+        p = ParSearch.bmnn22_pool([ora])
+        level = ParSearch.evaluate_level(p, conj, cell_list, 10, SAMPLER_UNIFORM)
+        p.close()
+        p.join()
+        self.assertEqual(sum(conj.num_calls), 4 * 10 - len(inherited))
+        for (cell, seed, samples, answers), (level_samples, level_answers) in zip(cell_list, level):
+            samples, answers = complete_samples(cell, conj, seed, 10, SAMPLER_UNIFORM, samples, answers)
+            self.assertTrue(np.array_equal(level_samples, samples))
+            self.assertTrue(np.array_equal(level_answers, answers))
+
+    def test_boundary_refinement(self):
+        # type: (SamplingTestCase) -> None
+        ora = OracleFunction()
+        ora.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        g = tuple(x / 10.0 for x in xspace.diag_vector())
+
+        # Without budget, the boundary-first refinement returns the cells of the dynamic method
+        rs1 = SeqSearch.multidim_search_BMNN22_opt_1(xspace, [ora], 8, g, logging=False, seed=4)
+        rs2 = SeqSearch.multidim_search_BMNN22_opt_2(xspace, [ora], 8, g, logging=False, seed=4)
+        rs3 = ParSearch.multidim_search_BMNN22_opt_2(xspace, [ora], 8, g, logging=False, seed=4)
+        for rs in (rs2, rs3):
+            self.assertSetEqual(set(rs.yup), set(rs1.yup))
+            self.assertSetEqual(set(rs.ylow), set(rs1.ylow))
+            self.assertListEqual(rs.border, [])
+
+        # With a budget of oracle calls, the cells that are not refined are left in the border
+        for search in (SeqSearch, ParSearch):
+            f = CountingOracleFunction()
+            f.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+            rs = search.multidim_search_BMNN22(xspace, [f], 8, 0, opt_level=2, logging=False, seed=4, max_calls=100)
+            self.assertGreater(len(rs.border), 0)
+            self.assertAlmostEqual(rs.volume_yup() + rs.volume_ylow() + rs.volume_border(), 1.0)
+            if search is SeqSearch:
+                self.assertLessEqual(f.num_oracle_calls, 100)
+
+    def test_sampler(self):
+        # type: (SamplingTestCase) -> None
+        # Every sampler finds the same classification of the cells far from the boundary x + y = 1
+        ora = OracleFunction()
+        ora.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        for sampler in SAMPLERS:
+            rs = SeqSearch.multidim_search_BMNN22(xspace, [ora], 8, 16, opt_level=0, logging=False, seed=3,
+                                                  sampler=sampler)
+            self.assertTrue(all(sum(cell.max_corner) > 1.0 for cell in rs.yup))
+            self.assertTrue(all(sum(cell.min_corner) < 1.0 for cell in rs.ylow))
+            self.assertAlmostEqual(rs.volume_yup() + rs.volume_ylow(), 1.0)
+
+        # The dynamic cell method of ParSearch draws the same quasi-random samples
+        rs1 = SeqSearch.multidim_search_BMNN22(xspace, [ora], 8, 16, opt_level=1, logging=False, seed=3,
+                                               sampler=SAMPLER_SOBOL)
+        rs2 = ParSearch.multidim_search_BMNN22(xspace, [ora], 8, 16, opt_level=1, logging=False, seed=3,
+                                               sampler=SAMPLER_SOBOL)
+        self.assertSetEqual(set(rs1.yup), set(rs2.yup))
+        self.assertSetEqual(set(rs1.ylow), set(rs2.ylow))
+
+    def test_monotonicity(self):
+        # type: (SamplingTestCase) -> None
+        # Monotone coordinates of the samples are moved to a face of their cell
+        cells = self.cells[:2]
+        low = np.array([cell.min_corner for cell in cells])
+        high = np.array([cell.max_corner for cell in cells])
+        box_samples = sampling(cells, 5, np.random.default_rng(0), SAMPLER_UNIFORM)
+        samples = monotone_projection(low, high, box_samples.copy(), (MONO_INCREASING, MONO_DECREASING))
+        self.assertTrue(np.array_equal(samples[:, :, 0], np.repeat(high[:, :1], 5, axis=1)))
+        self.assertTrue(np.array_equal(samples[:, :, 1], np.repeat(low[:, 1:], 5, axis=1)))
+        samples = monotone_projection(low, high, box_samples.copy(), (MONO_UNKNOWN, MONO_DECREASING))
+        self.assertTrue(np.array_equal(samples[:, :, 0], box_samples[:, :, 0]))
+
+        self.assertEqual(monotone_num_samples(30), 30)
+        self.assertEqual(monotone_num_samples(30, (MONO_INCREASING, MONO_UNKNOWN)), 30)
+        self.assertEqual(monotone_num_samples(30, (MONO_INCREASING, MONO_DECREASING)), 1)
+
+        # x + y > 1 is increasing in both dimensions: the max corner of a cell settles it
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        results = []
+        for search in (SeqSearch, ParSearch):
+            f = CountingOracleFunction()
+            f.from_file('Oracle/OracleFunction/2D/test1.txt', human_readable=True)
+            rs = search.multidim_search_BMNN22(xspace, [f], 30, 16, opt_level=0, logging=False, seed=0,
+                                               monotonicity=(MONO_INCREASING, MONO_INCREASING))
+            self.assertTrue(all(sum(cell.max_corner) > 1.0 for cell in rs.yup))
+            self.assertTrue(all(sum(cell.max_corner) <= 1.0 for cell in rs.ylow))
+            self.assertAlmostEqual(rs.volume_yup() + rs.volume_ylow(), 1.0)
+            if search is SeqSearch:
+                self.assertEqual(f.num_oracle_calls, 16)
+            results.append(rs)
+        self.assertSetEqual(set(results[0].yup), set(results[1].yup))
+        self.assertSetEqual(set(results[0].ylow), set(results[1].ylow))
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
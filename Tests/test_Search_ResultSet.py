@@ -7,7 +7,7 @@ import copy
 from ParetoLib.Geometry.Rectangle import Rectangle
 
 from ParetoLib.Search.ParResultSet import ParResultSet
-from ParetoLib.Search.ResultSet import ResultSet
+from ParetoLib.Search.ResultSet import ResultSet, champions_selection
 from ParetoLib.Search.Search import create_2D_space, create_3D_space, SearchND_BMNN22, SearchND
 
 from ParetoLib.Search.CommonSearch import ALPHA, P0, NUMCELLS, EPS, DELTA
@@ -439,6 +439,27 @@ class ResultSetTestCase(unittest.TestCase):
         self.assertAlmostEqual(rs_sim.volume_border(), rs_sim.volume_border_2())
         # self.assertEqual(0.1562628745887126, rs_sim.volume_border_2())
 
+    def test_indicators(self):
+        # type: (ResultSetTestCase) -> None
+        for rs in (self.rs_2D, self.rs_3D):
+            rs_sim = copy.deepcopy(rs)
+            rs_sim.simplify()
+            # The hypervolume of the front of yup is the volume of the (simplified) upper closure
+            self.assertAlmostEqual(rs.hypervolume(), rs_sim.volume_yup())
+            self.assertAlmostEqual(rs.igd(rs), 0.0)
+            self.assertAlmostEqual(rs.igd_plus(rs), 0.0)
+            self.assertAlmostEqual(rs.epsilon_indicator(rs), 0.0)
+            self.assertAlmostEqual(rs.hausdorff_distance(rs), 0.0)
+
+        # Shifting the upper closure worsens the indicators of the front
+        rs_shift = ResultSet(self.border_2D, self.ylow_2D,
+                             [Rectangle(tuple(x + 0.1 for x in r.min_corner), r.max_corner) for r in self.yup_2D],
+                             self.xspace_2D)
+        self.assertLess(rs_shift.hypervolume(), self.rs_2D.hypervolume())
+        self.assertAlmostEqual(rs_shift.epsilon_indicator(self.rs_2D), 0.1)
+        self.assertAlmostEqual(self.rs_2D.epsilon_indicator(rs_shift), -0.1)
+        self.assertAlmostEqual(rs_shift.igd_plus(self.rs_2D), 0.1 * (2 ** 0.5))
+
     def test_volume_3D(self):
         # type: (ResultSetTestCase) -> None
 
@@ -505,6 +526,36 @@ class ResultSetTestCase(unittest.TestCase):
         for r in self.rs_3D.get_points_space(n):
             self.assertTrue(self.rs_3D.member_space(r))
 
+    def test_vectorized(self):
+        # type: (ResultSetTestCase) -> None
+        for rs in (self.rs_2D, self.rs_3D):
+            # Points along the diagonals match Rectangle.get_points
+            m = 3
+            expected = [p for rect in rs.border for p in rect.get_points(m)]
+            self.assertListEqual(rs.get_points_border(m * len(rs.border)), expected)
+
+            # Uniform samples fall in their closure
+            for r in rs.sample_yup(20, rng=0):
+                self.assertTrue(rs.member_yup(tuple(r)))
+            for r in rs.sample_ylow(20, rng=0):
+                self.assertTrue(rs.member_ylow(tuple(r)))
+            self.assertEqual(rs.sample_border(20, rng=0).shape, (20, rs.xspace.dim()))
+            self.assertTrue((rs.sample_border(5, rng=1) == rs.sample_border(5, rng=1)).all())
+
+            # The affine scaling is equivalent to scale() with the same function
+            d = rs.xspace.dim()
+            a = [(-1.0) ** i * (i + 1) for i in range(d)]
+            b = [0.5] * d
+            rs1 = copy.deepcopy(rs)
+            rs1.scale_affine(a, b)
+            rs2 = copy.deepcopy(rs)
+            rs2.scale(lambda p: tuple(ai * pi + bi for ai, pi, bi in zip(a, p, b)))
+            self.assertAlmostEqual(rs1.volume_yup(), rs2.volume_yup())
+            self.assertAlmostEqual(rs1.volume_border(), rs2.volume_border())
+            self.assertEqual(len(rs1.vertices()), len(rs2.vertices()))
+            for p in rs2.vertices():
+                self.assertTrue(p in rs1)
+
     @pytest.mark.skipif(
         'DISPLAY' not in os.environ,
         reason='Display is not defined'
@@ -606,6 +657,28 @@ class ResultSetTestCase(unittest.TestCase):
         self.assertEqual(rs1_champion, (0.5, 0.0))
         self.assertEqual(rs2_champion, (1.0, 1.0))
 
+    def test_champions_selection(self):
+        # type: (ResultSetTestCase) -> None
+        xspace = create_2D_space(0.0, 0.0, 1.0, 1.0)
+        rs_1 = ResultSet(yup=[Rectangle((0.5, 0.0), (1.0, 1.0)), Rectangle((0.0, 0.5), (1.0, 1.0))], xspace=xspace)
+        rs_2 = ResultSet(yup=[Rectangle((0.25, 0.25), (1.0, 1.0))], xspace=xspace)
+        rs_3 = ResultSet(yup=[Rectangle((0.75, 0.75), (1.0, 1.0))], xspace=xspace)
+
+        # (0.25, 0.25) is the vertex of rs_2 farthest from the vertices of rs_1 and rs_3 outside rs_2
+        dist, rs2_champion, other_champion = rs_2.select_champion([rs_1, rs_3])
+        self.assertAlmostEqual(dist, 0.25 * (2 ** 0.5))
+        self.assertEqual(rs2_champion, (0.25, 0.25))
+        self.assertIn(other_champion, [(0.0, 0.5), (0.5, 0.0)])
+
+        # rs_3 is included in the upper closures of rs_1 and rs_2
+        self.assertTupleEqual(rs_3.select_champion([rs_1, rs_2]), (0, None, None))
+
+        champions = champions_selection([rs_1, rs_2, rs_3])
+        self.assertEqual(len(champions), 3)
+        for rs, champion in zip([rs_1, rs_2, rs_3], champions):
+            self.assertAlmostEqual(champion[0], rs.select_champion([rs_1, rs_2, rs_3])[0])
+            self.assertEqual(champion[1:], rs.select_champion([rs_1, rs_2, rs_3])[1:])
+
     def test_champions_2D_null(self):
         # type: (ResultSetTestCase) -> None
         oracle_1 = OracleFunction()